@@ -1,14 +1,57 @@
 """SQLite connection manager for the Higher Education Statistics database."""
 from __future__ import annotations
 
+import os
 import sqlite3
+import threading
 from pathlib import Path
+from typing import Optional, Tuple
 
 DB_PATH = Path(__file__).resolve().parent.parent / "he_stats.db"
 
+# build_db.py replaces he_stats.db with os.replace(), so a path always names
+# one complete database.  Each connection is pinned to the file it opened:
+# requests already running finish on the old file, new ones get the new one.
+_VERSION_LOCK = threading.Lock()
+_last_version: Optional[Tuple[int, int, int]] = None
+
+
+class DataConnection(sqlite3.Connection):
+    """A connection that knows which database file (inode, size, mtime) it opened."""
+
+    db_version: Optional[Tuple[int, int, int]] = None
+
+
+def _file_version(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def current_version() -> Optional[Tuple[int, int, int]]:
+    """Identity of the database file new connections will open."""
+    return _file_version(DB_PATH)
+
 
 def get_db() -> sqlite3.Connection:
     """Return a read-only SQLite connection with Row factory."""
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    global _last_version
+    # Stat on both sides of the open: if the file was swapped in between,
+    # open again so db_version always describes the file actually opened.
+    for attempt in range(3):
+        before = _file_version(DB_PATH)
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, factory=DataConnection)
+        if _file_version(DB_PATH) == before or attempt == 2:
+            break
+        conn.close()
+    conn.db_version = before
     conn.row_factory = sqlite3.Row
+
+    with _VERSION_LOCK:
+        if before != _last_version:
+            if _last_version is not None and before is not None:
+                print(f"[INFO] Database replaced; new connections use {DB_PATH} (inode {before[0]})")
+            _last_version = before
     return conn
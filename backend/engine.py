@@ -7,8 +7,11 @@ Higher Education Statistics database.
 """
 from __future__ import annotations
 
+import bisect
+import os
 import sqlite3
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 def _linear_slope(xs: List[float], ys: List[float]) -> float:
@@ -56,6 +59,53 @@ def _trend_direction(slope: float) -> str:
         return "stable"
 
 
+# ── Precomputed views (rebuilt once per data version) ───────────────
+
+_PRECOMPUTED: Dict[str, Tuple[Any, Any]] = {}
+_PRECOMPUTED_LOCK = threading.Lock()
+
+
+def _data_version(conn: sqlite3.Connection) -> Optional[Tuple[int, int, int]]:
+    """
+    Identify the database file behind conn.
+
+    The API opens a fresh read-only connection per request, so the file's
+    identity (inode, size, mtime) is the cheapest signal that the data has
+    been rebuilt.  Connections from db.get_db() carry the identity of the
+    file they opened; stat'ing the path instead could credit a result built
+    from the old file to a freshly swapped-in one.  Returns None for
+    in-memory databases.
+    """
+    pinned = getattr(conn, "db_version", None)
+    if pinned is not None:
+        return pinned
+    for row in conn.execute("PRAGMA database_list").fetchall():
+        if row[1] == "main":
+            if not row[2]:
+                return None
+            st = os.stat(row[2])
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+    return None
+
+
+def _precomputed(
+    conn: sqlite3.Connection,
+    name: str,
+    builder: Callable[[sqlite3.Connection], Any],
+) -> Any:
+    """Return builder(conn), reusing the last result until the data version changes."""
+    version = _data_version(conn)
+    with _PRECOMPUTED_LOCK:
+        hit = _PRECOMPUTED.get(name)
+    if hit is not None and version is not None and hit[0] == version:
+        return hit[1]
+
+    value = builder(conn)
+    with _PRECOMPUTED_LOCK:
+        _PRECOMPUTED[name] = (version, value)
+    return value
+
+
 def compute_report(
     conn: sqlite3.Connection,
     institution_id: int,
@@ -1248,10 +1298,6 @@ def compute_equity_report(
 
 # ── ATAR & Course Data (UAC) ───────────────────────────────────────
 
-ATAR_SENTINELS = frozenset({
-    "NO", "NC", "NS", "NR", "NP", "NN", "N/A", "N/P", "<5", "--", "",
-})
-
 COURSE_LEVEL_LABELS = {
     "TBP": "Bachelor",
     "TBH": "Bachelor (Honours)",
@@ -1418,14 +1464,56 @@ def _classify_field(title, areas_of_study):
     return "Mixed Field Programs"
 
 
-def _parse_atar(val):
-    """Parse ATAR text to float, returning None for sentinel values."""
-    if not val or str(val).strip().upper() in ATAR_SENTINELS:
-        return None
-    try:
-        return float(val)
-    except (ValueError, TypeError):
-        return None
+# Discipline keywords: extracted from course title for matching.
+# Order matters — first match wins, so more specific before general.
+DISCIPLINE_KEYWORDS = [
+    ("Law", ["law", "legal"]),
+    ("Nursing", ["nursing", "midwifery"]),
+    ("Medicine", ["medicine", "medical science", "clinical science"]),
+    ("Pharmacy", ["pharmacy", "pharmaceutical"]),
+    ("Physiotherapy", ["physiotherapy", "physical therapy"]),
+    ("Occupational Therapy", ["occupational therapy"]),
+    ("Speech Pathology", ["speech pathol"]),
+    ("Dentistry", ["dentistry", "dental", "oral health"]),
+    ("Psychology", ["psychology", "psychological"]),
+    ("Social Work", ["social work"]),
+    ("Criminology", ["criminolog", "criminal justice", "policing"]),
+    ("Engineering", ["engineering", "mechatronic"]),
+    ("Architecture", ["architecture", "built environment", "interior architecture"]),
+    ("Computer Science", ["computer science", "software", "cyber", "information technology"]),
+    ("Data Science", ["data science", "data analytics"]),
+    ("Education", ["education", "teaching"]),
+    ("Accounting", ["accounting"]),
+    ("Commerce", ["commerce", "business"]),
+    ("Economics", ["economics", "actuarial"]),
+    ("Science", ["science"]),
+    ("Arts", ["arts"]),
+    ("Communication", ["communication", "media", "journalism"]),
+    ("Design", ["design"]),
+    ("Music", ["music", "conservatorium"]),
+]
+
+
+def _extract_discipline(title):
+    """Extract a discipline tag from a course title for cross-institution matching."""
+    t = (title or "").lower()
+    for discipline, keywords in DISCIPLINE_KEYWORDS:
+        for kw in keywords:
+            if kw in t:
+                return discipline
+    return None
+
+
+def _extract_all_disciplines(title):
+    """Extract ALL matching discipline tags (for indexing double-degrees)."""
+    t = (title or "").lower()
+    found = []
+    for discipline, keywords in DISCIPLINE_KEYWORDS:
+        for kw in keywords:
+            if kw in t:
+                found.append(discipline)
+                break
+    return found
 
 
 def compute_courses_report(conn, institution_id):
@@ -1449,6 +1537,7 @@ def compute_courses_report(conn, institution_id):
             uc.mode_of_attendance, uc.campus_code,
             uc.campus_location, camp.name_short AS campus_name,
             uc.atar_year, uc.atar_lowest, uc.atar_median, uc.atar_highest,
+            uc.atar_lowest_num, uc.atar_median_num,
             uc.selection_rank_lowest, uc.selection_rank_median,
             uc.selection_rank_highest,
             uc.student_profile_year, uc.total_students,
@@ -1504,8 +1593,8 @@ def compute_courses_report(conn, institution_id):
                 "atar_lowest": r["atar_lowest"],
                 "atar_median": r["atar_median"],
                 "atar_highest": r["atar_highest"],
-                "atar_lowest_num": _parse_atar(r["atar_lowest"]),
-                "atar_median_num": _parse_atar(r["atar_median"]),
+                "atar_lowest_num": r["atar_lowest_num"],
+                "atar_median_num": r["atar_median_num"],
                 "selection_rank_lowest": r["selection_rank_lowest"],
                 "selection_rank_median": r["selection_rank_median"],
                 "selection_rank_highest": r["selection_rank_highest"],
@@ -1666,230 +1755,47 @@ def compute_courses_report(conn, institution_id):
     # which was misleading — Law at 84 would be compared against an
     # Arts degree at 49 because both fall under Society & Culture.
     # Now we extract discipline keywords from titles and match like-for-like.
-
-    # Discipline keywords: extracted from course title for matching.
-    # Order matters — first match wins, so more specific before general.
-    _DISCIPLINE_KEYWORDS = [
-        ("Law", ["law", "legal"]),
-        ("Nursing", ["nursing", "midwifery"]),
-        ("Medicine", ["medicine", "medical science", "clinical science"]),
-        ("Pharmacy", ["pharmacy", "pharmaceutical"]),
-        ("Physiotherapy", ["physiotherapy", "physical therapy"]),
-        ("Occupational Therapy", ["occupational therapy"]),
-        ("Speech Pathology", ["speech pathol"]),
-        ("Dentistry", ["dentistry", "dental", "oral health"]),
-        ("Psychology", ["psychology", "psychological"]),
-        ("Social Work", ["social work"]),
-        ("Criminology", ["criminolog", "criminal justice", "policing"]),
-        ("Engineering", ["engineering", "mechatronic"]),
-        ("Architecture", ["architecture", "built environment", "interior architecture"]),
-        ("Computer Science", ["computer science", "software", "cyber", "information technology"]),
-        ("Data Science", ["data science", "data analytics"]),
-        ("Education", ["education", "teaching"]),
-        ("Accounting", ["accounting"]),
-        ("Commerce", ["commerce", "business"]),
-        ("Economics", ["economics", "actuarial"]),
-        ("Science", ["science"]),
-        ("Arts", ["arts"]),
-        ("Communication", ["communication", "media", "journalism"]),
-        ("Design", ["design"]),
-        ("Music", ["music", "conservatorium"]),
-    ]
-
-    def _extract_discipline(title):
-        """Extract a discipline tag from a course title for cross-institution matching."""
-        t = (title or "").lower()
-        for discipline, keywords in _DISCIPLINE_KEYWORDS:
-            for kw in keywords:
-                if kw in t:
-                    return discipline
-        return None
-
-    def _extract_all_disciplines(title):
-        """Extract ALL matching discipline tags (for indexing double-degrees)."""
-        t = (title or "").lower()
-        found = []
-        for discipline, keywords in _DISCIPLINE_KEYWORDS:
-            for kw in keywords:
-                if kw in t:
-                    found.append(discipline)
-                    break
-        return found
+    # Comparisons are slices of the discipline × institution matrix, built
+    # once per data version, with this institution removed.
+    matrix = _precomputed(conn, "discipline_matrix", _build_discipline_matrix)
 
     # Tag each course with its discipline (used by frontend for comparison label)
     for c in courses:
         c["discipline"] = _extract_discipline(c["title"])
 
-    # Build set of (discipline, field_of_study) pairs from our courses
-    our_courses_by_discipline = {}
+    field_comparison_out = {}  # keyed by course_code -> [{institution, atar, ...}]
     for c in courses:
         fos = c.get("field_of_study")
         if not fos or fos == "Mixed Field Programs":
             continue
-        disc = _extract_discipline(c["title"])
+        # A discipline match is kept even when no other institution offers
+        # it, so the course does NOT fall through to the broad field-level
+        # fallback (which would be misleading).  Courses with no discipline
+        # tag compare against the same broad field instead.
+        disc = c["discipline"]
         if disc:
-            our_courses_by_discipline.setdefault(disc, []).append(c)
-
-    field_comparison = {}  # keyed by course_code -> {inst_name -> best entry}
-    if our_courses_by_discipline:
-        # Get all current *bachelor-level* courses across other institutions.
-        all_rows = conn.execute("""
-            SELECT uc.course_code, uc.title, uc.institution_id,
-                   i.name AS institution_name,
-                   uc.atar_lowest, uc.pct_atar_based,
-                   ucd.areas_of_study
-            FROM uac_courses uc
-            JOIN uac_course_details ucd
-                ON ucd.course_code = uc.course_code AND ucd.level = uc.level
-            JOIN institutions i ON i.id = uc.institution_id
-            WHERE uc.course_status = 'C'
-              AND uc.atar_lowest IS NOT NULL
-              AND uc.institution_id != ?
-              AND uc.course_level = 'TBP'
-        """, (institution_id,)).fetchall()
-
-        # Index external courses by discipline
-        external_by_discipline = {}
-        for ar in all_rows:
-            atar_num = _parse_atar(ar["atar_lowest"])
-            if atar_num is None or atar_num < 1:
-                continue
-            pct_raw = ar["pct_atar_based"]
-            if pct_raw in (None, "", "0", "<5", "N/P", "NP", "NN", "N/A"):
-                continue
-            try:
-                pct_atar = float(pct_raw)
-            except (ValueError, TypeError):
-                continue
-            if pct_atar < 25:
-                continue
-            discs = _extract_all_disciplines(ar["title"])
-            entry = {
-                "course_code": ar["course_code"],
-                "title": ar["title"],
-                "institution_name": ar["institution_name"],
-                "atar_num": atar_num,
-            }
-            for disc in discs:
-                external_by_discipline.setdefault(disc, []).append(entry)
-
-        # For each of our courses, find discipline-matched comparisons
-        for disc, our_list in our_courses_by_discipline.items():
-            ext_list = external_by_discipline.get(disc, [])
-
-            # Build best-per-institution map for this discipline
-            inst_best = {}
-            for ext in ext_list:
-                inst = ext["institution_name"]
-                if inst not in inst_best or ext["atar_num"] < inst_best[inst]["atar"]:
-                    inst_best[inst] = {
-                        "atar": ext["atar_num"],
-                        "title": ext["title"],
-                        "course_code": ext["course_code"],
-                    }
-
-            # Assign this comparison to each of our courses in this discipline.
-            # Even when inst_best is empty, mark the course so it does NOT fall
-            # through to the broad field-level fallback (which would be misleading).
-            for c in our_list:
-                cc = c["course_code"]
-                field_comparison[cc] = inst_best
-
-    # Also keep a field-level fallback for courses with no discipline match
-    # (i.e. courses where _extract_discipline returns None)
-    field_level_comparison = {}
-    for c in courses:
-        cc = c["course_code"]
-        if cc in field_comparison:
-            continue  # already has discipline match
-        fos = c.get("field_of_study")
-        if not fos or fos == "Mixed Field Programs":
-            continue
-        # This course has no discipline match; build a field-level one
-        if fos not in field_level_comparison:
-            # Compute field-level comparison on demand
-            all_rows_for_field = conn.execute("""
-                SELECT uc.course_code, uc.title, uc.institution_id,
-                       i.name AS institution_name,
-                       uc.atar_lowest, uc.pct_atar_based,
-                       ucd.areas_of_study
-                FROM uac_courses uc
-                JOIN uac_course_details ucd
-                    ON ucd.course_code = uc.course_code AND ucd.level = uc.level
-                JOIN institutions i ON i.id = uc.institution_id
-                WHERE uc.course_status = 'C'
-                  AND uc.atar_lowest IS NOT NULL
-                  AND uc.institution_id != ?
-                  AND uc.course_level = 'TBP'
-            """, (institution_id,)).fetchall()
-            inst_best = {}
-            for ar in all_rows_for_field:
-                ar_fos = _classify_field(ar["title"], ar["areas_of_study"])
-                if ar_fos != fos:
-                    continue
-                atar_num = _parse_atar(ar["atar_lowest"])
-                if atar_num is None or atar_num < 1:
-                    continue
-                pct_raw = ar["pct_atar_based"]
-                if pct_raw in (None, "", "0", "<5", "N/P", "NP", "NN", "N/A"):
-                    continue
-                try:
-                    pct_atar = float(pct_raw)
-                except (ValueError, TypeError):
-                    continue
-                if pct_atar < 25:
-                    continue
-                inst = ar["institution_name"]
-                if inst not in inst_best or atar_num < inst_best[inst]["atar"]:
-                    inst_best[inst] = {
-                        "atar": atar_num,
-                        "title": ar["title"],
-                        "course_code": ar["course_code"],
-                    }
-            field_level_comparison[fos] = inst_best
-        field_comparison[cc] = field_level_comparison[fos]
-
-    # Convert to sorted list format per course_code
-    field_comparison_out = {}
-    for cc, inst_map in field_comparison.items():
-        entries = sorted(
-            [{"institution": k, "atar": v["atar"], "title": v["title"], "course_code": v["course_code"]}
-             for k, v in inst_map.items()],
-            key=lambda x: x["atar"],
+            best_by_inst = matrix["discipline"].get(disc, {})
+        else:
+            best_by_inst = matrix["field"].get(fos, {})
+        field_comparison_out[c["course_code"]] = _comparison_slice(
+            best_by_inst, exclude_institution_id=institution_id,
         )
-        field_comparison_out[cc] = entries
 
     # ── Historical ATAR trend per course ──────────────────────────────
-    # Grab all historical ATAR data for this institution's courses
-    hist_rows = conn.execute("""
-        SELECT course_code, atar_year, atar_lowest
-        FROM uac_courses
-        WHERE institution_id = ?
-          AND atar_year > 0
-          AND atar_lowest IS NOT NULL
-          AND course_status = 'C'
-        ORDER BY course_code, atar_year
-    """, (institution_id,)).fetchall()
-
-    atar_trends_raw = {}
-    for hr in hist_rows:
-        cc = hr["course_code"]
-        atar_num = _parse_atar(hr["atar_lowest"])
-        if atar_num is None:
-            continue
-        if cc not in atar_trends_raw:
-            atar_trends_raw[cc] = []
-        atar_trends_raw[cc].append({
-            "year": hr["atar_year"],
-            "atar": atar_num,
-        })
-
     # Merge ATAR trend data for campus variants under the primary code.
     # When multiple campus codes share trends, keep the one with the
     # most data points (usually they're identical anyway).
+    history = compute_atar_history(conn, institution_id)
     atar_trends = {}
-    for cc, points in atar_trends_raw.items():
-        primary_cc = _course_code_to_primary.get(cc, cc)
+    for cc, series in history.items():
+        if cc not in _course_code_to_primary:
+            continue  # not a current course
+        points = [
+            {"year": year, "atar": lowest}
+            for year, lowest in zip(series["years"], series["lowest"])
+            if lowest is not None
+        ]
+        primary_cc = _course_code_to_primary[cc]
         if primary_cc not in atar_trends or len(points) > len(atar_trends[primary_cc]):
             atar_trends[primary_cc] = points
 
@@ -1914,108 +1820,392 @@ def compute_courses_report(conn, institution_id):
     }
 
 
-def compute_sector_admission_profile(conn):
+_PROFILE_PCT_COLUMNS = {
+    "atar_based": "pct_atar_based",
+    "higher_ed": "pct_higher_ed",
+    "vet": "pct_vet",
+    "work_life": "pct_work_life",
+    "international": "pct_international",
+}
+
+
+def _build_admission_profiles(conn: sqlite3.Connection) -> Dict[Tuple[Any, Any], Dict[str, Any]]:
     """
-    Aggregate student admission profile data across all UAC institutions
-    (NSW/ACT sector-wide).  Returns weighted averages of how students were
-    admitted, plus total student count.
+    Aggregate student admission profiles for every scope in one pass.
+
+    Scopes are keyed (institution_id, field_of_study), with None meaning
+    "all": (None, None) is the sector, (id, None) an institution,
+    (None, field) a broad field and (id, field) both.
     """
     rows = conn.execute("""
         SELECT
+            uc.institution_id,
+            uc.title,
+            ucd.areas_of_study,
             uc.student_profile_year,
-            uc.total_students,
-            uc.pct_atar_based,
-            uc.pct_higher_ed,
-            uc.pct_vet,
-            uc.pct_work_life,
-            uc.pct_international
+            uc.total_students, uc.total_students_num,
+            uc.pct_atar_based, uc.pct_atar_based_num,
+            uc.pct_higher_ed, uc.pct_higher_ed_num,
+            uc.pct_vet, uc.pct_vet_num,
+            uc.pct_work_life, uc.pct_work_life_num,
+            uc.pct_international, uc.pct_international_num
         FROM uac_courses uc
+        LEFT JOIN uac_course_details ucd
+            ON ucd.course_code = uc.course_code AND ucd.level = uc.level
         WHERE uc.course_status = 'C'
           AND uc.level = 'undergraduate'
-          AND uc.total_students IS NOT NULL
-          AND uc.pct_atar_based IS NOT NULL
+          AND uc.total_students_num > 0
+          AND uc.pct_atar_based_num IS NOT NULL
+        ORDER BY uc.id
     """).fetchall()
 
-    if not rows:
-        return None
+    accumulators: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for r in rows:
+        n = r["total_students_num"]
+        pcts = {k: r[f"{col}_num"] for k, col in _PROFILE_PCT_COLUMNS.items()}
+
+        # UAC duplicates the same student profile across campus/variant
+        # listings.  Deduplicate by the full profile signature (identical
+        # total + identical % breakdown = same cohort) within each scope so
+        # each cohort is counted only once.
+        signature = (r["total_students"],) + tuple(r[col] for col in _PROFILE_PCT_COLUMNS.values())
+
+        inst_id = r["institution_id"]
+        fos = _classify_field(r["title"], r["areas_of_study"])
+        scopes = [(None, None), (None, fos)]
+        if inst_id is not None:
+            scopes += [(inst_id, None), (inst_id, fos)]
+
+        for scope in scopes:
+            acc = accumulators.get(scope)
+            if acc is None:
+                acc = accumulators[scope] = {
+                    "seen": set(),
+                    "total": 0,
+                    "weighted": dict.fromkeys(_PROFILE_PCT_COLUMNS, 0.0),
+                    "year": None,
+                }
+            if signature in acc["seen"]:
+                continue
+            acc["seen"].add(signature)
+            acc["total"] += n
+            for k, v in pcts.items():
+                acc["weighted"][k] += (v or 0) * n
+            if not acc["year"] and r["student_profile_year"]:
+                acc["year"] = r["student_profile_year"]
+
+    profiles: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+    for scope, acc in accumulators.items():
+        total = acc["total"]
+        if total == 0:
+            continue
+        profile = {"profile_year": acc["year"], "total_students": total}
+        for k, v in acc["weighted"].items():
+            profile[f"pct_{k}"] = round(v / total, 1)
+        profiles[scope] = profile
+    return profiles
 
-    def _safe_float(val):
-        if not val or str(val).strip().startswith("<"):
-            return None
-        try:
-            return float(val)
-        except (ValueError, TypeError):
-            return None
 
-    def _safe_int(val):
-        if not val:
-            return None
-        try:
-            return int(str(val).replace(",", ""))
-        except (ValueError, TypeError):
+def compute_sector_admission_profile(conn, institution_id=None, field=None):
+    """
+    Return the aggregated student admission profile for UAC institutions
+    (NSW/ACT), optionally narrowed to one institution and/or one broad
+    field of study.  Weighted averages of how students were admitted, plus
+    total student count, served from a table computed once per data version.
+    Returns None if there is no profile data for the requested scope.
+    """
+    field_name = None
+    if field:
+        field_name = _resolve_field_name(field)
+        if field_name is None:
             return None
 
-    total_students = 0
-    weighted = {
-        "atar_based": 0.0,
-        "higher_ed": 0.0,
-        "vet": 0.0,
-        "work_life": 0.0,
-        "international": 0.0,
-    }
+    profiles = _precomputed(conn, "admission_profiles", _build_admission_profiles)
+    return profiles.get((institution_id, field_name))
+
 
-    # UAC duplicates the same student profile across campus/variant
-    # listings.  Deduplicate by the full profile signature so each
-    # cohort is counted only once.
-    seen_profiles = set()
+# ── ATAR history ────────────────────────────────────────────────────
 
-    profile_year = None
+def compute_atar_history(conn, institution_id):
+    """
+    Return every recorded ATAR profile year for an institution's courses as
+    columnar arrays, {course_code: {"years", "lowest", "median", "highest"}},
+    in one indexed query.  Campus variants sharing a course code are merged
+    (lowest of the lowest, highest of the highest).  Empty if none.
+    """
+    rows = conn.execute("""
+        SELECT course_code, year,
+               MIN(lowest) AS lowest, MIN(median) AS median, MAX(highest) AS highest
+        FROM uac_atar_history
+        WHERE institution_id = ?
+        GROUP BY course_code, year
+        ORDER BY course_code, year
+    """, (institution_id,)).fetchall()
+
+    history: Dict[str, Dict[str, List[Any]]] = {}
     for r in rows:
-        n = _safe_int(r["total_students"])
-        if not n or n <= 0:
-            continue
+        series = history.get(r["course_code"])
+        if series is None:
+            series = history[r["course_code"]] = {
+                "years": [], "lowest": [], "median": [], "highest": [],
+            }
+        series["years"].append(r["year"])
+        series["lowest"].append(r["lowest"])
+        series["median"].append(r["median"])
+        series["highest"].append(r["highest"])
+    return history
+
 
-        pct_atar = _safe_float(r["pct_atar_based"])
-        pct_he = _safe_float(r["pct_higher_ed"])
-        pct_vet = _safe_float(r["pct_vet"])
-        pct_wl = _safe_float(r["pct_work_life"])
-        pct_int = _safe_float(r["pct_international"])
+# ── ATAR range index: "courses I can get into" ──────────────────────
 
-        if pct_atar is None:
+ATAR_INDEX_BASES = ("lowest", "median")
+
+
+def _resolve_field_name(field: str) -> Optional[str]:
+    """Map a broad field name or its short display label to the ASCED name."""
+    f = field.strip().lower()
+    for name, label in FIELD_OF_STUDY_LABELS.items():
+        if f in (name.lower(), label.lower()):
+            return name
+    return None
+
+
+def _build_atar_index(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Build sorted entry-rank arrays over current undergraduate courses.
+
+    Each course is keyed on its lowest (or median) selection rank, falling
+    back to the raw ATAR when no selection rank is published.  Arrays are
+    built for all courses and per broad field so a query is one binary
+    search.  Completion/attrition metrics for every institution in the index
+    are computed here too, so requests never touch the metric tables.
+    """
+    rows = conn.execute("""
+        SELECT
+            uc.course_code, uc.title, uc.course_level, uc.campus_code,
+            uc.institution_id, i.name AS institution_name,
+            camp.name_short AS campus_name,
+            uc.atar_year, uc.atar_lowest, uc.atar_median,
+            uc.selection_rank_lowest, uc.selection_rank_median,
+            uc.atar_lowest_num, uc.atar_median_num,
+            uc.selection_rank_lowest_num, uc.selection_rank_median_num,
+            ucd.areas_of_study, ucd.further_info_url
+        FROM uac_courses uc
+        JOIN institutions i ON i.id = uc.institution_id
+        LEFT JOIN uac_course_details ucd
+            ON ucd.course_code = uc.course_code AND ucd.level = uc.level
+        LEFT JOIN uac_campuses camp
+            ON camp.campus_location_code = uc.campus_location
+        WHERE uc.course_status = 'C'
+          AND uc.level = 'undergraduate'
+    """).fetchall()
+
+    seen = set()
+    courses: List[Dict[str, Any]] = []
+    for r in rows:
+        key = (r["course_code"], r["campus_code"])
+        if key in seen:
             continue
+        seen.add(key)
 
-        # Dedup key: identical total + identical % breakdown = same cohort
-        key = (
-            r["total_students"],
-            r["pct_atar_based"],
-            r["pct_higher_ed"],
-            r["pct_vet"],
-            r["pct_work_life"],
-            r["pct_international"],
-        )
-        if key in seen_profiles:
+        lsr = r["selection_rank_lowest_num"]
+        msr = r["selection_rank_median_num"]
+        rank_lowest = lsr if lsr is not None else r["atar_lowest_num"]
+        rank_median = msr if msr is not None else r["atar_median_num"]
+        if rank_lowest is None and rank_median is None:
             continue
-        seen_profiles.add(key)
 
-        total_students += n
-        weighted["atar_based"] += (pct_atar or 0) * n
-        weighted["higher_ed"] += (pct_he or 0) * n
-        weighted["vet"] += (pct_vet or 0) * n
-        weighted["work_life"] += (pct_wl or 0) * n
-        weighted["international"] += (pct_int or 0) * n
+        fos = _classify_field(r["title"], r["areas_of_study"])
+        courses.append({
+            "course_code": r["course_code"],
+            "title": r["title"],
+            "course_level": r["course_level"],
+            "course_level_label": COURSE_LEVEL_LABELS.get(r["course_level"], r["course_level"]),
+            "field_of_study": fos,
+            "field_of_study_label": FIELD_OF_STUDY_LABELS.get(fos, fos),
+            "institution_id": r["institution_id"],
+            "institution_name": r["institution_name"],
+            "campus_name": r["campus_name"] or r["campus_code"],
+            "atar_year": r["atar_year"],
+            "atar_lowest": r["atar_lowest"],
+            "atar_median": r["atar_median"],
+            "selection_rank_lowest": r["selection_rank_lowest"],
+            "selection_rank_median": r["selection_rank_median"],
+            "further_info_url": r["further_info_url"],
+            "_rank": {"lowest": rank_lowest, "median": rank_median},
+        })
+
+    index: Dict[str, Dict[str, Tuple[List[float], List[Dict[str, Any]]]]] = {}
+    for basis in ATAR_INDEX_BASES:
+        keyed = sorted(
+            (c for c in courses if c["_rank"][basis] is not None),
+            key=lambda c: (c["_rank"][basis], c["title"], c["course_code"]),
+        )
+        by_field: Dict[str, Tuple[List[float], List[Dict[str, Any]]]] = {
+            "": ([c["_rank"][basis] for c in keyed], keyed),
+        }
+        for c in keyed:
+            keys, entries = by_field.setdefault(c["field_of_study"], ([], []))
+            keys.append(c["_rank"][basis])
+            entries.append(c)
+        index[basis] = by_field
+
+    institutions: Dict[int, Dict[str, Any]] = {}
+    for iid in sorted({c["institution_id"] for c in courses}):
+        completion = _compute_completion(conn, iid)
+        attrition = _compute_attrition(conn, iid)
+        institutions[iid] = {
+            "four_year_completion_pct": completion["four_year_pct"],
+            "six_year_completion_pct": completion["six_year_pct"],
+            "attrition_rate": attrition["latest_rate"],
+            "attrition_year": attrition["latest_year"],
+            "attrition_risk_level": attrition["risk_level"],
+        }
 
-        if not profile_year and r["student_profile_year"]:
-            profile_year = r["student_profile_year"]
+    return {"index": index, "institutions": institutions}
+
+
+def compute_courses_by_atar(
+    conn: sqlite3.Connection,
+    atar: float,
+    field: Optional[str] = None,
+    basis: str = "lowest",
+    margin: Optional[float] = None,
+    limit: int = 200,
+) -> Optional[Dict[str, Any]]:
+    """
+    Return current UAC undergraduate courses whose entry rank is at or below atar.
+
+    basis='lowest' compares against the lowest selection rank admitted
+    (a course you could get into); basis='median' against the median
+    (a course where you would be a typical admit).  margin restricts the
+    scan to [atar - margin, atar].  Results are ordered closest-to-atar
+    first and joined to each institution's completion and attrition metrics.
+
+    Returns None if the field is unknown or no UAC data exists.
+    """
+    field_name = ""
+    if field:
+        field_name = _resolve_field_name(field)
+        if field_name is None:
+            return None
 
-    if total_students == 0:
+    data = _precomputed(conn, "atar_index", _build_atar_index)
+    if not data["index"][ATAR_INDEX_BASES[0]][""][1]:
+        return None
+
+    keys, entries = data["index"][basis].get(field_name, ([], []))
+    hi = bisect.bisect_right(keys, atar)
+    lo = bisect.bisect_left(keys, atar - margin) if margin is not None else 0
+
+    matched = entries[lo:hi][::-1]
+    courses = []
+    for c in matched[:limit]:
+        out = {k: v for k, v in c.items() if k != "_rank"}
+        out["entry_rank"] = c["_rank"][basis]
+        courses.append(out)
+
+    inst_ids = {c["institution_id"] for c in courses}
+    return {
+        "atar": atar,
+        "field": field_name or None,
+        "basis": basis,
+        "total": len(matched),
+        "courses": courses,
+        "institutions": {
+            iid: m for iid, m in data["institutions"].items() if iid in inst_ids
+        },
+    }
+
+
+# ── Discipline × institution comparison matrix ──────────────────────
+
+def _build_discipline_matrix(conn: sqlite3.Connection) -> Dict[str, Dict[str, Dict[int, Dict[str, Any]]]]:
+    """
+    Best-entry (lowest ATAR) bachelor course per institution, per discipline
+    and per broad field of study.
+
+    Only current bachelor courses with a real ATAR where ATAR-based admission
+    is significant (>= 25%) are considered.  A double degree is indexed under
+    every discipline in its title.  Returns
+    {"discipline": {name: {institution_id: entry}}, "field": {...}}.
+    """
+    rows = conn.execute("""
+        SELECT uc.course_code, uc.title, uc.institution_id,
+               i.name AS institution_name,
+               uc.atar_lowest_num,
+               ucd.areas_of_study
+        FROM uac_courses uc
+        JOIN uac_course_details ucd
+            ON ucd.course_code = uc.course_code AND ucd.level = uc.level
+        JOIN institutions i ON i.id = uc.institution_id
+        WHERE uc.course_status = 'C'
+          AND uc.atar_lowest_num >= 1
+          AND uc.pct_atar_based_num >= 25
+          AND uc.course_level = 'TBP'
+        ORDER BY uc.id
+    """).fetchall()
+
+    matrix: Dict[str, Dict[str, Dict[int, Dict[str, Any]]]] = {"discipline": {}, "field": {}}
+
+    def _offer(kind: str, key: str, r) -> None:
+        best = matrix[kind].setdefault(key, {})
+        iid = r["institution_id"]
+        if iid not in best or r["atar_lowest_num"] < best[iid]["atar"]:
+            best[iid] = {
+                "institution": r["institution_name"],
+                "atar": r["atar_lowest_num"],
+                "title": r["title"],
+                "course_code": r["course_code"],
+            }
+
+    for r in rows:
+        for disc in _extract_all_disciplines(r["title"]):
+            _offer("discipline", disc, r)
+        _offer("field", _classify_field(r["title"], r["areas_of_study"]), r)
+    return matrix
+
+
+def _comparison_slice(
+    best_by_inst: Dict[int, Dict[str, Any]],
+    exclude_institution_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Matrix row as a list sorted by ATAR, optionally without one institution.
+    Institutions are reported by name; if two ids share a name the lower
+    ATAR is kept.
+    """
+    by_name: Dict[str, Dict[str, Any]] = {}
+    for iid, entry in best_by_inst.items():
+        if iid == exclude_institution_id:
+            continue
+        name = entry["institution"]
+        if name not in by_name or entry["atar"] < by_name[name]["atar"]:
+            by_name[name] = entry
+    return sorted(
+        (dict(entry) for entry in by_name.values()),
+        key=lambda x: x["atar"],
+    )
+
+
+def compute_discipline_comparison(conn, discipline):
+    """
+    Return the best-entry bachelor course at each UAC institution for one
+    discipline (e.g. "Law", "nursing"), sorted by lowest ATAR.
+    Returns None if the discipline name is not recognised.
+    """
+    d = discipline.strip().lower()
+    name = next((n for n, _kw in DISCIPLINE_KEYWORDS if n.lower() == d), None)
+    if name is None:
         return None
 
+    matrix = _precomputed(conn, "discipline_matrix", _build_discipline_matrix)
+    best_by_inst = matrix["discipline"].get(name, {})
+    institutions = []
+    for iid, entry in sorted(best_by_inst.items(), key=lambda kv: kv[1]["atar"]):
+        institutions.append({"institution_id": iid, **entry})
     return {
-        "profile_year": profile_year,
-        "total_students": total_students,
-        "pct_atar_based": round(weighted["atar_based"] / total_students, 1),
-        "pct_higher_ed": round(weighted["higher_ed"] / total_students, 1),
-        "pct_vet": round(weighted["vet"] / total_students, 1),
-        "pct_work_life": round(weighted["work_life"] / total_students, 1),
-        "pct_international": round(weighted["international"] / total_students, 1),
+        "discipline": name,
+        "total_institutions": len(institutions),
+        "institutions": institutions,
     }
@@ -12,8 +12,10 @@ Tables created:
   - uac_campuses         : Campus locations
   - uac_courses          : Course listings with ATAR profiles
   - uac_course_details   : Extended course information (about, admission, careers)
+  - uac_atar_history     : Every published ATAR profile year, kept across runs
 """
 
+import argparse
 import json
 import math
 import os
@@ -169,6 +171,82 @@ def parse_duration(dur_list):
     return "; ".join(parts)
 
 
+# Non-numeric placeholders UAC publishes in ATAR / selection rank fields
+ATAR_SENTINELS = frozenset({
+    "NO", "NC", "NS", "NR", "NP", "NN", "N/A", "N/P", "<5", "--", "",
+})
+
+
+def parse_rank(val):
+    """Parse an ATAR / selection rank string, returning None for sentinels."""
+    if not val or str(val).strip().upper() in ATAR_SENTINELS:
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_pct(val):
+    """Parse a student-profile percentage, returning None for '<5', 'N/P' etc."""
+    if not val or str(val).strip().startswith("<"):
+        return None
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return None
+
+
+def parse_count(val):
+    """Parse a student headcount such as '1,234', returning None for sentinels."""
+    if not val:
+        return None
+    try:
+        return int(str(val).replace(",", ""))
+    except (ValueError, TypeError):
+        return None
+
+
+# (typed column, SQL type, raw text column, parser)
+NUMERIC_COLUMNS = [
+    ("atar_lowest_num", "REAL", "atar_lowest", parse_rank),
+    ("atar_median_num", "REAL", "atar_median", parse_rank),
+    ("atar_highest_num", "REAL", "atar_highest", parse_rank),
+    ("selection_rank_lowest_num", "REAL", "selection_rank_lowest", parse_rank),
+    ("selection_rank_median_num", "REAL", "selection_rank_median", parse_rank),
+    ("selection_rank_highest_num", "REAL", "selection_rank_highest", parse_rank),
+    ("total_students_num", "INTEGER", "total_students", parse_count),
+    ("pct_atar_based_num", "REAL", "pct_atar_based", parse_pct),
+    ("pct_atar_plus_num", "REAL", "pct_atar_plus", parse_pct),
+    ("pct_recent_secondary_other_num", "REAL", "pct_recent_secondary_other", parse_pct),
+    ("pct_higher_ed_num", "REAL", "pct_higher_ed", parse_pct),
+    ("pct_vet_num", "REAL", "pct_vet", parse_pct),
+    ("pct_work_life_num", "REAL", "pct_work_life", parse_pct),
+    ("pct_international_num", "REAL", "pct_international", parse_pct),
+]
+
+
+def atar_history_rows(atar_profile, course_code, campus_code, institution_id=None):
+    """Return uac_atar_history rows for every year in an atarProfile block."""
+    rows = []
+    if not atar_profile:
+        return rows
+    for ap in atar_profile.get("AtarProfiles") or []:
+        try:
+            year = int(ap.get("year") or 0)
+        except (ValueError, TypeError):
+            continue
+        if year <= 0:
+            continue
+        lowest = parse_rank(ap.get("lowestAtar"))
+        median = parse_rank(ap.get("medianAtar"))
+        highest = parse_rank(ap.get("highestAtar"))
+        if lowest is None and median is None and highest is None:
+            continue
+        rows.append((course_code, campus_code or "", year, lowest, median, highest, institution_id))
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # Schema creation
 # ---------------------------------------------------------------------------
@@ -217,6 +295,13 @@ def create_tables(conn):
             selection_rank_median  TEXT,              -- MSR
             selection_rank_highest TEXT,              -- HSR
             atar_profile_code TEXT,
+            -- Parsed ATAR profile (NULL for sentinels such as NC, N/P, <5)
+            atar_lowest_num             REAL,
+            atar_median_num             REAL,
+            atar_highest_num            REAL,
+            selection_rank_lowest_num   REAL,
+            selection_rank_median_num   REAL,
+            selection_rank_highest_num  REAL,
             -- PLSR
             plsr            TEXT,
             -- Student profile
@@ -229,6 +314,15 @@ def create_tables(conn):
             pct_vet                 TEXT,
             pct_work_life           TEXT,
             pct_international       TEXT,
+            -- Parsed student profile (NULL for sentinels such as <5, N/P)
+            total_students_num              INTEGER,
+            pct_atar_based_num              REAL,
+            pct_atar_plus_num               REAL,
+            pct_recent_secondary_other_num  REAL,
+            pct_higher_ed_num               REAL,
+            pct_vet_num                     REAL,
+            pct_work_life_num               REAL,
+            pct_international_num           REAL,
             -- Offerings
             next_start_date TEXT,
             final_closing   TEXT,
@@ -269,6 +363,33 @@ def create_tables(conn):
             PRIMARY KEY(course_code, level)
         );
 
+
+        -- One row per course/campus/year.  uac_courses only holds the
+        -- latest profile, so every year UAC publishes is accumulated here
+        -- and never deleted by a re-ingest.
+        CREATE TABLE IF NOT EXISTS uac_atar_history (
+            course_code     TEXT NOT NULL,
+            campus_code     TEXT NOT NULL DEFAULT '',
+            year            INTEGER NOT NULL,
+            lowest          REAL,
+            median          REAL,
+            highest         REAL,
+            institution_id  INTEGER REFERENCES institutions(id),
+            PRIMARY KEY(course_code, campus_code, year)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_uac_atar_history_inst
+            ON uac_atar_history(institution_id, course_code, year);
+    """)
+
+    # Databases created before the parsed columns existed need them added
+    # before the indexes below can reference them.
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(uac_courses)")}
+    for col, col_type, _raw, _parser in NUMERIC_COLUMNS:
+        if col not in existing:
+            conn.execute(f"ALTER TABLE uac_courses ADD COLUMN {col} {col_type}")
+
+    conn.executescript("""
         CREATE INDEX IF NOT EXISTS idx_uac_courses_provider
             ON uac_courses(provider_id);
         CREATE INDEX IF NOT EXISTS idx_uac_courses_inst
@@ -277,6 +398,12 @@ def create_tables(conn):
             ON uac_courses(level);
         CREATE INDEX IF NOT EXISTS idx_uac_courses_code
             ON uac_courses(course_code);
+        -- Sector admission profile / ATAR index: current courses by level
+        CREATE INDEX IF NOT EXISTS idx_uac_courses_status_level
+            ON uac_courses(course_status, level);
+        -- Cross-institution comparison: current bachelor courses by ATAR
+        CREATE INDEX IF NOT EXISTS idx_uac_courses_cmp
+            ON uac_courses(course_level, course_status, atar_lowest_num);
     """)
     conn.commit()
     print("Schema created/verified.")
@@ -528,6 +655,7 @@ def ingest_courses(conn, all_courses, inst_lookup):
     """Ingest course listing data."""
     print("\n--- Ingesting courses ---")
     total = 0
+    history = []
     for level, courses in all_courses.items():
         count = 0
         for c in courses:
@@ -548,6 +676,9 @@ def ingest_courses(conn, all_courses, inst_lookup):
                 msr = ap.get("msr")
                 hsr = ap.get("hsr")
                 atar_code = ap.get("atarProfileCode")
+            history.extend(atar_history_rows(
+                atar, c.get("courseCode", ""), c.get("campusCode"), inst_id,
+            ))
 
             # Offerings
             offerings = c.get("offerings") or []
@@ -629,8 +760,9 @@ def ingest_courses(conn, all_courses, inst_lookup):
         total += count
         print(f"  {level}: {count} courses ingested")
 
+    upsert_atar_history(conn, history)
     conn.commit()
-    print(f"  Total: {total} courses")
+    print(f"  Total: {total} courses, {len(history)} ATAR profile years")
 
 
 def ingest_course_details(conn, details_dir):
@@ -639,6 +771,7 @@ def ingest_course_details(conn, details_dir):
     detail_files = sorted(details_dir.glob("*.json"))
     count = 0
     updated = 0
+    history = []
 
     for f in detail_files:
         try:
@@ -721,6 +854,7 @@ def ingest_course_details(conn, details_dir):
 
             # ATAR from variant (may differ from search result)
             v_atar = variant.get("atarProfile")
+            history.extend(atar_history_rows(v_atar, v_code, v_campus))
             if v_atar and v_atar.get("AtarProfiles"):
                 vap = v_atar["AtarProfiles"][0]
                 v_atar_year = int(vap.get("year", 0)) if vap.get("year") else None
@@ -769,15 +903,107 @@ def ingest_course_details(conn, details_dir):
             if result.rowcount > 0:
                 updated += 1
 
+    upsert_atar_history(conn, history)
     conn.commit()
     print(f"  Ingested {count} detail pages, updated {updated} course rows")
 
 
+def upsert_atar_history(conn, rows):
+    """Merge ATAR profile years into uac_atar_history, keeping older years.
+
+    A later run only overwrites a year's values when it has them, so a
+    profile that UAC stops publishing (or publishes as a sentinel) does not
+    erase what an earlier run recorded.
+    """
+    conn.executemany("""
+        INSERT INTO uac_atar_history (
+            course_code, campus_code, year, lowest, median, highest, institution_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(course_code, campus_code, year) DO UPDATE SET
+            lowest = COALESCE(excluded.lowest, lowest),
+            median = COALESCE(excluded.median, median),
+            highest = COALESCE(excluded.highest, highest),
+            institution_id = COALESCE(excluded.institution_id, institution_id)
+    """, rows)
+
+
+def link_atar_history(conn):
+    """Seed history from the current uac_courses profile and fill institution ids.
+
+    Seeding covers databases ingested before uac_atar_history existed; the
+    typed columns must already be populated.
+    """
+    print("\n--- Linking ATAR history ---")
+    conn.execute("""
+        INSERT OR IGNORE INTO uac_atar_history (
+            course_code, campus_code, year, lowest, median, highest, institution_id
+        )
+        SELECT course_code, COALESCE(campus_code, ''), atar_year,
+               atar_lowest_num, atar_median_num, atar_highest_num, institution_id
+        FROM uac_courses
+        WHERE atar_year > 0
+          AND (atar_lowest_num IS NOT NULL OR atar_median_num IS NOT NULL
+               OR atar_highest_num IS NOT NULL)
+    """)
+    conn.execute("""
+        UPDATE uac_atar_history SET institution_id = (
+            SELECT uc.institution_id FROM uac_courses uc
+            WHERE uc.course_code = uac_atar_history.course_code
+              AND uc.institution_id IS NOT NULL
+            LIMIT 1
+        )
+        WHERE institution_id IS NULL
+    """)
+    conn.commit()
+    n_rows, n_courses = conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT course_code) FROM uac_atar_history"
+    ).fetchone()
+    print(f"  {n_rows} ATAR profile years across {n_courses} courses")
+
+
+def populate_numeric_columns(conn):
+    """Fill the typed *_num columns from the raw text columns kept for display.
+
+    Runs as a single pass after courses and details are ingested, because
+    details update the raw columns with COALESCE over the search results.
+    """
+    print("\n--- Populating typed numeric columns ---")
+    raw_cols = ", ".join(raw for _col, _type, raw, _parser in NUMERIC_COLUMNS)
+    rows = conn.execute(f"SELECT id, {raw_cols} FROM uac_courses").fetchall()
+
+    updates = []
+    for row in rows:
+        values = [parser(row[i + 1]) for i, (_c, _t, _r, parser) in enumerate(NUMERIC_COLUMNS)]
+        updates.append((*values, row[0]))
+
+    assignments = ", ".join(f"{col} = ?" for col, _type, _raw, _parser in NUMERIC_COLUMNS)
+    conn.executemany(f"UPDATE uac_courses SET {assignments} WHERE id = ?", updates)
+    conn.commit()
+    print(f"  Parsed numeric fields for {len(updates)} course rows")
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fetch UAC course data and ingest it into he_stats.db")
+    ap.add_argument(
+        "--numeric-only",
+        action="store_true",
+        help="Only add/refresh the typed numeric columns and ATAR history "
+             "in an existing database (no fetching)",
+    )
+    args = ap.parse_args(argv)
+
+    if args.numeric_only:
+        conn = sqlite3.connect(str(DB_PATH))
+        create_tables(conn)
+        populate_numeric_columns(conn)
+        link_atar_history(conn)
+        conn.close()
+        return
+
     print("=" * 60)
     print("UAC Course Data Fetcher & Ingester")
     print("=" * 60)
@@ -809,13 +1035,16 @@ def main():
     ingest_campuses(conn, campuses or [])
     ingest_courses(conn, all_courses, inst_lookup)
     ingest_course_details(conn, details_dir)
+    populate_numeric_columns(conn)
+    link_atar_history(conn)
 
     # Summary
     print("\n" + "=" * 60)
     print("Summary")
     print("=" * 60)
 
-    for table in ["uac_providers", "uac_campuses", "uac_courses", "uac_course_details"]:
+    for table in ["uac_providers", "uac_campuses", "uac_courses", "uac_course_details",
+                  "uac_atar_history"]:
         count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
         print(f"  {table}: {count} rows")
 
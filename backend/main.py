@@ -15,8 +15,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, Response
 
-from db import get_db
-from engine import compute_report, compute_field_heatmap, compute_equity_report, compute_courses_report, compute_sector_admission_profile
+from db import current_version, get_db
+from engine import (
+    compute_report, compute_field_heatmap, compute_equity_report,
+    compute_courses_report, compute_sector_admission_profile,
+    compute_courses_by_atar, compute_discipline_comparison,
+    compute_atar_history,
+)
 
 app = FastAPI(
     title="Course Survival Probability Engine",
@@ -42,9 +47,12 @@ async def add_cache_headers(request: Request, call_next) -> Response:
     path = request.url.path
     if path.startswith("/api/") and path != "/api/health":
         # no-cache = browser may cache but must revalidate on every request.
-        # ETag on version ensures a deploy instantly invalidates all cached responses.
+        # ETag on app and database version ensures a deploy or a database
+        # swap instantly invalidates all cached responses.
+        db_version = current_version()
+        db_tag = f"{db_version[0]:x}.{db_version[2]:x}" if db_version else "none"
         response.headers["Cache-Control"] = "public, no-cache"
-        response.headers["ETag"] = f'"{APP_VERSION}-{path}"'
+        response.headers["ETag"] = f'"{APP_VERSION}-{db_tag}-{path}"'
     return response
 
 
@@ -152,14 +160,18 @@ def get_equity_report(institution_id: int):
 
 
 @app.get("/api/sector-admission-profile")
-def get_sector_admission_profile():
+def get_sector_admission_profile(
+    institution_id: Optional[int] = Query(default=None, description="Narrow to one institution"),
+    field: Optional[str] = Query(default=None, description="Narrow to one broad field, e.g. 'Health'"),
+):
     """
-    Return sector-wide (NSW/ACT) aggregated student admission profile.
-    Weighted average across all UAC undergraduate courses.
+    Return the aggregated (NSW/ACT) student admission profile.
+    Weighted average across UAC undergraduate courses — sector-wide by
+    default, or for one institution and/or broad field of study.
     """
     conn = get_db()
     try:
-        data = compute_sector_admission_profile(conn)
+        data = compute_sector_admission_profile(conn, institution_id=institution_id, field=field)
         if data is None:
             raise HTTPException(
                 status_code=404,
@@ -170,6 +182,33 @@ def get_sector_admission_profile():
         conn.close()
 
 
+@app.get("/api/courses/by-atar")
+def get_courses_by_atar(
+    atar: float = Query(..., ge=0, le=99.95, description="ATAR or selection rank"),
+    field: Optional[str] = Query(default=None, description="Broad field name or short label, e.g. 'Health'"),
+    basis: str = Query(default="lowest", pattern="^(lowest|median)$",
+                       description="Compare against the lowest or median admitted rank"),
+    margin: Optional[float] = Query(default=None, ge=0, description="Only courses within this many points below atar"),
+    limit: int = Query(default=200, ge=1, le=1000),
+):
+    """
+    Return current UAC undergraduate courses whose entry rank is at or below
+    the given ATAR, with each institution's completion and attrition metrics.
+    """
+    conn = get_db()
+    try:
+        data = compute_courses_by_atar(conn, atar, field=field, basis=basis,
+                                       margin=margin, limit=limit)
+        if data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="No UAC course data available for this field",
+            )
+        return data
+    finally:
+        conn.close()
+
+
 @app.get("/api/courses/{institution_id}")
 def get_courses(institution_id: int):
     """
@@ -189,6 +228,41 @@ def get_courses(institution_id: int):
         conn.close()
 
 
+@app.get("/api/courses/{institution_id}/atar-history")
+def get_atar_history(institution_id: int):
+    """
+    Return every recorded ATAR profile year for an institution's UAC
+    courses as columnar arrays keyed by course code.
+    """
+    conn = get_db()
+    try:
+        data = compute_atar_history(conn, institution_id)
+        if not data:
+            raise HTTPException(
+                status_code=404,
+                detail="No ATAR history available for this institution",
+            )
+        return {"institution_id": institution_id, "courses": data}
+    finally:
+        conn.close()
+
+
+@app.get("/api/disciplines/{name}/comparison")
+def get_discipline_comparison(name: str):
+    """
+    Return the lowest-ATAR bachelor course at each UAC institution for a
+    discipline such as Law or Nursing (case-insensitive).
+    """
+    conn = get_db()
+    try:
+        data = compute_discipline_comparison(conn, name)
+        if data is None:
+            raise HTTPException(status_code=404, detail="Discipline not found")
+        return data
+    finally:
+        conn.close()
+
+
 # ── Serve the React frontend (production only) ──────────────────────
 # In production the build script runs `npm run build` and the output
 # lands in ../frontend/dist.  We mount it as a catch-all so that the
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for edu_he_stats_downloader.py against the local fixture site.
+
+Starts bench/fixture_server.py on a free port, runs the downloader in each
+mode as a subprocess (--base-url pointing at the fixture, fresh output
+directory), and reports pages/sec, MB/sec, requests and retries per mode.
+The "rerun" modes crawl again into the previous mode's output directory,
+so they measure conditional (304) re-runs.
+
+Usage:
+    python bench/bench_downloader.py [--modes crawl-1,crawl-4,full-4,rerun-4]
+                                     [--latency 0.05] [--bandwidth-kbps 4096]
+                                     [--error-rate 0.02] [--json bench.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fixture_server import add_config_arguments, config_from_args, serve_in_thread  # noqa: E402
+
+DOWNLOADER = ROOT / "edu_he_stats_downloader.py"
+
+# mode -> (downloader arguments, reuse the previous mode's output directory)
+MODES: Dict[str, Tuple[List[str], bool]] = {
+    "crawl-1": (["--no-download", "--workers", "1"], False),
+    "crawl-4": (["--no-download", "--workers", "4"], False),
+    "full-1": (["--workers", "1"], False),
+    "full-4": (["--workers", "4"], False),
+    "rerun-4": (["--workers", "4"], True),
+    "relevant-4": (["--workers", "4", "--relevant-only"], False),
+    "rerun-relevant-4": (["--workers", "4", "--relevant-only"], True),
+}
+DEFAULT_MODES = "crawl-1,crawl-4,full-1,full-4,rerun-4,relevant-4,rerun-relevant-4"
+
+CRAWL_RE = re.compile(r"\[INFO\] Crawl: (\d+) pages in ([\d.]+)s")
+
+
+def run_mode(name: str, base_url: str, out_dir: Path, delay: float, server) -> Dict[str, Any]:
+    args, _reuse = MODES[name]
+    cmd = [sys.executable, str(DOWNLOADER), "--base-url", base_url, "--out", str(out_dir),
+           "--delay", str(delay), "--heartbeat", "0", "--max-pages", "100000"] + args
+    server.site.reset_stats()
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        print(proc.stdout[-2000:], proc.stderr[-2000:], file=sys.stderr)
+        raise SystemExit(f"[ERROR] mode {name} exited with {proc.returncode}")
+
+    stats = dict(server.site.stats)
+    m = CRAWL_RE.search(proc.stdout)
+    pages, crawl_s = (int(m.group(1)), float(m.group(2))) if m else (stats["pages"], wall)
+    download_s = max(wall - crawl_s, 1e-9)
+    mb = stats["download_bytes"] / (1024 * 1024)
+    return {
+        "mode": name,
+        "wall_s": round(wall, 2),
+        "crawl_s": round(crawl_s, 2),
+        "pages": pages,
+        "pages_per_s": round(pages / crawl_s, 1) if crawl_s > 0 else 0.0,
+        "files": stats["downloads"],
+        "mb": round(mb, 1),
+        "mb_per_s": round(mb / download_s, 1) if "--no-download" not in args else 0.0,
+        "requests": stats["requests"],
+        "heads": stats["heads"],
+        "retries": stats["retries"],
+        "errors_injected": stats["errors_injected"],
+        "not_modified": stats["not_modified"],
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    columns = ["mode", "wall_s", "crawl_s", "pages", "pages_per_s", "files", "mb", "mb_per_s",
+               "requests", "heads", "retries", "not_modified"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in results)) for c in columns}
+    print("  ".join(c.rjust(widths[c]) for c in columns))
+    for r in results:
+        print("  ".join(str(r[c]).rjust(widths[c]) for c in columns))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the downloader against a local fixture site")
+    ap.add_argument("--modes", type=str, default=DEFAULT_MODES,
+                    help=f"Comma-separated modes to run, from: {', '.join(MODES)}")
+    ap.add_argument("--delay", type=float, default=0.0,
+                    help="Downloader --delay (0 measures the downloader, not the politeness limit)")
+    ap.add_argument("--json", type=str, default=None, metavar="PATH", help="Also write results as JSON")
+    add_config_arguments(ap)
+    args = ap.parse_args()
+
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        ap.error(f"unknown modes: {', '.join(unknown)}")
+
+    config = config_from_args(args)
+    server, base_url = serve_in_thread(config)
+    print(f"[INFO] Fixture site at {base_url}: {config.years} years, "
+          f"{config.files_per_resource} x {config.file_kb} KB files per resource, "
+          f"latency {config.latency_s}s, bandwidth {config.bandwidth_kbps or 'unlimited'} KB/s, "
+          f"error rate {config.error_rate}")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench_downloader_") as tmp:
+        out_dir = None
+        for k, name in enumerate(modes):
+            if out_dir is None or not MODES[name][1]:
+                out_dir = Path(tmp) / f"{k}-{name}"
+            print(f"[INFO] Running {name} ...")
+            results.append(run_mode(name, base_url, out_dir, args.delay, server))
+
+    server.shutdown()
+    print()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"fixture": vars(args), "results": results}, f, indent=2)
+        print(f"[INFO] Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the crawler's link extraction.
+
+Times edu_he_stats_downloader.extract_links on saved pages and checks it
+returns exactly the URLs of the BeautifulSoup extractor it replaced (when
+beautifulsoup4 is installed).  Pages come from a downloader output
+directory (<out>/pages/, listed in pages/index.tsv), or are generated by
+bench/fixture_server.py when no directory is given.
+
+Usage:
+    python bench/bench_links.py [--pages-dir _downloads/pages] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+from urllib.parse import urljoin
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import edu_he_stats_downloader as downloader  # noqa: E402
+from fixture_server import FixtureConfig, FixtureSite  # noqa: E402
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+
+def extract_links_bs4(html: str, base_url: str) -> List[str]:
+    """The previous implementation, kept here as the reference."""
+    soup = BeautifulSoup(html, "html.parser")
+    urls: List[str] = []
+    for a in soup.find_all("a", href=True):
+        href = (a.get("href") or "").strip()
+        if not href:
+            continue
+        urls.append(downloader.normalise_url(urljoin(base_url, href)))
+    return urls
+
+
+def saved_pages(pages_dir: Path) -> List[Tuple[str, str]]:
+    """(url, html) for every page listed in pages_dir/index.tsv."""
+    entries = downloader.load_cache_index(pages_dir / "index.tsv", "file")
+    pages = []
+    for url, entry in sorted(entries.items()):
+        path = pages_dir / entry.filename
+        if path.exists():
+            pages.append((url, path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def fixture_pages(years: int) -> List[Tuple[str, str]]:
+    site = FixtureSite(FixtureConfig(years=years))
+    base = "http://127.0.0.1"
+    paths = ["/higher-education-statistics/student-data"]
+    for year in site.years():
+        paths.append(f"/higher-education-statistics/student-data/{year}-student-data")
+        paths.extend(f"/higher-education-statistics/resources/{slug}" for slug in site.resources(year))
+    return [(base + p, site.page(p)) for p in paths]
+
+
+def time_extractor(fn: Callable[[str, str], List[str]], pages: List[Tuple[str, str]],
+                   repeat: int) -> Tuple[float, List[List[str]]]:
+    """Best total seconds over repeat passes, and the links of the last pass."""
+    best = None
+    links: List[List[str]] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        links = [fn(html, url) for url, html in pages]
+        secs = time.perf_counter() - t0
+        best = secs if best is None else min(best, secs)
+    return best or 0.0, links
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark extract_links on saved pages")
+    ap.add_argument("--pages-dir", type=Path, default=None,
+                    help="Downloader pages/ directory (default: generate fixture pages)")
+    ap.add_argument("--years", type=int, default=20, help="Fixture years when generating pages")
+    ap.add_argument("--repeat", type=int, default=5, help="Passes per extractor; the best is reported")
+    args = ap.parse_args()
+
+    pages = saved_pages(args.pages_dir) if args.pages_dir else fixture_pages(args.years)
+    if not pages:
+        print(f"[ERROR] No saved pages found in {args.pages_dir}", file=sys.stderr)
+        sys.exit(1)
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"[INFO] {len(pages)} pages, {total_kb:,.0f} KB of HTML, best of {args.repeat}")
+
+    new_s, new_links = time_extractor(downloader.extract_links, pages, args.repeat)
+    print(f"  extract_links (HTMLParser): {new_s:.3f}s ({len(pages) / new_s:,.0f} pages/s)")
+
+    if BeautifulSoup is None:
+        print("[SKIP] beautifulsoup4 not installed; no reference comparison")
+        return
+    old_s, old_links = time_extractor(extract_links_bs4, pages, args.repeat)
+    print(f"  BeautifulSoup html.parser:  {old_s:.3f}s ({len(pages) / old_s:,.0f} pages/s)")
+    print(f"  speedup: {old_s / new_s:.1f}x")
+
+    mismatched = [url for (url, _), a, b in zip(pages, new_links, old_links) if a != b]
+    if mismatched:
+        print(f"[ERROR] {len(mismatched)} pages give different links, e.g. {mismatched[0]}", file=sys.stderr)
+        sys.exit(1)
+    print(f"[INFO] Identical links on all {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the education.gov.au Higher Education Statistics pages.
+
+Serves a synthetic copy of the hierarchy edu_he_stats_downloader.py crawls:
+
+  /higher-education-statistics/student-data                  landing page
+    -> /higher-education-statistics/topics/topic-{i}           navigation (no files)
+    -> /higher-education-statistics/student-data/{year}-student-data    year pages
+      -> /higher-education-statistics/resources/{year}-section-{n}-{category}
+        -> /download/{rid}/{slug}/{did}/document/{xlsx,pdf}     file downloads
+
+with configurable latency, bandwidth, injected errors and Content-Disposition
+headers, so downloader performance can be measured without touching the
+real site.  Downloads are deterministic bytes per document id and support
+ETag/Last-Modified (304) and Range (206) like the real server.
+
+GET /_stats returns request counters as JSON.
+
+Usage:
+    python bench/fixture_server.py [--port 8765] [--years 20] [--latency 0.05]
+                                   [--bandwidth-kbps 2048] [--error-rate 0.02]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+SECTIONS = [
+    (1, "commencing-students"),
+    (2, "all-students"),
+    (14, "award-course-completions"),
+    (15, "attrition-success-and-retention"),
+    (16, "equity-performance-data"),
+    (17, "completion-rates"),
+    (11, "student-load"),           # not ingested
+]
+
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+@dataclass
+class FixtureConfig:
+    first_year: int = 2024
+    years: int = 20
+    sections_per_year: int = len(SECTIONS)
+    files_per_resource: int = 2
+    pdfs_per_resource: int = 1      # explanatory notes, never ingested
+    file_kb: int = 256
+    latency_s: float = 0.0
+    bandwidth_kbps: float = 0.0     # per response; 0 = unthrottled
+    error_rate: float = 0.0         # fraction of requests answered 503
+    cd_rate: float = 1.0            # fraction of files sent with Content-Disposition
+    nav_links: int = 40             # navigation pages linked from every page (site chrome)
+    seed: int = 0
+
+
+class FixtureSite:
+    """The synthetic pages and files for one FixtureConfig, plus request counters."""
+
+    def __init__(self, config: FixtureConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self._paths: Dict[str, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {
+                "requests": 0, "pages": 0, "downloads": 0, "not_modified": 0,
+                "partial": 0, "heads": 0, "errors_injected": 0, "retries": 0, "bytes_sent": 0,
+                "download_bytes": 0,
+            }
+            self._paths = {}
+
+    def count(self, **deltas: int) -> None:
+        with self._lock:
+            for key, n in deltas.items():
+                self.stats[key] += n
+
+    def begin_request(self, key: str) -> bool:
+        """Record a request ("METHOD path"); returns True if an error should be injected."""
+        with self._lock:
+            self.stats["requests"] += 1
+            seen = self._paths.get(key, 0)
+            self._paths[key] = seen + 1
+            if seen:
+                self.stats["retries"] += 1
+            if self.config.error_rate > 0 and self._rng.random() < self.config.error_rate:
+                self.stats["errors_injected"] += 1
+                return True
+        return False
+
+    # -- content --------------------------------------------------------
+
+    def years(self) -> List[int]:
+        return [self.config.first_year - i for i in range(self.config.years)]
+
+    def resources(self, year: int) -> List[str]:
+        return [f"{year}-section-{n}-{category}"
+                for n, category in SECTIONS[:self.config.sections_per_year]]
+
+    def documents(self, slug: str) -> List[Tuple[int, int]]:
+        """(resource id, document id) pairs for a resource slug."""
+        rid = int(hashlib.sha1(slug.encode("utf-8")).hexdigest()[:6], 16)
+        n = self.config.files_per_resource + self.config.pdfs_per_resource
+        return [(rid, rid * 10 + k) for k in range(n)]
+
+    def page(self, path: str) -> Optional[str]:
+        links: List[str] = []
+        if path in ("/higher-education-statistics", "/higher-education-statistics/student-data"):
+            links = [f"/higher-education-statistics/student-data/{y}-student-data" for y in self.years()]
+        else:
+            m = re.fullmatch(r"/higher-education-statistics/student-data/(\d{4})-student-data", path)
+            if m:
+                links = [f"/higher-education-statistics/resources/{slug}"
+                         for slug in self.resources(int(m.group(1)))]
+            else:
+                if re.fullmatch(r"/higher-education-statistics/topics/topic-\d+", path):
+                    return render_page(path, [], self.config.nav_links)
+                m = re.fullmatch(r"/higher-education-statistics/resources/([\w-]+)", path)
+                if not m:
+                    return None
+                slug = m.group(1)
+                docs = self.documents(slug)
+                links = [f"/download/{rid}/{slug}/{did}/document/xlsx"
+                         for rid, did in docs[:self.config.files_per_resource]]
+                links += [f"/download/{rid}/{slug}/{did}/document/pdf"
+                          for rid, did in docs[self.config.files_per_resource:]]
+        return render_page(path, links, self.config.nav_links)
+
+    def file_body(self, did: int) -> bytes:
+        block = hashlib.sha256(str(did).encode("ascii")).digest()
+        size = self.config.file_kb * 1024
+        return (block * (size // len(block) + 1))[:size]
+
+    def file_name(self, slug: str, did: int, fmt: str) -> Optional[str]:
+        """Content-Disposition filename, or None for files served without one."""
+        if int(hashlib.sha1(str(did).encode("ascii")).hexdigest()[:8], 16) / 0xFFFFFFFF >= self.config.cd_rate:
+            return None
+        year, _, rest = slug.partition("-")
+        return f"{year}_{rest.replace('-', '_')}_{did}.{fmt}"
+
+
+def render_page(path: str, links: List[str], nav_links: int) -> str:
+    """
+    A page shaped like the real ones: site chrome around the content links.
+    The navigation menu links to in-scope topic pages (which carry no files),
+    as the real site's menus do.
+    """
+    nav = "".join(
+        f'<li class="menu-item"><a href="/higher-education-statistics/topics/topic-{i}" '
+        f'title="Topic {i}">Topic {i}</a></li>'
+        for i in range(nav_links)
+    )
+    body = "".join(
+        f'<div class="views-row"><span class="field"><a href="{href}#content">{href.rsplit("/", 1)[-1]}</a>'
+        f'</span><p>Data tables for {href.rsplit("/", 1)[-1]}.</p></div>'
+        for href in links
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{path}</title><link rel=\"stylesheet\" href=\"/themes/site.css\"></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main id=\"content\"><h1>{path}</h1>{body}</main>"
+        "<footer><a href=\"https://www.example.org/\">External</a> <a href=\"mailto:stats@example.org\">Contact</a>"
+        "</footer></body></html>"
+    )
+
+
+def make_handler(site: FixtureSite):
+    config = site.config
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        head_only = False
+
+        def do_HEAD(self) -> None:
+            # The handler serves every request on a keep-alive connection
+            self.head_only = True
+            try:
+                self.do_GET()
+            finally:
+                self.head_only = False
+
+        def do_GET(self) -> None:
+            path = urlparse(self.path).path
+            if path == "/_stats":
+                self.send_body(200, json.dumps(site.stats).encode("utf-8"), "application/json")
+                return
+
+            if config.latency_s > 0:
+                time.sleep(config.latency_s)
+            if site.begin_request(f"{self.command} {path}"):
+                self.send_body(503, b"injected error", "text/plain")
+                return
+
+            m = re.fullmatch(r"/download/(\d+)/([\w-]+)/(\d+)/document/(\w+)", path)
+            if m:
+                self.send_file(m.group(2), int(m.group(3)), m.group(4))
+                return
+
+            html = site.page(path)
+            if html is None:
+                self.send_body(404, b"not found", "text/plain")
+                return
+            if not self.head_only:
+                site.count(pages=1)
+            self.send_body(200, html.encode("utf-8"), "text/html; charset=utf-8", validators=True)
+
+        def send_file(self, slug: str, did: int, fmt: str) -> None:
+            body = site.file_body(did)
+            headers = {"Accept-Ranges": "bytes"}
+            fname = site.file_name(slug, did, fmt)
+            if fname:
+                headers["Content-Disposition"] = f'attachment; filename="{fname}"'
+
+            status = 200
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            m = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if m and self.headers.get("If-Range", etag) in (etag, LAST_MODIFIED):
+                start = int(m.group(1))
+                if start >= len(body):
+                    self.send_body(416, b"", "text/plain")
+                    return
+                headers["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                body = body[start:]
+                status = 206
+                site.count(partial=1)
+            if self.head_only:
+                site.count(heads=1)
+            else:
+                site.count(downloads=1)
+            sent = self.send_body(status, body, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                                  extra=headers, validators=status == 200, etag=etag)
+            site.count(download_bytes=sent)
+
+        def send_body(self, status: int, body: bytes, content_type: str,
+                      extra: Optional[Dict[str, str]] = None, validators: bool = False,
+                      etag: Optional[str] = None) -> int:
+            headers = dict(extra or {})
+            if validators or etag:
+                etag = etag or '"' + hashlib.md5(body).hexdigest() + '"'
+                headers["ETag"] = etag
+                headers["Last-Modified"] = LAST_MODIFIED
+                if validators and (self.headers.get("If-None-Match") == etag
+                                   or self.headers.get("If-Modified-Since") == LAST_MODIFIED):
+                    status, body = 304, b""
+                    site.count(not_modified=1)
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.head_only:
+                return 0
+
+            if config.bandwidth_kbps <= 0:
+                self.wfile.write(body)
+            else:
+                chunk = 16 * 1024
+                for i in range(0, len(body), chunk):
+                    self.wfile.write(body[i:i + chunk])
+                    time.sleep(min(chunk, len(body) - i) / (config.bandwidth_kbps * 1024))
+            site.count(bytes_sent=len(body))
+            return len(body)
+
+    return Handler
+
+
+def make_server(config: FixtureConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """An unstarted server; port 0 picks a free one.  server.site holds the counters."""
+    site = FixtureSite(config)
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    server.site = site
+    return server
+
+
+def serve_in_thread(config: FixtureConfig) -> Tuple[ThreadingHTTPServer, str]:
+    """Start a server on a free port in a daemon thread. Returns (server, base_url)."""
+    server = make_server(config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def add_config_arguments(ap: argparse.ArgumentParser) -> None:
+    """Fixture options shared with bench_downloader.py."""
+    defaults = FixtureConfig()
+    ap.add_argument("--years", type=int, default=defaults.years, help="Year pages to serve")
+    ap.add_argument("--files-per-resource", type=int, default=defaults.files_per_resource)
+    ap.add_argument("--pdfs-per-resource", type=int, default=defaults.pdfs_per_resource)
+    ap.add_argument("--file-kb", type=int, default=defaults.file_kb, help="Size of each download")
+    ap.add_argument("--latency", type=float, default=defaults.latency_s,
+                    help="Seconds before every response")
+    ap.add_argument("--bandwidth-kbps", type=float, default=defaults.bandwidth_kbps,
+                    help="Per-response transfer rate in KB/s (0 = unthrottled)")
+    ap.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                    help="Fraction of requests answered with 503")
+    ap.add_argument("--cd-rate", type=float, default=defaults.cd_rate,
+                    help="Fraction of files sent with a Content-Disposition filename")
+    ap.add_argument("--nav-links", type=int, default=defaults.nav_links,
+                    help="Navigation links per page besides the content links")
+    ap.add_argument("--seed", type=int, default=defaults.seed, help="Seed for injected errors")
+
+
+def config_from_args(args: argparse.Namespace) -> FixtureConfig:
+    return FixtureConfig(
+        years=args.years,
+        files_per_resource=args.files_per_resource,
+        pdfs_per_resource=args.pdfs_per_resource,
+        file_kb=args.file_kb,
+        latency_s=args.latency,
+        bandwidth_kbps=args.bandwidth_kbps,
+        error_rate=args.error_rate,
+        cd_rate=args.cd_rate,
+        nav_links=args.nav_links,
+        seed=args.seed,
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve a synthetic Higher Education Statistics site")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_config_arguments(ap)
+    args = ap.parse_args()
+
+    config = config_from_args(args)
+    server = make_server(config, args.host, args.port)
+    print(f"[INFO] Serving fixture site on http://{args.host}:{args.port} ({json.dumps(asdict(config))})")
+    print(f"[INFO] Crawl it with: python edu_he_stats_downloader.py --base-url http://{args.host}:{args.port} --delay 0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
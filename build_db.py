@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Rebuild he_stats.db without taking the API down.
+
+Every ingest stage writes into a staging copy next to the live database.
+The copy is validated and optimised into a single self-contained file
+(finalize_db.py), then moved over the live path with os.replace(), which
+is atomic on the same filesystem.  API requests already running keep reading the old file
+through their open handle; connections opened after the swap read the new
+one (see backend/db.py).  If a stage or a check fails, the live database is
+left untouched and the staging file is kept for inspection.
+
+Usage:
+    python build_db.py [--db he_stats.db] [--data-dir _downloads/files]
+                       [--jobs 4] [--skip uac] [--fresh]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Set
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "backend"))
+
+from finalize_db import DEFAULT_PAGE_SIZE, finalize  # noqa: E402
+
+# (stage, module) in build order.  Every stage after "ingest" resolves
+# institutions created by it; "uac" fetches from the UAC API.
+STAGES = [
+    ("ingest", "ingest"),
+    ("pivots", "ingest_completions_pivots"),
+    ("course-levels", "ingest_course_levels"),
+    ("staff-ratios", "ingest_staff_ratios"),
+    ("uac", "ingest_uac"),
+]
+
+# Module globals naming each stage's input files.  build_db rebases them
+# onto --data-dir (a directory, or a file kept under its own name), since
+# the scripts resolve them at import time against their own defaults.
+STAGE_INPUTS = {
+    "pivots": ["DATA_DIR"],
+    "course-levels": ["DATA_DIR", "ENROL_FILE", "COMP_FILE"],
+    "staff-ratios": ["FILE"],
+}
+
+# Module globals listing (file name, year) pairs read from DATA_DIR
+STAGE_FILE_LISTS = {
+    "pivots": ["COMPLETIONS_PIVOTS", "ENROLMENT_PIVOTS"],
+}
+
+# Tables that accumulate across runs and cannot be rebuilt from the
+# sources; --fresh copies them over from the live DB before the "uac" stage
+CARRIED_TABLES = ["uac_atar_history"]
+
+# Tables the API cannot serve without
+REQUIRED_TABLES = [
+    "institutions", "fields_of_education", "attrition_retention",
+    "completion_rates", "enrolments", "equity_performance",
+]
+
+
+def sidecars(path: Path) -> List[Path]:
+    return [Path(f"{path}{suffix}") for suffix in ("-wal", "-shm", "-journal")]
+
+
+def has_table(path: Path, table: str) -> bool:
+    if not path.exists():
+        return False
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def prepare_staging(live: Path, staging: Path, fresh: bool) -> None:
+    """Start staging from a consistent snapshot of the live DB (or empty)."""
+    for p in [staging] + sidecars(staging):
+        if p.exists():
+            p.unlink()
+    if fresh or not live.exists():
+        print(f"[INFO] Building {staging} from scratch")
+        return
+    print(f"[INFO] Snapshotting {live} -> {staging}")
+    src = sqlite3.connect(f"file:{live}?mode=ro", uri=True)
+    dst = sqlite3.connect(str(staging))
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def carry_over(live: Path, staging: Path) -> None:
+    """
+    Copy CARRIED_TABLES from the live DB into a staging DB built from scratch.
+
+    Institution ids differ between builds, so institution_id is re-pointed
+    by institution name.  Rows already in staging win.
+    """
+    conn = sqlite3.connect(f"file:{staging}", uri=True)
+    try:
+        conn.execute("ATTACH DATABASE ? AS live", (f"file:{live}?mode=ro",))
+        for table in CARRIED_TABLES:
+            schema = conn.execute(
+                "SELECT sql FROM live.sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL "
+                "ORDER BY type = 'index'", (table,)
+            ).fetchall()
+            if not schema:
+                continue
+            for (sql,) in schema:
+                conn.execute(sql.replace("CREATE TABLE ", "CREATE TABLE IF NOT EXISTS ", 1)
+                                .replace("CREATE INDEX ", "CREATE INDEX IF NOT EXISTS ", 1))
+            cols = [r[1] for r in conn.execute(f'PRAGMA live.table_info("{table}")')]
+            select = ", ".join(
+                "(SELECT i.id FROM institutions i JOIN live.institutions li ON li.name = i.name "
+                "WHERE li.id = t.institution_id)" if c == "institution_id" else f't."{c}"'
+                for c in cols
+            )
+            cur = conn.execute(
+                f'INSERT OR IGNORE INTO "{table}" ({", ".join(cols)}) '
+                f'SELECT {select} FROM live."{table}" t'
+            )
+            print(f"[INFO] Carried {cur.rowcount:,} {table} rows over from {live}")
+        conn.commit()
+        conn.execute("DETACH DATABASE live")
+    finally:
+        conn.close()
+
+
+def run_stage(stage: str, module_name: str, staging: Path, args: argparse.Namespace) -> None:
+    """Run one ingest script against the staging DB."""
+    module = importlib.import_module(module_name)
+    if stage == "ingest":
+        jobs_n = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        module.ingest_all(str(staging), args.data_dir, verbose=args.verbose, jobs_n=jobs_n,
+                          sheet_cache_dir=None if args.no_sheet_cache else args.sheet_cache)
+        return
+    # The other scripts read their target and inputs from module globals
+    module.DB_PATH = type(module.DB_PATH)(staging)
+    data_dir = Path(args.data_dir).resolve()
+    for name in STAGE_INPUTS.get(stage, []):
+        old = getattr(module, name)
+        new = data_dir if name == "DATA_DIR" else data_dir / Path(old).name
+        setattr(module, name, type(old)(new))
+    if stage == "uac":
+        module.main(["--numeric-only"] if stage in args.skip else [])
+    else:
+        module.main()
+
+
+def stage_input_files() -> Set[str]:
+    """Names of the data files the stages after "ingest" read."""
+    names: Set[str] = set()
+    for stage, module_name in STAGES:
+        if stage not in STAGE_INPUTS:
+            continue
+        module = importlib.import_module(module_name)
+        for name in STAGE_INPUTS[stage]:
+            if name != "DATA_DIR":
+                names.add(Path(getattr(module, name)).name)
+        for name in STAGE_FILE_LISTS.get(stage, []):
+            names.update(fname for fname, _year in getattr(module, name))
+    return names
+
+
+def table_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    tables = [
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    return {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in tables}
+
+
+def validate(staging: Path, live: Path, min_ratio: float) -> List[str]:
+    """Return a list of problems; empty means the staging DB may go live."""
+    problems = []
+    conn = sqlite3.connect(str(staging))
+    try:
+        check = [r[0] for r in conn.execute("PRAGMA integrity_check")]
+        if check != ["ok"]:
+            problems.append(f"integrity_check: {'; '.join(check[:5])}")
+        counts = table_counts(conn)
+    finally:
+        conn.close()
+
+    for table in REQUIRED_TABLES:
+        if counts.get(table, 0) == 0:
+            problems.append(f"{table} is missing or empty")
+
+    # A table that shrank a lot usually means a source file failed to parse
+    if live.exists():
+        live_conn = sqlite3.connect(f"file:{live}?mode=ro", uri=True)
+        try:
+            live_counts = table_counts(live_conn)
+        finally:
+            live_conn.close()
+        for table, before in sorted(live_counts.items()):
+            after = counts.get(table, 0)
+            if before > 0 and after < before * min_ratio:
+                problems.append(f"{table} shrank from {before:,} to {after:,} rows")
+    return problems
+
+
+def swap_in(staging: Path, live: Path) -> None:
+    """Atomically replace the live database with the staging one."""
+    os.replace(staging, live)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        fd = os.open(live.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    # WAL files left by the previous file's writers.  Readers still on the
+    # old file keep their open handles; the new file never reads these.
+    for p in sidecars(live)[:2]:
+        if p.exists():
+            p.unlink()
+
+
+def main():
+    sys.stdout.reconfigure(line_buffering=True)
+    sys.stderr.reconfigure(line_buffering=True)
+
+    stage_names = [s for s, _ in STAGES]
+    ap = argparse.ArgumentParser(
+        description="Build he_stats.db in a staging file and atomically swap it in"
+    )
+    ap.add_argument("--db", type=str, default=str(ROOT / "he_stats.db"), help="Live SQLite database path")
+    ap.add_argument("--data-dir", type=str, default="_downloads/files", help="Directory with downloaded files")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Worker processes for parsing files (0 = one per CPU)")
+    ap.add_argument("--sheet-cache", type=str, default="_sheet_cache",
+                    help="Directory caching parsed sheets by file hash")
+    ap.add_argument("--no-sheet-cache", action="store_true", help="Always parse the XLSX files")
+    ap.add_argument("--skip", action="append", default=[], choices=stage_names,
+                    help="Skip a stage (repeatable), e.g. --skip uac to avoid fetching")
+    ap.add_argument("--fresh", action="store_true",
+                    help="Start from an empty database instead of a copy of the live one "
+                         f"(keeping {', '.join(CARRIED_TABLES)})")
+    ap.add_argument("--min-ratio", type=float, default=0.9,
+                    help="Refuse to swap if any table falls below this fraction of its live row count")
+    ap.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                    help="Page size to VACUUM the staging database into")
+    ap.add_argument("--no-swap", action="store_true", help="Build and validate only")
+    ap.add_argument("--verbose", action="store_true", help="Show skip messages")
+    args = ap.parse_args()
+
+    reads_data = ["ingest"] + list(STAGE_INPUTS)
+    if any(s not in args.skip for s in reads_data) and not os.path.isdir(args.data_dir):
+        print(f"[ERROR] Data directory not found: {args.data_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    live = Path(args.db).resolve()
+    staging = live.with_name(live.name + ".staging")
+    t_start = time.perf_counter()
+
+    prepare_staging(live, staging, args.fresh)
+
+    for stage, module_name in STAGES:
+        if stage == "uac" and args.fresh and live.exists():
+            try:
+                carry_over(live, staging)
+            except sqlite3.Error as e:
+                print(f"[ERROR] Carrying {', '.join(CARRIED_TABLES)} over failed: {e!r}", file=sys.stderr)
+                print(f"[ERROR] {live} left unchanged; staging kept at {staging}", file=sys.stderr)
+                sys.exit(1)
+        label = stage
+        if stage in args.skip:
+            print(f"[SKIP] Stage {stage}")
+            if stage != "uac" or not has_table(staging, "uac_courses"):
+                continue
+            # UAC data from before the typed columns and uac_atar_history
+            # would fail the API's ATAR queries; add them without fetching
+            label = "uac --numeric-only"
+        print(f"\n{'='*60}\n[INFO] Stage {label}\n{'='*60}")
+        t0 = time.perf_counter()
+        try:
+            run_stage(stage, module_name, staging, args)
+        except (Exception, SystemExit) as e:
+            print(f"[ERROR] Stage {label} failed: {e!r}", file=sys.stderr)
+            print(f"[ERROR] {live} left unchanged; staging kept at {staging}", file=sys.stderr)
+            sys.exit(1)
+        print(f"[INFO] Stage {label} done in {time.perf_counter() - t0:.1f}s")
+
+    print(f"\n[INFO] Validating {staging}")
+    problems = validate(staging, live, args.min_ratio)
+    if problems:
+        for problem in problems:
+            print(f"[ERROR] {problem}", file=sys.stderr)
+        print(f"[ERROR] {live} left unchanged; staging kept at {staging}", file=sys.stderr)
+        sys.exit(1)
+
+    # Also folds the WAL in and leaves rollback-journal mode, so the single
+    # file is the whole database and can be renamed safely
+    finalize(str(staging), page_size=args.page_size)
+    if args.no_swap:
+        print(f"[INFO] Built and validated {staging} (not swapped in)")
+        return
+
+    swap_in(staging, live)
+    size_mb = live.stat().st_size / (1024 * 1024)
+    print(f"[INFO] {live} replaced ({size_mb:.1f} MB) in {time.perf_counter() - t_start:.1f}s total")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ to the resource slug embedded in the download URL path.
 
 Install
 -------
-pip install requests beautifulsoup4 urllib3
+pip install requests urllib3
 
 Usage
 -----
@@ -35,10 +35,28 @@ python edu_he_stats_downloader.py --out ./downloads --verbose --heartbeat 10 --l
 # Add download chunk progress logs
 python edu_he_stats_downloader.py --out ./downloads --heartbeat 10 --log-download-progress
 
+# Crawl with 6 concurrent workers, still at most one request per 0.3s to the host
+python edu_he_stats_downloader.py --out ./downloads --workers 6 --delay 0.3
+
+# Skip PDFs/CSVs/ZIPs, staff data and anything the build_db.py stages ignore or we already hold
+python edu_he_stats_downloader.py --out ./downloads --relevant-only
+
+# Pipeline mode: parse and ingest each file into he_stats.db while the rest download
+python edu_he_stats_downloader.py --out ./downloads --ingest he_stats.db --ingest-jobs 2
+
 Notes
 -----
 - This script intentionally limits scope to avoid mirroring the full education.gov.au site.
 - It will re-queue a failed HTML fetch once (transient network hiccups are common).
+- Pages are crawled best first, not breadth first: resource pages (which carry the
+  download links), then year listings, then other navigation, newest years first.
+  A --max-pages cut-off therefore drops navigation pages before any files.
+- --delay is enforced per host by a token bucket shared by all workers, so adding
+  workers overlaps network latency without raising the request rate above 1/delay.
+- Re-runs are conditional: ETag/Last-Modified/Content-Length are kept per URL (files in
+  manifest.tsv, HTML pages in pages/index.tsv with the page bodies), and sent back as
+  If-None-Match/If-Modified-Since.  A 304 reuses the local copy without a transfer.
+  --refresh ignores the stored validators.
 - The manifest includes year, section, category, format, and filename columns for
   downstream database ingestion.
 """
@@ -47,19 +65,22 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import heapq
+import json
 import os
 import re
 import sys
+import threading
 import time
-from collections import deque
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
 from email.message import Message
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse, urldefrag
 
 import requests
-from bs4 import BeautifulSoup
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -74,6 +95,15 @@ START_URLS = [
     "https://www.education.gov.au/higher-education-statistics",
 ]
 
+
+def set_base_url(base: str) -> None:
+    """Crawl another host with the same paths, e.g. bench/fixture_server.py."""
+    global BASE, START_URLS
+    base = base.rstrip("/")
+    START_URLS = [base + urlparse(u).path for u in START_URLS]
+    BASE = base
+
+
 # Keep crawler constrained and relevant (avoid mirroring whole education.gov.au)
 ALLOWED_PATH_PREFIXES = (
     "/higher-education-statistics/student-data",
@@ -98,6 +128,47 @@ UA = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML,
 # Data structures
 # ----------------------------
 
+@dataclass
+class CacheEntry:
+    """HTTP validators from the last successful fetch of a URL, and where its body went."""
+    etag: str = ""
+    last_modified: str = ""
+    content_length: str = ""
+    filename: str = ""
+
+    @classmethod
+    def from_response(cls, r: requests.Response, filename: str) -> "CacheEntry":
+        return cls(
+            etag=r.headers.get("ETag", ""),
+            last_modified=r.headers.get("Last-Modified", ""),
+            content_length=r.headers.get("Content-Length", ""),
+            filename=filename,
+        )
+
+    def range_validator(self) -> str:
+        """Value for If-Range: a strong ETag, else Last-Modified, else ''."""
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class PageFetch:
+    """Outcome of fetching one HTML page."""
+    html: Optional[str]
+    entry: Optional[CacheEntry] = None
+    not_modified: bool = False
+    nbytes: int = 0
+
+
 @dataclass(frozen=True)
 class FoundLink:
     url: str
@@ -240,6 +311,52 @@ def parse_content_disposition(header: str) -> Optional[str]:
 # Networking: robust session
 # ----------------------------
 
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                pause = (1 - self.tokens) / self.rate
+            time.sleep(pause)
+            waited += pause
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, so politeness holds however many workers run."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket.acquire()
+
+
 def make_session() -> requests.Session:
     session = requests.Session()
     session.headers.update(
@@ -267,61 +384,126 @@ def make_session() -> requests.Session:
     return session
 
 
+def page_cache_name(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html"
+
+
 def fetch_html(
     session: requests.Session,
     url: str,
     timeout: Tuple[float, float] = (15.0, 90.0),
     log_fetch: bool = False,
-) -> Optional[str]:
+    prior: Optional[CacheEntry] = None,
+    page_dir: Optional[Path] = None,
+) -> PageFetch:
     """
-    Fetch HTML for a page. Returns None for non-HTML content or on error.
+    Fetch HTML for a page. html is None for non-HTML content or on error.
     timeout=(connect_timeout, read_timeout)
+
+    With page_dir, HTML bodies are saved there and prior's validators are
+    sent; a 304 returns the saved body.
     """
     t0 = time.time()
     if log_fetch:
         print(f"[FETCH] start {url}")
 
+    cached_body = page_dir / prior.filename if (page_dir and prior and prior.filename) else None
+    headers = prior.conditional_headers() if cached_body is not None and cached_body.exists() else {}
+
     try:
-        r = session.get(url, timeout=timeout)
+        r = session.get(url, timeout=timeout, headers=headers)
 
         if log_fetch:
             dt = time.time() - t0
             print(f"[FETCH] done  {url} status={r.status_code} dt={dt:.1f}s")
 
+        if r.status_code == 304 and headers:
+            return PageFetch(cached_body.read_text(encoding="utf-8"), prior, not_modified=True)
+
         if r.status_code >= 400:
             print(f"[WARN] fetch got HTTP {r.status_code}: {url}", file=sys.stderr)
-            return None
+            return PageFetch(None)
 
         ctype = (r.headers.get("Content-Type") or "").lower()
         if "text/html" not in ctype and "application/xhtml" not in ctype:
-            return None
-        return r.text
+            return PageFetch(None)
+        html = r.text
+        entry = None
+        if page_dir is not None:
+            entry = CacheEntry.from_response(r, page_cache_name(url))
+            (page_dir / entry.filename).write_text(html, encoding="utf-8")
+        return PageFetch(html, entry, nbytes=len(r.content))
 
     except requests.exceptions.ReadTimeout:
         if log_fetch:
             dt = time.time() - t0
             print(f"[FETCH] timeout(read) {url} dt={dt:.1f}s")
         print(f"[WARN] fetch timed out (read): {url}", file=sys.stderr)
-        return None
+        return PageFetch(None)
     except requests.exceptions.ConnectTimeout:
         if log_fetch:
             dt = time.time() - t0
             print(f"[FETCH] timeout(connect) {url} dt={dt:.1f}s")
         print(f"[WARN] fetch timed out (connect): {url}", file=sys.stderr)
-        return None
+        return PageFetch(None)
     except requests.exceptions.RequestException as e:
         if log_fetch:
             dt = time.time() - t0
             print(f"[FETCH] error {url} dt={dt:.1f}s err={e}")
         print(f"[WARN] fetch failed: {url} :: {e}", file=sys.stderr)
-        return None
+        return PageFetch(None)
+
+
+_thread_local = threading.local()
+
+
+def thread_session() -> requests.Session:
+    """A Session per worker thread (requests.Session is not thread-safe)."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = make_session()
+    return session
+
+
+def fetch_page(
+    limiter: HostRateLimiter,
+    url: str,
+    log_fetch: bool = False,
+    prior: Optional[CacheEntry] = None,
+    page_dir: Optional[Path] = None,
+) -> Tuple[PageFetch, float, float]:
+    """Worker task: wait for the host's token, then fetch. Returns (page, fetch_s, wait_s)."""
+    waited = limiter.acquire(url)
+    t0 = time.perf_counter()
+    page = fetch_html(thread_session(), url, log_fetch=log_fetch, prior=prior, page_dir=page_dir)
+    return page, time.perf_counter() - t0, waited
+
+
+class LinkParser(HTMLParser):
+    """Collects <a href> values as the page streams past, without building a tree."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag != "a":
+            return
+        href = None
+        for name, value in attrs:
+            if name == "href":
+                href = value  # the last one wins, as in BeautifulSoup
+        if href:
+            self.hrefs.append(href)
 
 
 def extract_links(html: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    parser = LinkParser()
+    parser.feed(html)
+    parser.close()
     urls: List[str] = []
-    for a in soup.find_all("a", href=True):
-        href = (a.get("href") or "").strip()
+    for href in parser.hrefs:
+        href = href.strip()
         if not href:
             continue
         abs_url = normalise_url(urljoin(base_url, href))
@@ -333,6 +515,14 @@ def extract_links(html: str, base_url: str) -> List[str]:
 # Download + dedupe
 # ----------------------------
 
+def resolve_filename(r: requests.Response, url: str) -> str:
+    """Content-Disposition filename if the server sent one, else derived from the URL."""
+    cd_filename = parse_content_disposition(r.headers.get("Content-Disposition", ""))
+    if cd_filename:
+        return re.sub(r"[^A-Za-z0-9._() -]+", "_", cd_filename)[:200]
+    return safe_filename_from_url(url)
+
+
 def sha256_file(path: Path) -> str:
     h = hashlib.sha256()
     with path.open("rb") as f:
@@ -341,6 +531,98 @@ def sha256_file(path: Path) -> str:
     return h.hexdigest()
 
 
+# Subdirectory of the files directory that in-progress downloads stream into
+PARTIAL_DIRNAME = ".partial"
+
+# Range requests made to finish one interrupted download before giving up
+RESUME_ATTEMPTS = 4
+
+
+def partial_paths(partial_dir: Path, url: str) -> Tuple[Path, Path]:
+    """The part file for url and the sidecar holding its validators."""
+    stem = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return partial_dir / f"{stem}.part", partial_dir / f"{stem}.part.json"
+
+
+def load_partial_entry(part: Path, meta: Path) -> Optional[CacheEntry]:
+    """Validators of a non-empty part file that can be resumed, else None."""
+    if not part.exists() or part.stat().st_size == 0 or not meta.exists():
+        return None
+    try:
+        entry = CacheEntry(**json.loads(meta.read_text(encoding="utf-8")))
+    except (ValueError, TypeError):
+        return None
+    return entry if entry.range_validator() and entry.filename else None
+
+
+def save_partial_entry(meta: Path, entry: CacheEntry) -> None:
+    meta.write_text(json.dumps(asdict(entry)), encoding="utf-8")
+
+
+def discard_partial(part: Path, meta: Path) -> None:
+    part.unlink(missing_ok=True)
+    meta.unlink(missing_ok=True)
+
+
+def content_range_start(r: requests.Response) -> Optional[int]:
+    """First byte offset of a 206 response, from 'Content-Range: bytes N-M/T'."""
+    m = re.match(r"bytes\s+(\d+)-", r.headers.get("Content-Range", ""))
+    return int(m.group(1)) if m else None
+
+
+MANIFEST_COLUMNS = ["url", "referrer", "year", "section", "category", "format", "filename",
+                    "etag", "last_modified", "content_length"]
+
+
+def load_cache_index(path: Path, name_column: str) -> Dict[str, CacheEntry]:
+    """url -> CacheEntry from a TSV with a header row (manifest.tsv or pages/index.tsv)."""
+    entries: Dict[str, CacheEntry] = {}
+    if not path.exists():
+        return entries
+    with path.open(encoding="utf-8") as f:
+        header = f.readline().rstrip("\n").split("\t")
+        for line in f:
+            row = dict(zip(header, line.rstrip("\n").split("\t")))
+            if row.get("url"):
+                entries[row["url"]] = CacheEntry(
+                    etag=row.get("etag", ""),
+                    last_modified=row.get("last_modified", ""),
+                    content_length=row.get("content_length", ""),
+                    filename=row.get(name_column, ""),
+                )
+    return entries
+
+
+def write_page_index(path: Path, entries: Dict[str, CacheEntry]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        f.write("url\tetag\tlast_modified\tcontent_length\tfile\n")
+        for url, e in sorted(entries.items()):
+            f.write(f"{url}\t{e.etag}\t{e.last_modified}\t{e.content_length}\t{e.filename}\n")
+
+
+def write_manifest(path: Path, files: Dict[str, FoundLink], entries: Dict[str, CacheEntry]) -> None:
+    with path.open("w", encoding="utf-8") as mf:
+        mf.write("\t".join(MANIFEST_COLUMNS) + "\n")
+        for u, f in sorted(files.items()):
+            e = entries.get(u) or CacheEntry()
+            mf.write(f"{u}\t{f.referrer}\t{f.year}\t{f.section}\t{f.category}\t{f.format}\t{e.filename}"
+                     f"\t{e.etag}\t{e.last_modified}\t{e.content_length}\n")
+
+
+def load_hash_index(path: Path) -> Dict[str, str]:
+    """File name -> sha256 from an earlier run's hash_index.tsv."""
+    digests: Dict[str, str] = {}
+    if not path.exists():
+        return digests
+    with path.open(encoding="utf-8") as f:
+        next(f, None)
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) == 2:
+                digests[Path(parts[1]).name] = parts[0]
+    return digests
+
+
 def download_file(
     session: requests.Session,
     url: str,
@@ -349,146 +631,259 @@ def download_file(
     timeout: Tuple[float, float] = (30.0, 180.0),
     log_progress: bool = False,
     progress_every_mb: int = 8,
-) -> Optional[Tuple[Path, str]]:
+    prior: Optional[CacheEntry] = None,
+    known_digests: Optional[Dict[str, str]] = None,
+) -> Optional[Tuple[Path, str, CacheEntry, bool, str]]:
     """
-    Download a file to out_dir. Returns (saved_path, resolved_filename) or None.
+    Download a file to out_dir.
+    Returns (saved_path, resolved_filename, validators, not_modified, sha256) or None.
 
     Filename resolution order:
       1. Content-Disposition header from the server response
       2. Fallback: resource slug + doc_id from the URL path
 
-    Dedupes by sha256; if duplicate, removes the new copy and returns the original.
+    If prior names a file still in out_dir, its validators are sent and a
+    304 keeps that file as-is (its hash taken from known_digests if given).
+
+    The body is streamed into out_dir/.partial/ while it is hashed, then
+    renamed into place; if the sha256 is already known the copy is
+    discarded and the original returned.  A transfer that breaks off is
+    kept there with its validators and resumed with a Range request, both
+    within this call (RESUME_ATTEMPTS) and on the next run.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
+    partial_dir = out_dir / PARTIAL_DIRNAME
+    partial_dir.mkdir(exist_ok=True)
+    part, part_meta = partial_paths(partial_dir, url)
 
-    fallback_fname = safe_filename_from_url(url)
     mb = 1024 * 1024
     t0 = time.time()
 
-    try:
-        with session.get(url, stream=True, timeout=timeout) as r:
-            if r.status_code >= 400:
-                print(f"[WARN] download got HTTP {r.status_code}: {url}", file=sys.stderr)
+    existing = out_dir / prior.filename if (prior and prior.filename) else None
+    resume = load_partial_entry(part, part_meta)
+
+    for attempt in range(RESUME_ATTEMPTS):
+        # Byte offsets must refer to the file itself, not a gzip stream of it
+        headers = {"Accept-Encoding": "identity"}
+        offset = part.stat().st_size if resume is not None else 0
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = resume.range_validator()
+        elif existing is not None and existing.exists():
+            # A leftover part means a newer version is on its way; only
+            # ask for a 304 when there is none
+            headers.update(prior.conditional_headers())
+        conditional = "If-None-Match" in headers or "If-Modified-Since" in headers
+
+        try:
+            with session.get(url, stream=True, timeout=timeout, headers=headers) as r:
+                if r.status_code == 304 and conditional:
+                    digest = (known_digests or {}).get(existing.name) or sha256_file(existing)
+                    seen_hashes.setdefault(digest, existing)
+                    return (seen_hashes[digest], prior.filename, prior, True, digest)
+
+                if r.status_code == 416 and offset:
+                    # The part no longer fits the file; start over
+                    discard_partial(part, part_meta)
+                    resume = None
+                    continue
+
+                if r.status_code >= 400:
+                    print(f"[WARN] download got HTTP {r.status_code}: {url}", file=sys.stderr)
+                    return None
+
+                h = hashlib.sha256()
+                if offset and r.status_code == 206 and content_range_start(r) == offset:
+                    # Server honoured the Range: hash what we have and append
+                    entry = resume
+                    fname = entry.filename
+                    with part.open("rb") as f:
+                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                            h.update(chunk)
+                    mode = "ab"
+                    if log_progress:
+                        print(f"  [DL] {fname}: resuming at {offset/mb:.1f} MB")
+                else:
+                    # Full body (first try, Range ignored, or file changed)
+                    fname = resolve_filename(r, url)
+                    entry = CacheEntry.from_response(r, fname)
+                    offset = 0
+                    mode = "wb"
+                    if entry.range_validator():
+                        save_partial_entry(part_meta, entry)
+                    else:
+                        part_meta.unlink(missing_ok=True)
+
+                # Stream into .partial/ and hash as we go, so an interrupted
+                # download never appears under its final name and the file
+                # is not read back just to hash it
+                total_written = offset
+                next_report = (total_written // (progress_every_mb * mb) + 1) * progress_every_mb * mb
+                with part.open(mode) as f:
+                    for chunk in r.iter_content(chunk_size=1024 * 256):
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        h.update(chunk)
+                        total_written += len(chunk)
+
+                        if log_progress and total_written >= next_report:
+                            dt = time.time() - t0
+                            print(f"  [DL] {fname}: {total_written/mb:.1f} MB written in {dt:.1f}s")
+                            next_report += progress_every_mb * mb
+            break
+
+        except requests.exceptions.RequestException as e:
+            resume = load_partial_entry(part, part_meta)
+            if resume is None or attempt == RESUME_ATTEMPTS - 1:
+                if resume is None:
+                    discard_partial(part, part_meta)
+                print(f"[WARN] download failed: {url} :: {e}", file=sys.stderr)
                 return None
+            print(f"[WARN] download interrupted at {part.stat().st_size/mb:.1f} MB, resuming: {url} :: {e}",
+                  file=sys.stderr)
+    else:
+        print(f"[WARN] download failed: {url} :: could not resume", file=sys.stderr)
+        return None
 
-            # Resolve filename: prefer Content-Disposition, fall back to URL-derived
-            cd_header = r.headers.get("Content-Disposition", "")
-            cd_filename = parse_content_disposition(cd_header)
+    target = out_dir / fname
+    digest = h.hexdigest()
+    part_meta.unlink(missing_ok=True)
+    if digest in seen_hashes:
+        part.unlink(missing_ok=True)
+        return (seen_hashes[digest], fname, entry, False, digest)
 
-            if cd_filename:
-                fname = re.sub(r"[^A-Za-z0-9._() -]+", "_", cd_filename)[:200]
-            else:
-                fname = fallback_fname
+    os.replace(part, target)
+    if total_written < 1024:
+        print(f"[WARN] very small file (<1KB) saved: {target} from {url}", file=sys.stderr)
+    seen_hashes[digest] = target
+    return (target, fname, entry, False, digest)
 
-            target = out_dir / fname
-            next_report = progress_every_mb * mb
-            total_written = 0
 
-            with target.open("wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 256):
-                    if not chunk:
-                        continue
-                    f.write(chunk)
-                    total_written += len(chunk)
+# ----------------------------
+# Relevance prefilter (--relevant-only)
+# ----------------------------
+
+# Formats ingest.py reads; PDFs, CSVs and ZIPs are never ingested
+INGEST_FORMATS = ("xlsx", "xls", "ods", "xlsm")
 
-                    if log_progress and total_written >= next_report:
-                        dt = time.time() - t0
-                        print(f"  [DL] {fname}: {total_written/mb:.1f} MB written in {dt:.1f}s")
-                        next_report += progress_every_mb * mb
 
-        if target.exists() and target.stat().st_size < 1024:
-            print(f"[WARN] very small file (<1KB) saved: {target} from {url}", file=sys.stderr)
+def url_skip_reason(link: FoundLink) -> Optional[str]:
+    """Why a file link is not worth a request, judged from its URL alone."""
+    fmt = link.format or extract_format_from_url(link.url)
+    if fmt and fmt not in INGEST_FORMATS:
+        return f"format {fmt}"
+    return None
 
-        digest = sha256_file(target)
-        if digest in seen_hashes:
-            target.unlink(missing_ok=True)
-            return (seen_hashes[digest], fname)
-        seen_hashes[digest] = target
-        return (target, fname)
 
+def is_staff_link(link: FoundLink) -> bool:
+    return "staff" in link.category or "staff" in urlparse(link.url).path.lower()
+
+
+def head_entry(session: requests.Session, url: str,
+               timeout: Tuple[float, float] = (15.0, 60.0)) -> Optional[CacheEntry]:
+    """Validators and resolved filename from a HEAD request; None if HEAD fails."""
+    try:
+        r = session.head(url, timeout=timeout, allow_redirects=True)
     except requests.exceptions.RequestException as e:
-        print(f"[WARN] download failed: {url} :: {e}", file=sys.stderr)
+        print(f"[WARN] HEAD failed: {url} :: {e}", file=sys.stderr)
         return None
+    if r.status_code >= 400:
+        return None
+    return CacheEntry.from_response(r, resolve_filename(r, url))
+
+
+def same_version(a: CacheEntry, b: CacheEntry) -> bool:
+    """True if two sets of validators describe the same file body."""
+    if a.etag and b.etag:
+        return a.etag == b.etag
+    return bool(a.last_modified and a.content_length) and \
+        (a.last_modified, a.content_length) == (b.last_modified, b.content_length)
 
 
 # ----------------------------
-# Crawl orchestrator
+# Crawl frontier
 # ----------------------------
 
-def crawl_and_download(
-    out_dir: Path,
-    max_pages: int,
-    delay_s: float,
-    do_download: bool,
-    verbose: bool,
-    heartbeat: int,
-    log_fetch: bool,
-    log_download_progress: bool,
-) -> None:
-    print(f"[INFO] Starting crawl — max_pages={max_pages} delay={delay_s}s download={'yes' if do_download else 'no'}")
-    print(f"[INFO] Output directory: {out_dir}")
-    print(f"[INFO] Seed URLs: {START_URLS}")
-    sys.stdout.flush()
+RESOURCE_PATH_PREFIX = "/higher-education-statistics/resources/"
+LISTING_PATH_PREFIX = "/higher-education-statistics/student-data"
+PATH_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
 
-    session = make_session()
 
-    queue: deque[str] = deque(normalise_url(u) for u in START_URLS)
-    visited: Set[str] = set()
-    slow_seen: Set[str] = set()
+def url_priority(url: str, depth: int) -> Tuple[int, int, int]:
+    """
+    Sort key for a page (lower is fetched sooner): resource pages, which
+    carry the download links, then the student-data year listings, then
+    other navigation; within each, newer years and then shallower pages.
+    """
+    path = urlparse(url).path
+    if path.startswith(RESOURCE_PATH_PREFIX):
+        kind = 0
+    elif path.startswith(LISTING_PATH_PREFIX):
+        kind = 1
+    else:
+        kind = 2
+    years = PATH_YEAR_RE.findall(path)
+    return (kind, -max(int(y) for y in years) if years else 0, depth)
 
-    found_files: List[FoundLink] = []
-    pages_crawled = 0
 
-    while queue and pages_crawled < max_pages:
-        url = queue.popleft()
-        if url in visited:
-            continue
-        visited.add(url)
+class Frontier:
+    """Pages waiting to be crawled, popped in url_priority order (FIFO among equals)."""
 
-        if not in_scope(url):
-            continue
+    def __init__(self):
+        self._heap: List[Tuple[Tuple[int, int, int], int, str, int]] = []
+        self._seq = 0
 
-        html = fetch_html(session, url, log_fetch=log_fetch)
-        pages_crawled += 1
+    def push(self, url: str, depth: int) -> None:
+        heapq.heappush(self._heap, (url_priority(url, depth), self._seq, url, depth))
+        self._seq += 1
 
-        if verbose:
-            print(f"[CRAWL] {pages_crawled}/{max_pages} {url} (queue={len(queue)} files={len(found_files)})")
+    def pop(self) -> Tuple[str, int]:
+        _priority, _seq, url, depth = heapq.heappop(self._heap)
+        return url, depth
 
-        if heartbeat > 0 and pages_crawled % heartbeat == 0:
-            print(f"[PROGRESS] pages={pages_crawled} queue={len(queue)} visited={len(visited)} files_found={len(found_files)}")
+    def items(self) -> List[Tuple[str, int]]:
+        """(url, depth) pairs in the order they would be popped."""
+        return [(url, depth) for _p, _s, url, depth in sorted(self._heap)]
 
-        if html is None:
-            # one re-queue attempt for transient stalls
-            if url not in slow_seen:
-                slow_seen.add(url)
-                queue.append(url)
-                if verbose:
-                    print(f"[CRAWL] re-queued once due to fetch failure: {url}")
-            if delay_s > 0:
-                time.sleep(delay_s)
-            continue
+    def __len__(self) -> int:
+        return len(self._heap)
 
-        links = extract_links(html, url)
 
-        for link in links:
-            if not in_scope(link):
-                continue
+# ----------------------------
+# Checkpoints
+# ----------------------------
 
-            if looks_like_file(link):
-                found_files.append(FoundLink(url=link, referrer=url))
-            else:
-                if link not in visited:
-                    queue.append(link)
+CHECKPOINT_NAME = "crawl_state.json"
+
+
+def save_checkpoint(path: Path, state: Dict) -> None:
+    """Write state atomically, so an interrupt never leaves a torn checkpoint."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as e:
+        print(f"[WARN] ignoring unreadable checkpoint {path}: {e}", file=sys.stderr)
+        return None
+    if state.get("seeds") != START_URLS:
+        print(f"[WARN] ignoring checkpoint {path}: it was taken for other seed URLs", file=sys.stderr)
+        return None
+    return state
 
-        if delay_s > 0:
-            time.sleep(delay_s)
 
-    # Deduplicate file URLs
+def enrich_links(found_files: List[FoundLink]) -> Dict[str, FoundLink]:
+    """Dedupe file links by URL and add the metadata in their URL paths."""
     uniq_files: Dict[str, FoundLink] = {}
     for f in found_files:
         uniq_files.setdefault(f.url, f)
 
-    # Enrich with metadata extracted from URL paths
     enriched_files: Dict[str, FoundLink] = {}
     for u, f in uniq_files.items():
         m = DOWNLOAD_URL_RE.search(urlparse(u).path)
@@ -509,57 +904,340 @@ def crawl_and_download(
             category=category,
             format=fmt,
         )
+    return enriched_files
 
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Write manifest (filenames filled in after download phase)
+def write_hash_index(path: Path, seen_hashes: Dict[str, Path]) -> None:
+    with path.open("w", encoding="utf-8") as hf:
+        hf.write("sha256\tpath\n")
+        for digest, p in sorted(seen_hashes.items()):
+            hf.write(f"{digest}\t{p}\n")
+
+
+# ----------------------------
+# Crawl orchestrator
+# ----------------------------
+
+def crawl_and_download(
+    out_dir: Path,
+    max_pages: int,
+    delay_s: float,
+    do_download: bool,
+    verbose: bool,
+    heartbeat: int,
+    log_fetch: bool,
+    log_download_progress: bool,
+    workers: int = 1,
+    refresh: bool = False,
+    resume: bool = False,
+    checkpoint_every: int = 100,
+    on_file: Optional[Callable[[Path, str], object]] = None,
+    relevant_only: bool = False,
+) -> None:
+    """
+    Crawl from START_URLS, write the manifest and (optionally) download files.
+
+    Every checkpoint_every pages or downloads the frontier, discovered links
+    and finished downloads are saved to out_dir/crawl_state.json (and the
+    manifest and hash index are rewritten during downloads).  With resume, a run picks up from that checkpoint
+    instead of starting over; the checkpoint is removed once a run completes.
+
+    on_file(path, sha256) is called for each file written by this run (not
+    for 304s or duplicates), e.g. to start ingesting it straight away.
+
+    With relevant_only, files are only downloaded if ingest.py would load
+    them and they are not already held: the URL rules out other formats
+    and staff data, then a HEAD request gives the real filename (checked
+    with ingest.classify_for_ingest) and validators to compare with the
+    copies on disk.  Staff data is skipped too, except the files the other
+    build_db.py stages read (build_db.stage_input_files), which are kept
+    whatever ingest.py makes of them.  Skipped files stay in the manifest.
+    """
+    print(f"[INFO] Starting crawl — max_pages={max_pages} delay={delay_s}s workers={workers} "
+          f"download={'yes' if do_download else 'no'}")
+    print(f"[INFO] Output directory: {out_dir}")
+    print(f"[INFO] Seed URLs: {START_URLS}")
+    sys.stdout.flush()
+
+    session = make_session()
+    # At most one request per delay_s to each host, across all workers
+    limiter = HostRateLimiter(1.0 / delay_s if delay_s > 0 else 0.0)
+
+    # Validators from earlier runs, for conditional requests
+    page_dir = out_dir / "pages"
+    page_dir.mkdir(parents=True, exist_ok=True)
     manifest_path = out_dir / "manifest.tsv"
-    with manifest_path.open("w", encoding="utf-8") as mf:
-        mf.write("url\treferrer\tyear\tsection\tcategory\tformat\tfilename\n")
-        for u, f in sorted(enriched_files.items()):
-            mf.write(f"{u}\t{f.referrer}\t{f.year}\t{f.section}\t{f.category}\t{f.format}\t\n")
+    if refresh:
+        page_entries: Dict[str, CacheEntry] = {}
+        prior_files: Dict[str, CacheEntry] = {}
+    else:
+        page_entries = load_cache_index(page_dir / "index.tsv", "file")
+        prior_files = load_cache_index(manifest_path, "filename")
+    pages_not_modified = 0
+    page_bytes = 0
+
+    checkpoint_path = out_dir / CHECKPOINT_NAME
+    state = load_checkpoint(checkpoint_path) if resume else None
+
+    queue = Frontier()
+    visited: Set[str] = set()
+    slow_seen: Set[str] = set()
+
+    found_files: List[FoundLink] = []
+    pages_crawled = 0
+    if state is not None:
+        for url, depth in state["queue"]:
+            queue.push(url, depth)
+        visited = set(state["visited"])
+        slow_seen = set(state["slow_seen"])
+        found_files = [FoundLink(url=u, referrer=r) for u, r in state["found_files"]]
+        pages_crawled = state["pages_crawled"]
+        print(f"[INFO] Resuming {state['phase']} from {checkpoint_path}: pages={pages_crawled} "
+              f"queue={len(queue)} files_found={len(found_files)}")
+    else:
+        if resume:
+            print(f"[INFO] No checkpoint at {checkpoint_path}; starting a new crawl")
+        for u in START_URLS:
+            queue.push(normalise_url(u), 0)
+    pages_submitted = pages_crawled
+    fetch_s = 0.0
+    wait_s = 0.0
+    t_crawl = time.perf_counter()
+
+    # The frontier, visited set and results are only touched by this thread;
+    # workers just fetch.
+    in_flight: Dict[Future, Tuple[str, int]] = {}
+
+    def checkpoint_crawl() -> None:
+        # Pages still being fetched go back on the frontier
+        pending = list(in_flight.values())
+        save_checkpoint(checkpoint_path, {
+            "seeds": START_URLS,
+            "phase": "crawl",
+            "queue": pending + queue.items(),
+            "visited": sorted(visited.difference(url for url, _depth in pending)),
+            "slow_seen": sorted(slow_seen),
+            "found_files": [[f.url, f.referrer] for f in found_files],
+            "pages_crawled": pages_crawled,
+        })
+        # The manifest is left alone until the link list is complete, so
+        # an abandoned crawl does not drop rows (and validators) from it
+        write_page_index(page_dir / "index.tsv", page_entries)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while queue or in_flight:
+            while queue and len(in_flight) < max(1, workers) and pages_submitted < max_pages:
+                url, depth = queue.pop()
+                if url in visited:
+                    continue
+                visited.add(url)
+
+                if not in_scope(url):
+                    continue
+
+                in_flight[pool.submit(fetch_page, limiter, url, log_fetch,
+                                      page_entries.get(url), page_dir)] = (url, depth)
+                pages_submitted += 1
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                url, depth = in_flight.pop(fut)
+                page, dt, waited = fut.result()
+                html = page.html
+                pages_crawled += 1
+                fetch_s += dt
+                wait_s += waited
+                page_bytes += page.nbytes
+                if page.not_modified:
+                    pages_not_modified += 1
+                elif page.entry is not None:
+                    page_entries[url] = page.entry
+
+                if verbose:
+                    print(f"[CRAWL] {pages_crawled}/{max_pages} {url} (queue={len(queue)} files={len(found_files)})")
+
+                if heartbeat > 0 and pages_crawled % heartbeat == 0:
+                    print(f"[PROGRESS] pages={pages_crawled} queue={len(queue)} visited={len(visited)} files_found={len(found_files)}")
+
+                if html is None:
+                    # one re-queue attempt for transient stalls
+                    if url not in slow_seen:
+                        slow_seen.add(url)
+                        visited.discard(url)
+                        queue.push(url, depth)
+                        if verbose:
+                            print(f"[CRAWL] re-queued once due to fetch failure: {url}")
+                    continue
+
+                links = extract_links(html, url)
+
+                for link in links:
+                    if not in_scope(link):
+                        continue
+
+                    if looks_like_file(link):
+                        found_files.append(FoundLink(url=link, referrer=url))
+                    else:
+                        if link not in visited:
+                            queue.push(link, depth + 1)
+
+                # After the page's links are recorded, or they would be lost
+                if checkpoint_every > 0 and pages_crawled % checkpoint_every == 0:
+                    checkpoint_crawl()
+
+    elapsed = time.perf_counter() - t_crawl
+    rate = pages_crawled / elapsed if elapsed > 0 else 0.0
+    avg_fetch = fetch_s / pages_crawled if pages_crawled else 0.0
+    print(f"[INFO] Crawl: {pages_crawled} pages in {elapsed:.1f}s ({rate:.2f} pages/s) with {workers} workers; "
+          f"avg fetch {avg_fetch:.2f}s, rate-limit wait {wait_s:.1f}s total")
+    print(f"[INFO] Pages not modified (304): {pages_not_modified}/{pages_crawled}; "
+          f"HTML transferred: {page_bytes / 1024:.0f} KB")
+    write_page_index(page_dir / "index.tsv", page_entries)
+
+    enriched_files = enrich_links(found_files)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write manifest (filenames and validators from the last run until the
+    # download phase refreshes them)
+    write_manifest(manifest_path, enriched_files, prior_files)
 
     print(f"[INFO] Crawled pages: {pages_crawled}")
     print(f"[INFO] Unique file links found: {len(enriched_files)}")
     print(f"[INFO] Manifest written: {manifest_path}")
 
     if not do_download:
+        checkpoint_path.unlink(missing_ok=True)
         return
 
     files_dir = out_dir / "files"
+    hash_index = out_dir / "hash_index.tsv"
     seen_hashes: Dict[str, Path] = {}
-    download_results: Dict[str, str] = {}  # url -> resolved filename
+    # Failed downloads keep their previous entry
+    file_entries: Dict[str, CacheEntry] = dict(prior_files)
+    known_digests = load_hash_index(hash_index)
+    files_not_modified = 0
+    downloaded: Set[str] = set()
+    if state is not None and state["phase"] == "download":
+        seen_hashes = {digest: Path(p) for digest, p in state["seen_hashes"].items()}
+        file_entries.update({u: CacheEntry(**e) for u, e in state["file_entries"].items()})
+        files_not_modified = state["files_not_modified"]
+        downloaded = set(state["downloaded"])
+        print(f"[INFO] Skipping {len(downloaded)} files already downloaded before the checkpoint")
+
+    def checkpoint_downloads() -> None:
+        save_checkpoint(checkpoint_path, {
+            "seeds": START_URLS,
+            "phase": "download",
+            "queue": [],
+            "visited": [],
+            "slow_seen": [],
+            "found_files": [[f.url, f.referrer] for f in found_files],
+            "pages_crawled": pages_crawled,
+            "downloaded": sorted(downloaded),
+            "seen_hashes": {digest: str(p) for digest, p in seen_hashes.items()},
+            "file_entries": {u: asdict(file_entries[u]) for u in downloaded if u in file_entries},
+            "files_not_modified": files_not_modified,
+        })
+        write_manifest(manifest_path, enriched_files, file_entries)
+        write_hash_index(hash_index, seen_hashes)
+
+    checkpoint_downloads()
+
+    skipped: Dict[str, int] = {}
+    skipped_bytes = 0
+    if relevant_only:
+        # Imported here so plain downloads do not need pandas
+        from build_db import stage_input_files
+        from ingest import classify_for_ingest
+
+        stage_files = stage_input_files()
+
+        # Files already on disk, by the validators they were downloaded with
+        held_by_etag: Dict[str, Tuple[CacheEntry, Path]] = {}
+        held_by_stamp: Dict[Tuple[str, str], Tuple[CacheEntry, Path]] = {}
+        for e in prior_files.values():
+            p = files_dir / e.filename
+            if e.filename and p.exists():
+                if e.etag:
+                    held_by_etag[e.etag] = (e, p)
+                held_by_stamp[(e.last_modified, e.content_length)] = (e, p)
 
     for i, (u, f) in enumerate(sorted(enriched_files.items()), start=1):
+        if u in downloaded:
+            continue
+
+        if relevant_only:
+            reason = url_skip_reason(f)
+            head = None
+            if reason is None:
+                limiter.acquire(u)
+                head = head_entry(session, u)
+            if head is not None:
+                copy = held_by_etag.get(head.etag) or \
+                    held_by_stamp.get((head.last_modified, head.content_length))
+                if copy is not None and not same_version(head, copy[0]):
+                    copy = None
+                if head.filename not in stage_files:
+                    if is_staff_link(f):
+                        reason = "staff data"
+                    elif not classify_for_ingest(head.filename):
+                        reason = "not ingested"
+                if reason is None and copy is not None:
+                    reason = "already held"
+                    digest = known_digests.get(copy[1].name) or sha256_file(copy[1])
+                    seen_hashes.setdefault(digest, copy[1])
+                    file_entries[u] = CacheEntry(head.etag, head.last_modified,
+                                                 head.content_length, copy[0].filename)
+            if reason is not None:
+                skipped[reason] = skipped.get(reason, 0) + 1
+                if head is not None and head.content_length.isdigit():
+                    skipped_bytes += int(head.content_length)
+                if verbose:
+                    print(f"[{i}/{len(enriched_files)}] [SKIP] {reason}: {u}")
+                downloaded.add(u)
+                continue
+
         print(f"[{i}/{len(enriched_files)}] Downloading: {u}")
+        limiter.acquire(u)
         result = download_file(
             session,
             u,
             files_dir,
             seen_hashes,
             log_progress=log_download_progress,
+            prior=prior_files.get(u),
+            known_digests=known_digests,
         )
         if result is not None:
-            saved_path, resolved_fname = result
-            print(f"  -> {saved_path}")
-            download_results[u] = resolved_fname
-        if delay_s > 0:
-            time.sleep(delay_s)
-
-    # Rewrite manifest with resolved filenames
-    with manifest_path.open("w", encoding="utf-8") as mf:
-        mf.write("url\treferrer\tyear\tsection\tcategory\tformat\tfilename\n")
-        for u, f in sorted(enriched_files.items()):
-            fname = download_results.get(u, "")
-            mf.write(f"{u}\t{f.referrer}\t{f.year}\t{f.section}\t{f.category}\t{f.format}\t{fname}\n")
-
+            saved_path, resolved_fname, entry, not_modified, digest = result
+            if not_modified:
+                files_not_modified += 1
+                print(f"  -> not modified: {saved_path}")
+            else:
+                print(f"  -> {saved_path}")
+                if on_file is not None and saved_path.name == resolved_fname:
+                    on_file(saved_path, digest)
+            file_entries[u] = entry
+        downloaded.add(u)
+        if checkpoint_every > 0 and len(downloaded) % checkpoint_every == 0:
+            checkpoint_downloads()
+
+    # Rewrite manifest with resolved filenames and fresh validators
+    write_manifest(manifest_path, enriched_files, file_entries)
+
+    print(f"[INFO] Files not modified (304): {files_not_modified}/{len(enriched_files)}")
+    if relevant_only:
+        reasons = ", ".join(f"{n} {reason}" for reason, n in sorted(skipped.items())) or "none"
+        print(f"[INFO] Skipped without downloading: {reasons} "
+              f"({skipped_bytes / (1024 * 1024):.1f} MB by Content-Length)")
     print(f"[INFO] Manifest updated with filenames: {manifest_path}")
 
-    hash_index = out_dir / "hash_index.tsv"
-    with hash_index.open("w", encoding="utf-8") as hf:
-        hf.write("sha256\tpath\n")
-        for digest, path in sorted(seen_hashes.items()):
-            hf.write(f"{digest}\t{path}\n")
+    write_hash_index(hash_index, seen_hashes)
+    checkpoint_path.unlink(missing_ok=True)
 
     print(f"[INFO] Hash index written: {hash_index}")
 
@@ -577,8 +1255,28 @@ def main() -> None:
         description="Download Higher Education Statistics student data files from education.gov.au"
     )
     ap.add_argument("--out", type=Path, default=Path("./edu_he_stats_downloads"), help="Output directory")
+    ap.add_argument("--base-url", type=str, default=None,
+                    help=f"Crawl this host instead of {BASE} (e.g. a local bench/fixture_server.py)")
     ap.add_argument("--max-pages", type=int, default=2000, help="Maximum HTML pages to crawl")
-    ap.add_argument("--delay", type=float, default=0.6, help="Polite delay between requests (seconds)")
+    ap.add_argument("--delay", type=float, default=0.6,
+                    help="Polite minimum interval between requests to the same host (seconds)")
+    ap.add_argument("--workers", type=int, default=1, help="Concurrent page fetches during the crawl")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Ignore stored ETag/Last-Modified validators and fetch everything in full")
+    ap.add_argument("--resume", action="store_true",
+                    help=f"Continue an interrupted run from <out>/{CHECKPOINT_NAME}")
+    ap.add_argument("--checkpoint-every", type=int, default=100,
+                    help="Save crawl state every N pages and every N downloads (0 = never)")
+    ap.add_argument("--relevant-only", action="store_true",
+                    help="Only download files the build_db.py stages load and that are not already held "
+                         "(uses HEAD)")
+    ap.add_argument("--ingest", type=str, default=None, metavar="DB",
+                    help="Pipeline mode: parse and ingest each file into DB as soon as it is downloaded")
+    ap.add_argument("--ingest-jobs", type=int, default=1,
+                    help="Worker processes parsing files in pipeline mode (0 = one per CPU)")
+    ap.add_argument("--sheet-cache", type=str, default="_sheet_cache",
+                    help="Sheet cache directory for pipeline mode (see ingest.py)")
+    ap.add_argument("--no-sheet-cache", action="store_true", help="Pipeline mode without the sheet cache")
     ap.add_argument("--no-download", action="store_true", help="Only create manifest; do not download files")
 
     # New options
@@ -593,6 +1291,32 @@ def main() -> None:
 
     args = ap.parse_args()
 
+    if args.base_url:
+        set_base_url(args.base_url)
+
+    if args.ingest and args.no_download:
+        ap.error("--ingest needs the downloads; drop --no-download")
+
+    pipeline = None
+    if args.ingest:
+        # Imported here so plain downloads do not need pandas
+        import ingest
+
+        jobs_n = args.ingest_jobs if args.ingest_jobs > 0 else (os.cpu_count() or 1)
+        sheet_cache = None if args.no_sheet_cache else args.sheet_cache
+        pipeline = ingest.ExtractPipeline(args.ingest, jobs_n=jobs_n, sheet_cache_dir=sheet_cache)
+        print(f"[INFO] Pipeline mode: parsing downloads in {jobs_n} worker processes for {args.ingest}")
+
+    try:
+        run_pipeline(args, pipeline)
+    finally:
+        if pipeline is not None:
+            pipeline.shutdown()
+
+
+def run_pipeline(args: argparse.Namespace, pipeline) -> None:
+    """Crawl and download; with a pipeline, files are ingested as they arrive."""
+    t0 = time.perf_counter()
     crawl_and_download(
         out_dir=args.out,
         max_pages=args.max_pages,
@@ -602,7 +1326,28 @@ def main() -> None:
         heartbeat=args.heartbeat,
         log_fetch=args.log_fetch,
         log_download_progress=args.log_download_progress,
+        workers=args.workers,
+        refresh=args.refresh,
+        resume=args.resume,
+        checkpoint_every=args.checkpoint_every,
+        on_file=pipeline.submit if pipeline is not None else None,
+        relevant_only=args.relevant_only,
     )
+    if pipeline is None:
+        return
+
+    import ingest
+
+    t_download = time.perf_counter() - t0
+    pipeline.finish()
+    print(f"\n[INFO] Downloads done in {t_download:.1f}s; {pipeline.written} of {pipeline.submitted} "
+          f"new files written as they arrived, {pipeline.deferred} left for the ordered pass")
+    # Everything else the data directory holds, in the canonical order
+    ingest.ingest_all(args.ingest, str(args.out / "files"), verbose=args.verbose,
+                      sheet_cache_dir=None if args.no_sheet_cache else args.sheet_cache,
+                      pipeline=pipeline)
+    print(f"[INFO] Download + ingest: {time.perf_counter() - t0:.1f}s "
+          f"({time.perf_counter() - t0 - t_download:.1f}s after the last download)")
 
 
 if __name__ == "__main__":
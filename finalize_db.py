@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Optimise a freshly loaded he_stats.db for read-only serving.
+
+The ingest scripts create their indexes up front and then bulk insert, so
+indexes end up fragmented, the planner has no statistics, and the file is
+left in WAL mode with pages scattered by years of incremental loads.  This:
+
+  1. folds any WAL into the main file and switches to rollback-journal mode
+     (read-only connections then need no -wal/-shm files)
+  2. drops and recreates every explicit index so each is built in one pass
+  3. VACUUMs with the chosen page size
+  4. runs ANALYZE and PRAGMA optimize
+
+and prints the file size and a few hot API queries' timings before and after.
+build_db.py runs it on the staging database before swapping it in.
+
+Usage:
+    python finalize_db.py [--db he_stats.db] [--page-size 8192]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "backend"))
+
+import engine  # noqa: E402
+
+DEFAULT_PAGE_SIZE = 8192
+
+# Runs per hot query; the best time is reported
+QUERY_RUNS = 3
+
+
+def db_size(path: Path) -> int:
+    """Bytes on disk, including any WAL."""
+    total = 0
+    for p in (path, Path(f"{path}-wal")):
+        if p.exists():
+            total += p.stat().st_size
+    return total
+
+
+def hot_queries(conn: sqlite3.Connection) -> List[Tuple[str, Callable[[sqlite3.Connection], object]]]:
+    """The engine calls behind the busiest endpoints, for one institution and field."""
+    inst = conn.execute(
+        "SELECT institution_id FROM attrition_retention "
+        "GROUP BY institution_id ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    field = conn.execute("SELECT id FROM fields_of_education ORDER BY id LIMIT 1").fetchone()
+    queries = []
+    if inst is not None:
+        iid = inst[0]
+        queries.append(("report", lambda c: engine.compute_report(c, iid)))
+        queries.append(("equity", lambda c: engine.compute_equity_report(c, iid)))
+        queries.append(("courses", lambda c: engine.compute_courses_report(c, iid)))
+    if field is not None:
+        fid = field[0]
+        queries.append(("heatmap", lambda c: engine.compute_field_heatmap(c, fid)))
+    return queries
+
+
+def time_queries(path: Path) -> Dict[str, Optional[float]]:
+    """Best-of-QUERY_RUNS milliseconds per hot query (None if it errors)."""
+    timings: Dict[str, Optional[float]] = {}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        for name, run in hot_queries(conn):
+            best = None
+            for _ in range(QUERY_RUNS):
+                # Time the queries, not the engine's precompute cache
+                with engine._PRECOMPUTED_LOCK:
+                    engine._PRECOMPUTED.clear()
+                t0 = time.perf_counter()
+                try:
+                    run(conn)
+                except sqlite3.Error:
+                    best = None  # e.g. UAC tables not loaded
+                    break
+                ms = (time.perf_counter() - t0) * 1000
+                best = ms if best is None else min(best, ms)
+            timings[name] = best
+    finally:
+        conn.close()
+    return timings
+
+
+def finalize(db_path: str, page_size: int = DEFAULT_PAGE_SIZE) -> None:
+    """Optimise db_path in place. No other connection may be writing to it."""
+    path = Path(db_path)
+    size_before = db_size(path)
+    before = time_queries(path)
+
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    steps: List[Tuple[str, float]] = []
+
+    def step(label: str, *sql: str) -> None:
+        t0 = time.perf_counter()
+        for stmt in sql:
+            conn.execute(stmt)
+        steps.append((label, time.perf_counter() - t0))
+
+    try:
+        step("checkpoint WAL", "PRAGMA wal_checkpoint(TRUNCATE)", "PRAGMA journal_mode=DELETE")
+
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        ).fetchall()
+        step(
+            f"rebuild {len(indexes)} indexes",
+            "BEGIN",
+            *[f'DROP INDEX "{name}"' for name, _ in indexes],
+            *[sql for _, sql in indexes],
+            "COMMIT",
+        )
+
+        step(f"VACUUM (page_size {page_size})", f"PRAGMA page_size={page_size}", "VACUUM")
+        step("ANALYZE", "ANALYZE")
+        step("optimize", "PRAGMA optimize")
+    finally:
+        conn.close()
+
+    size_after = db_size(path)
+    after = time_queries(path)
+
+    print(f"[INFO] Finalized {path}")
+    for label, secs in steps:
+        print(f"  {label}: {secs:.2f}s")
+    print(f"  size: {size_before / 1048576:.1f} MB -> {size_after / 1048576:.1f} MB")
+    for name, ms in after.items():
+        print(f"  {name}: {_ms(before.get(name))} -> {_ms(ms)}")
+
+
+def _ms(ms: Optional[float]) -> str:
+    return "n/a" if ms is None else f"{ms:.1f} ms"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Optimise he_stats.db for read-only serving")
+    ap.add_argument("--db", type=str, default=str(ROOT / "he_stats.db"), help="SQLite database path")
+    ap.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                    help="Page size to VACUUM into (power of two, 512-65536)")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] Database not found: {args.db}", file=sys.stderr)
+        sys.exit(1)
+    finalize(args.db, page_size=args.page_size)
+
+
+if __name__ == "__main__":
+    main()
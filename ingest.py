@@ -7,20 +7,36 @@ tables within them, normalises institution names, and loads the data into
 a SQLite database designed for the Course Survival Probability engine.
 
 Usage:
-    python ingest.py --db he_stats.db --data-dir _downloads/files/
+    python ingest.py --db he_stats.db --data-dir _downloads/files/ [--jobs 4]
+                     [--profile ingest_profile.json] [--no-sheet-cache]
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import os
+import pickle
+import queue
 import re
 import sqlite3
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 # ---------------------------------------------------------------------------
 # Schema DDL (mirrors schema.sql)
 # ---------------------------------------------------------------------------
@@ -92,7 +108,9 @@ CREATE TABLE IF NOT EXISTS ingested_files (
     ingested_at TEXT DEFAULT (datetime('now')),
     row_count   INTEGER,
     section     TEXT,
-    data_year   TEXT
+    data_year   TEXT,
+    sha256      TEXT,
+    size        INTEGER
 );
 CREATE INDEX IF NOT EXISTS idx_ar_inst_year
     ON attrition_retention(institution_id, year);
@@ -194,12 +212,37 @@ KNOWN_ALIASES: Dict[str, str] = {
 }
 
 
+# Aggregate rows to skip, matched case-insensitively anywhere in the name
+SKIP_NAME_PATTERNS = [
+    "National Total", "Table A Provider", "Table B Provider",
+    "Table C Provider", "Non-University Higher Education",
+    "Total:", "Total ", "Grand Total",
+]
+SKIP_NAME_RE = re.compile("|".join(re.escape(p) for p in SKIP_NAME_PATTERNS), re.IGNORECASE)
+
+INSERT_ALIAS = "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)"
+
+
 class InstitutionRegistry:
-    """Manages institution lookup, creation, and alias resolution."""
+    """
+    Manages institution lookup, creation, and alias resolution.
+
+    The same raw strings recur on every row of every file, so resolve()
+    memoises raw name -> id (None for skipped or empty names) in front of
+    normalisation; a name's resolution never changes once made.  New
+    aliases are buffered and written by flush_aliases(), once per file.
+    """
 
     def __init__(self, conn: sqlite3.Connection):
         self.conn = conn
         self._cache: Dict[str, int] = {}  # normalised name -> id
+        self._memo: Dict[str, Optional[int]] = {}  # raw name -> id or None
+        self._pending_aliases: List[Tuple[str, int]] = []
+        # Cumulative counts, reported per file by write_parsed
+        self.stats: Dict[str, int] = {
+            "resolve_calls": 0, "resolve_memo_hits": 0,
+            "institutions_created": 0, "alias_inserts": 0,
+        }
         self._load_existing()
 
     def _load_existing(self):
@@ -214,20 +257,46 @@ class InstitutionRegistry:
         """Resolve a raw institution name to an ID, creating if needed."""
         if not raw_name or not isinstance(raw_name, str):
             return None
+        self.stats["resolve_calls"] += 1
+        try:
+            inst_id = self._memo[raw_name]
+        except KeyError:
+            inst_id = self._memo[raw_name] = self._resolve_new(raw_name, state, provider_type)
+        else:
+            self.stats["resolve_memo_hits"] += 1
+        return inst_id
+
+    def _add_alias(self, alias: str, inst_id: int) -> None:
+        self._pending_aliases.append((alias, inst_id))
+
+    def flush_aliases(self) -> None:
+        """Write buffered aliases in the current transaction."""
+        if self._pending_aliases:
+            self.conn.executemany(INSERT_ALIAS, self._pending_aliases)
+            self.stats["alias_inserts"] += len(self._pending_aliases)
+            self._pending_aliases = []
+
+    def discard_pending(self) -> None:
+        """
+        Forget everything since the last commit after a rollback.
+
+        The rolled-back transaction may have created institutions that the
+        memo and cache still point at, so both are rebuilt from what the
+        database now holds.
+        """
+        self._pending_aliases = []
+        self._memo.clear()
+        self._cache.clear()
+        self._load_existing()
 
+    def _resolve_new(self, raw_name: str, state: str, provider_type: str) -> Optional[int]:
         norm = normalise_inst_name(raw_name)
         if not norm:
             return None
 
         # Skip aggregate rows
-        skip_patterns = [
-            "National Total", "Table A Provider", "Table B Provider",
-            "Table C Provider", "Non-University Higher Education",
-            "Total:", "Total ", "Grand Total",
-        ]
-        for pat in skip_patterns:
-            if pat.lower() in norm.lower():
-                return None
+        if SKIP_NAME_RE.search(norm):
+            return None
 
         # Check cache
         if norm in self._cache:
@@ -239,10 +308,7 @@ class InstitutionRegistry:
             # Register this variant as an alias
             inst_id = self._cache[canonical]
             self._cache[norm] = inst_id
-            self.conn.execute(
-                "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)",
-                (norm, inst_id),
-            )
+            self._add_alias(norm, inst_id)
             return inst_id
 
         # Also check if canonical form is already cached
@@ -250,10 +316,7 @@ class InstitutionRegistry:
         if canonical_norm in self._cache:
             inst_id = self._cache[canonical_norm]
             self._cache[norm] = inst_id
-            self.conn.execute(
-                "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)",
-                (norm, inst_id),
-            )
+            self._add_alias(norm, inst_id)
             return inst_id
 
         # Create new institution
@@ -266,10 +329,7 @@ class InstitutionRegistry:
             if row:
                 inst_id = row[0]
                 self._cache[norm] = inst_id
-                self.conn.execute(
-                    "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)",
-                    (norm, inst_id),
-                )
+                self._add_alias(norm, inst_id)
                 return inst_id
 
         cur = self.conn.execute(
@@ -277,17 +337,12 @@ class InstitutionRegistry:
             (code, canonical_norm, state or None, provider_type or None),
         )
         inst_id = cur.lastrowid
+        self.stats["institutions_created"] += 1
         self._cache[norm] = inst_id
         self._cache[canonical_norm] = inst_id
         # Also register original normalised form as alias
-        self.conn.execute(
-            "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)",
-            (norm, inst_id),
-        )
-        self.conn.execute(
-            "INSERT OR IGNORE INTO institution_aliases (alias, institution_id) VALUES (?, ?)",
-            (canonical_norm, inst_id),
-        )
+        self._add_alias(norm, inst_id)
+        self._add_alias(canonical_norm, inst_id)
         return inst_id
 
 
@@ -358,8 +413,298 @@ def safe_int(val: Any) -> Optional[int]:
     return int(round(f))
 
 
-def read_excel_safe(filepath: str, sheet_name: Any = 0, **kwargs) -> Optional[pd.DataFrame]:
-    """Read an Excel sheet with error handling for format issues."""
+class PhaseTimer:
+    """
+    Wall-clock seconds spent in each phase of ingesting one file.
+
+    Parsers call lap(phase) at the end of each step, charging the time since
+    the previous lap to that phase; the writer times blocks with phase().
+    Only plain data is held, so a timer pickles back from a worker process.
+    """
+
+    # Report column order; "other" is whatever no lap accounted for
+    PHASES = ("open", "sheet_read", "header_scan", "row_loop",
+              "delete", "resolve", "insert", "commit", "other")
+
+    # Event counts reported alongside the phases
+    COUNTERS = ("sheet_cache_hits", "sheet_cache_misses",
+                "resolve_calls", "resolve_memo_hits", "institutions_created", "alias_inserts")
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._last = time.perf_counter()
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def add(self, phase: str, secs: float) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + secs
+
+    def lap(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.add(phase, now - self._last)
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# Bump when ExcelWorkbook's reading of sheets changes, so cached sheets
+# parsed the old way are not reused.
+PARSER_VERSION = 1
+
+
+class SheetCache:
+    """
+    Parsed sheets on disk, keyed by (file sha256, sheet name, PARSER_VERSION).
+
+    A sheet's DataFrame or raw row tuples are pickled after the first parse,
+    so rebuilding the database from unchanged files skips unzipping and
+    parsing XLSX altogether.  Entries are written atomically, so worker
+    processes can share a cache directory.  A corrupt or unreadable entry
+    counts as a miss.
+    """
+
+    def __init__(self, cache_dir: str, digests: Optional[Dict[str, str]] = None):
+        self.root = Path(cache_dir) / f"v{PARSER_VERSION}"
+        # filepath -> sha256, e.g. from hash_index.tsv; others are hashed on demand
+        self.digests: Dict[str, str] = dict(digests or {})
+
+    def _path(self, filepath: str, sheet_name: Any, kind: str) -> Path:
+        digest = self.digests.get(filepath)
+        if digest is None:
+            digest = self.digests[filepath] = sha256_file(filepath)
+        sheet_key = hashlib.sha1(repr(sheet_name).encode("utf-8")).hexdigest()[:16]
+        return self.root / digest[:2] / digest / f"{kind}-{sheet_key}.pkl"
+
+    def load(self, filepath: str, sheet_name: Any, kind: str) -> Any:
+        try:
+            with open(self._path(filepath, sheet_name, kind), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"  [WARN] Ignoring unreadable sheet cache entry for {filepath}: {e}", file=sys.stderr)
+            return None
+
+    def store(self, filepath: str, sheet_name: Any, kind: str, value: Any) -> None:
+        path = self._path(filepath, sheet_name, kind)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"  [WARN] Cannot write sheet cache entry for {filepath}: {e}", file=sys.stderr)
+
+
+# Rows per sheet kept in ExcelWorkbook.title_index()
+TITLE_ROWS = 5
+
+# Set by ingest_all (and in each worker process) when the cache is enabled
+SHEET_CACHE: Optional[SheetCache] = None
+
+
+def set_sheet_cache(cache: Optional[SheetCache]) -> None:
+    global SHEET_CACHE
+    SHEET_CACHE = cache
+
+
+class ExcelWorkbook:
+    """
+    A spreadsheet opened once, with sheets parsed from that single handle.
+
+    pd.read_excel(path) unzips and parses the workbook package on every
+    call, so reading N sheets of one file by path costs N+1 opens.  This
+    wraps one pd.ExcelFile for the lifetime of a parse: list sheets, read a
+    whole sheet or just its first rows, or iterate raw cell values.
+    Use as a context manager so the underlying file is closed.
+    With a PhaseTimer, opening and sheet reads are charged to "open" and
+    "sheet_read".
+
+    When SHEET_CACHE is set, sheet names, whole sheets and row tuples come
+    from it where possible, and the file is only opened on a cache miss.
+    """
+
+    def __init__(self, filepath: str, timer: Optional[PhaseTimer] = None):
+        self.filepath = filepath
+        self.timer = timer
+        self.cache = SHEET_CACHE
+        self._xls: Optional[pd.ExcelFile] = None
+        self._opened = False
+        self._frames: Dict[Any, pd.DataFrame] = {}
+        self._sheet_names: Optional[List[str]] = None
+        if self.cache is None:
+            self._open()
+
+    def _lap(self, phase: str) -> None:
+        if self.timer is not None:
+            self.timer.lap(phase)
+
+    def _count(self, name: str) -> None:
+        if self.timer is not None:
+            self.timer.count(name)
+
+    def _open(self) -> Optional[pd.ExcelFile]:
+        if not self._opened:
+            self._opened = True
+            try:
+                self._xls = pd.ExcelFile(self.filepath)
+            except Exception as e:
+                print(f"  [WARN] Cannot open {self.filepath}: {e}", file=sys.stderr)
+            self._lap("open")
+        return self._xls
+
+    def _cached(self, sheet_name: Any, kind: str) -> Any:
+        if self.cache is None:
+            return None
+        value = self.cache.load(self.filepath, sheet_name, kind)
+        self._count("sheet_cache_hits" if value is not None else "sheet_cache_misses")
+        return value
+
+    def __enter__(self) -> "ExcelWorkbook":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._xls is not None:
+            self._xls.close()
+            self._xls = None
+        self._frames.clear()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        if self._sheet_names is not None:
+            return self._sheet_names
+        names = self._cached(None, "sheets")
+        if names is not None:
+            self._lap("open")
+            self._sheet_names = names
+            return names
+        xls = self._open()
+        if xls is None:
+            return []
+        names = self._sheet_names = list(xls.sheet_names)
+        if self.cache is not None:
+            self.cache.store(self.filepath, None, "sheets", names)
+        return names
+
+    def read(self, sheet_name: Any = 0, nrows: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Read a sheet (header=None), or only its first nrows rows."""
+        full = self._frames.get(sheet_name)
+        if full is None:
+            full = self._cached(sheet_name, "frame")
+            if full is not None:
+                self._frames[sheet_name] = full
+                self._lap("sheet_read")
+        if full is not None:
+            return full if nrows is None else full.head(nrows)
+        xls = self._open()
+        if xls is None:
+            return None
+        try:
+            df = xls.parse(sheet_name=sheet_name, header=None, nrows=nrows)
+        except Exception as e:
+            print(f"  [WARN] Cannot read sheet '{sheet_name}' in {self.filepath}: {e}", file=sys.stderr)
+            return None
+        finally:
+            self._lap("sheet_read")
+        if nrows is None:
+            self._frames[sheet_name] = df
+            if self.cache is not None:
+                self.cache.store(self.filepath, sheet_name, "frame", df)
+        return df
+
+    def title_index(self) -> Dict[str, List[Tuple[Any, ...]]]:
+        """
+        The first TITLE_ROWS rows of every sheet, as raw cell tuples.
+
+        Titles and header captions live in these rows, so sheets can be
+        picked by content without parsing them in full: with openpyxl only
+        the start of each sheet's XML is streamed.
+        """
+        index = self._cached(None, "titles")
+        if index is not None:
+            self._lap("sheet_read")
+            return index
+        xls = self._open()
+        if xls is None:
+            return {}
+        index = {}
+        for sheet_name in self.sheet_names:
+            if xls.engine == "openpyxl":
+                ws = xls.book[sheet_name]
+                if not hasattr(ws, "iter_rows"):  # chartsheet
+                    index[sheet_name] = []
+                    continue
+                index[sheet_name] = list(ws.iter_rows(max_row=TITLE_ROWS, values_only=True))
+            else:
+                df = self.read(sheet_name, nrows=TITLE_ROWS)
+                index[sheet_name] = [] if df is None else [
+                    tuple(None if pd.isna(v) else v for v in row)
+                    for row in df.itertuples(index=False, name=None)
+                ]
+        self._lap("sheet_read")
+        if self.cache is not None:
+            self.cache.store(self.filepath, None, "titles", index)
+        return index
+
+    def rows(self, sheet_name: str) -> List[Tuple[Any, ...]]:
+        """Raw cell values of a sheet as tuples, None for empty cells."""
+        rows = self._cached(sheet_name, "rows")
+        if rows is not None:
+            self._lap("sheet_read")
+            return rows
+        xls = self._open()
+        if xls is None:
+            return []
+        if xls.engine == "openpyxl":
+            # Same values openpyxl.load_workbook(read_only=True, data_only=True)
+            # gives, without a second open of the package.
+            rows = list(xls.book[sheet_name].iter_rows(values_only=True))
+            self._lap("sheet_read")
+        else:
+            df = self.read(sheet_name)
+            if df is None:
+                return []
+            rows = [
+                tuple(None if pd.isna(v) else v for v in row)
+                for row in df.itertuples(index=False, name=None)
+            ]
+        if self.cache is not None:
+            self.cache.store(self.filepath, sheet_name, "rows", rows)
+        return rows
+
+
+def read_excel_safe(filepath: Any, sheet_name: Any = 0, **kwargs) -> Optional[pd.DataFrame]:
+    """Read an Excel sheet with error handling for format issues.
+
+    filepath may be an open ExcelWorkbook, which avoids re-parsing the file.
+    """
+    if isinstance(filepath, ExcelWorkbook):
+        return filepath.read(sheet_name, **kwargs)
     try:
         return pd.read_excel(filepath, sheet_name=sheet_name, header=None, **kwargs)
     except Exception as e:
@@ -367,32 +712,237 @@ def read_excel_safe(filepath: str, sheet_name: Any = 0, **kwargs) -> Optional[pd
         return None
 
 
-def get_sheet_names(filepath: str) -> List[str]:
-    """Get sheet names from an Excel file."""
+def get_sheet_names(filepath: Any) -> List[str]:
+    """Get sheet names from an Excel file (path or open ExcelWorkbook)."""
+    if isinstance(filepath, ExcelWorkbook):
+        return filepath.sheet_names
     try:
-        xls = pd.ExcelFile(filepath)
-        return xls.sheet_names
+        with pd.ExcelFile(filepath) as xls:
+            return xls.sheet_names
     except Exception as e:
         print(f"  [WARN] Cannot open {filepath}: {e}", file=sys.stderr)
         return []
 
 
-def already_ingested(conn: sqlite3.Connection, filename: str) -> bool:
-    row = conn.execute(
-        "SELECT 1 FROM ingested_files WHERE filename = ?", (filename,)
-    ).fetchone()
-    return row is not None
-
-
 def record_ingestion(conn: sqlite3.Connection, filename: str, filepath: str,
-                     row_count: int, section: str, data_year: str):
+                     row_count: int, section: str, data_year: str,
+                     sha256: Optional[str] = None, size: Optional[int] = None):
     conn.execute(
-        "INSERT OR IGNORE INTO ingested_files (filename, file_path, row_count, section, data_year) "
-        "VALUES (?, ?, ?, ?, ?)",
-        (filename, filepath, row_count, section, data_year),
+        "INSERT OR IGNORE INTO ingested_files "
+        "(filename, file_path, row_count, section, data_year, sha256, size) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (filename, filepath, row_count, section, data_year, sha256, size),
     )
 
 
+# ---------------------------------------------------------------------------
+# Content hashes (incremental ingest)
+# ---------------------------------------------------------------------------
+
+# Tables whose rows carry source_file, cleared before a file is re-ingested
+SOURCE_FILE_TABLES = [
+    "attrition_retention", "completion_rates", "enrolments",
+    "completions", "equity_performance",
+]
+
+
+# Sections writing with INSERT OR REPLACE, where the last file wins per key
+UPSERT_SECTION_TABLES = {
+    "section-15": "attrition_retention",
+    "section-17": "completion_rates",
+    "cohort-analysis": "completion_rates",
+    "section-16": "equity_performance",
+}
+
+
+def migrate_ingested_files(conn: sqlite3.Connection) -> None:
+    """Add the sha256/size columns to databases created before they existed."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(ingested_files)")}
+    for col, col_type in (("sha256", "TEXT"), ("size", "INTEGER")):
+        if col not in existing:
+            conn.execute(f"ALTER TABLE ingested_files ADD COLUMN {col} {col_type}")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ingested_sha256 ON ingested_files(sha256)")
+
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class FileHasher:
+    """
+    sha256 of data files, reusing the downloader's hash_index.tsv.
+
+    The index (written next to the files/ directory, or inside it) is only
+    trusted for files not modified after it was written; anything newer is
+    hashed from disk.
+    """
+
+    def __init__(self, data_dir: str):
+        self._index: Dict[str, str] = {}
+        self._index_mtime = 0.0
+        for candidate in (os.path.join(data_dir, "hash_index.tsv"),
+                          os.path.join(os.path.dirname(os.path.abspath(data_dir)), "hash_index.tsv")):
+            if os.path.isfile(candidate):
+                self._load(candidate)
+                break
+
+    def _load(self, path: str) -> None:
+        self._index_mtime = os.path.getmtime(path)
+        with open(path, encoding="utf-8") as f:
+            next(f, None)  # header
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) == 2 and parts[0]:
+                    self._index[os.path.basename(parts[1])] = parts[0]
+
+    def digest(self, filepath: str) -> str:
+        cached = self._index.get(os.path.basename(filepath))
+        if cached and os.path.getmtime(filepath) <= self._index_mtime:
+            return cached
+        return sha256_file(filepath)
+
+
+def delete_file_rows(conn: sqlite3.Connection, filename: str) -> int:
+    """Remove every row previously ingested from filename. Returns rows deleted."""
+    deleted = 0
+    for table in SOURCE_FILE_TABLES:
+        deleted += conn.execute(
+            f"DELETE FROM {table} WHERE source_file = ?", (filename,)
+        ).rowcount
+    conn.execute("DELETE FROM ingested_files WHERE filename = ?", (filename,))
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Extracted rows & the single writer
+# ---------------------------------------------------------------------------
+#
+# Parsing is split in two so files can be read in worker processes:
+#   extract_*     reads a file and returns a ParsedFile — plain tuples with
+#                 institution and field names still unresolved (no DB access)
+#   write_parsed  resolves names through the registries and inserts, in the
+#                 main process only, so IDs and aliases are created in exactly
+#                 the order a serial parse would create them.
+
+@dataclass
+class ParsedFile:
+    """Rows extracted from one file, institution and field names unresolved."""
+
+    insert_sql: str
+    # Index within each value tuple holding a field name to resolve, if any
+    field_pos: Optional[int] = None
+    # (raw institution name, state, [value tuples]) in sheet/row order.
+    # Every institution row is kept even with no values, because resolving
+    # it can create the institution or an alias.
+    records: List[Tuple[str, str, List[Tuple[Any, ...]]]] = field(default_factory=list)
+    # Started when extraction starts; the writer adds its phases to it
+    timer: PhaseTimer = field(default_factory=PhaseTimer)
+    # Peak RSS of the process that extracted the file, in MB
+    peak_rss_mb: Optional[float] = None
+
+    def add(self, inst_name: str, state: str, values: List[Tuple[Any, ...]]) -> None:
+        self.records.append((inst_name, state, values))
+
+
+# Rows per executemany call when writing a parsed file
+INSERT_BATCH_SIZE = 5000
+
+
+def write_parsed(conn: sqlite3.Connection, registry: InstitutionRegistry,
+                 fields: Optional[FieldRegistry], parsed: ParsedFile) -> int:
+    """
+    Resolve and insert a ParsedFile in executemany batches. Returns rows
+    inserted. Time in flush_rows is charged to "insert", the rest to "resolve".
+    """
+    timer = parsed.timer
+    t0 = time.perf_counter()
+    insert_before = timer.seconds.get("insert", 0.0)
+    stats_before = dict(registry.stats)
+    total_rows = 0
+    batch: List[Tuple[Any, ...]] = []
+    for inst_name, state, values in parsed.records:
+        inst_id = registry.resolve(inst_name, state=state)
+        if inst_id is None:
+            continue
+        for vals in values:
+            if parsed.field_pos is not None:
+                vals = list(vals)
+                vals[parsed.field_pos] = fields.resolve(vals[parsed.field_pos])
+            batch.append((inst_id, *vals))
+        if len(batch) >= INSERT_BATCH_SIZE:
+            with timer.phase("insert"):
+                total_rows += flush_rows(conn, parsed.insert_sql, batch)
+            batch = []
+    with timer.phase("insert"):
+        total_rows += flush_rows(conn, parsed.insert_sql, batch)
+        registry.flush_aliases()
+    inserting = timer.seconds["insert"] - insert_before
+    timer.add("resolve", time.perf_counter() - t0 - inserting)
+    for name, n in registry.stats.items():
+        timer.count(name, n - stats_before[name])
+    return total_rows
+
+
+def flush_rows(conn: sqlite3.Connection, sql: str, rows: List[Tuple[Any, ...]]) -> int:
+    """
+    executemany a batch inside a savepoint. If any row violates a constraint
+    the batch is undone and retried row by row, skipping only the offending
+    rows as per-row inserts always did. Returns rows inserted.
+    """
+    if not rows:
+        return 0
+    # Nest the savepoint in the file's transaction so RELEASE cannot commit it
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    conn.execute("SAVEPOINT flush_rows")
+    try:
+        conn.executemany(sql, rows)
+        inserted = len(rows)
+    except sqlite3.IntegrityError:
+        conn.execute("ROLLBACK TO flush_rows")
+        inserted = 0
+        for row in rows:
+            try:
+                conn.execute(sql, row)
+                inserted += 1
+            except sqlite3.IntegrityError:
+                pass
+    conn.execute("RELEASE flush_rows")
+    return inserted
+
+
+INSERT_ATTRITION_RETENTION = (
+    "INSERT OR REPLACE INTO attrition_retention "
+    "(institution_id, year, student_type, measure, rate, source_file) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+INSERT_COMPLETION_RATES = (
+    "INSERT OR REPLACE INTO completion_rates "
+    "(institution_id, cohort_start, cohort_end, duration_years, "
+    "completed_pct, still_enrolled_pct, dropped_out_pct, never_returned_pct, source_file) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_ENROLMENTS = (
+    "INSERT INTO enrolments "
+    "(institution_id, year, field_id, course_level, student_type, commencing, headcount, source_file) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+INSERT_COMPLETIONS = (
+    "INSERT INTO completions "
+    "(institution_id, year, field_id, course_level, headcount, source_file) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+INSERT_EQUITY_PERFORMANCE = (
+    "INSERT OR REPLACE INTO equity_performance "
+    "(institution_id, year, measure, equity_group, rate, source_file) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
 # ---------------------------------------------------------------------------
 # Parser 1: Section 15 — Attrition, Retention, Success
 # ---------------------------------------------------------------------------
@@ -429,12 +979,12 @@ S15_TYPE_KEYWORDS = {
 }
 
 
-def classify_s15_sheet(sheet_name: str, df: pd.DataFrame) -> Optional[Tuple[str, str]]:
-    """Determine (measure, student_type) from a Section 15 sheet."""
+def classify_s15_sheet(sheet_name: str, head: List[Tuple[Any, ...]]) -> Optional[Tuple[str, str]]:
+    """Determine (measure, student_type) from a Section 15 sheet's first rows."""
     # First try the sheet title row (usually row 1)
     title = ""
-    for i in range(min(3, len(df))):
-        cell = str(df.iloc[i, 0]) if pd.notna(df.iloc[i, 0]) else ""
+    for row in head[:3]:
+        cell = str(row[0]) if row and row[0] is not None else ""
         if len(cell) > 20:
             title = cell.lower()
             break
@@ -463,103 +1013,101 @@ def classify_s15_sheet(sheet_name: str, df: pd.DataFrame) -> Optional[Tuple[str,
 def parse_section_15(filepath: str, conn: sqlite3.Connection,
                      registry: InstitutionRegistry) -> int:
     """Parse a Section 15 file and insert attrition/retention/success rates."""
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
+    return write_parsed(conn, registry, None, extract_section_15(filepath))
 
-    # Filter to data sheets (skip Contents, Explanatory notes)
-    data_sheets = [s for s in sheets if s.lower() not in ("contents", "explanatory notes")]
-
-    total_rows = 0
-
-    for sheet_name in data_sheets:
-        df = read_excel_safe(filepath, sheet_name=sheet_name)
-        if df is None or df.empty:
-            continue
-
-        classification = classify_s15_sheet(sheet_name, df)
-        if classification is None:
-            continue
-        measure, student_type = classification
-
-        # Find the header row — contains year columns
-        header_row = None
-        year_cols: Dict[int, int] = {}  # col_index -> year
-
-        for i in range(min(8, len(df))):
-            row_vals = df.iloc[i].tolist()
-            years_found = {}
-            for j, v in enumerate(row_vals):
-                yr = safe_float(v)
-                if yr and 1990 < yr < 2030:
-                    years_found[j] = int(yr)
-            if len(years_found) >= 3:
-                header_row = i
-                year_cols = years_found
-                break
 
-        if header_row is None:
-            continue
+def extract_section_15(filepath: str) -> ParsedFile:
+    """Extract attrition/retention/success rates from a Section 15 file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_ATTRITION_RETENTION)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # Filter to data sheets (skip Contents, Explanatory notes)
+        data_sheets = [s for s in sheets if s.lower() not in ("contents", "explanatory notes")]
+        titles = wb.title_index()
+
+        for sheet_name in data_sheets:
+            # Classify from the title rows before parsing the whole sheet
+            classification = classify_s15_sheet(sheet_name, titles.get(sheet_name, []))
+            if classification is None:
+                continue
+            measure, student_type = classification
 
-        # Find institution name column (usually col 0 or 1)
-        # And state column
-        state_col = None
-        inst_col = None
-        for j in range(min(3, df.shape[1])):
-            sample = str(df.iloc[header_row, j]).lower().strip() if pd.notna(df.iloc[header_row, j]) else ""
-            if "state" in sample:
-                state_col = j
-            elif "institution" in sample or "higher education" in sample:
-                inst_col = j
-
-        # If no explicit columns found, assume col 0=state, col 1=institution
-        if inst_col is None:
-            inst_col = 1 if df.shape[1] > 1 else 0
-        if state_col is None and inst_col > 0:
-            state_col = 0
+            df = wb.read(sheet_name=sheet_name)
+            if df is None or df.empty:
+                continue
 
-        # Parse data rows
-        current_state = ""
-        for i in range(header_row + 1, len(df)):
-            # Update state from state column
-            if state_col is not None:
-                sv = df.iloc[i, state_col]
-                if pd.notna(sv) and str(sv).strip():
-                    current_state = str(sv).strip()
+            # Find the header row — contains year columns
+            header_row = None
+            year_cols: Dict[int, int] = {}  # col_index -> year
+
+            for i in range(min(8, len(df))):
+                row_vals = df.iloc[i].tolist()
+                years_found = {}
+                for j, v in enumerate(row_vals):
+                    yr = safe_float(v)
+                    if yr and 1990 < yr < 2030:
+                        years_found[j] = int(yr)
+                if len(years_found) >= 3:
+                    header_row = i
+                    year_cols = years_found
+                    break
 
-            # Get institution name
-            inst_raw = df.iloc[i, inst_col]
-            if pd.isna(inst_raw) or not str(inst_raw).strip():
+            parsed.timer.lap("header_scan")
+            if header_row is None:
                 continue
 
-            inst_name = str(inst_raw).strip()
+            # Find institution name column (usually col 0 or 1)
+            # And state column
+            state_col = None
+            inst_col = None
+            for j in range(min(3, df.shape[1])):
+                sample = str(df.iloc[header_row, j]).lower().strip() if pd.notna(df.iloc[header_row, j]) else ""
+                if "state" in sample:
+                    state_col = j
+                elif "institution" in sample or "higher education" in sample:
+                    inst_col = j
 
-            # Skip aggregate rows and footnotes
-            if inst_name.startswith("(") or inst_name.lower().startswith("note"):
-                continue
+            # If no explicit columns found, assume col 0=state, col 1=institution
+            if inst_col is None:
+                inst_col = 1 if df.shape[1] > 1 else 0
+            if state_col is None and inst_col > 0:
+                state_col = 0
+
+            # Parse data rows
+            current_state = ""
+            for i in range(header_row + 1, len(df)):
+                # Update state from state column
+                if state_col is not None:
+                    sv = df.iloc[i, state_col]
+                    if pd.notna(sv) and str(sv).strip():
+                        current_state = str(sv).strip()
+
+                # Get institution name
+                inst_raw = df.iloc[i, inst_col]
+                if pd.isna(inst_raw) or not str(inst_raw).strip():
+                    continue
 
-            inst_id = registry.resolve(inst_name, state=current_state)
-            if inst_id is None:
-                continue
+                inst_name = str(inst_raw).strip()
 
-            # Extract rate values for each year
-            for col_idx, year in year_cols.items():
-                rate = safe_float(df.iloc[i, col_idx])
-                if rate is None:
+                # Skip aggregate rows and footnotes
+                if inst_name.startswith("(") or inst_name.lower().startswith("note"):
                     continue
-                try:
-                    conn.execute(
-                        "INSERT OR REPLACE INTO attrition_retention "
-                        "(institution_id, year, student_type, measure, rate, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (inst_id, year, student_type, measure, rate, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
 
-    return total_rows
+                # Extract rate values for each year
+                values = []
+                for col_idx, year in year_cols.items():
+                    rate = safe_float(df.iloc[i, col_idx])
+                    if rate is None:
+                        continue
+                    values.append((year, student_type, measure, rate, fname))
+                parsed.add(inst_name, current_state, values)
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -569,125 +1117,123 @@ def parse_section_15(filepath: str, conn: sqlite3.Connection,
 def parse_section_17(filepath: str, conn: sqlite3.Connection,
                      registry: InstitutionRegistry) -> int:
     """Parse Section 17 completion rate file."""
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
-
-    # Look for sheet 17.3 (per-institution) or the last data sheet
-    target_sheets = [s for s in sheets if s in ("17.3", "3") or "institution" in s.lower()]
-    if not target_sheets:
-        # Fall back to all data sheets
-        target_sheets = [s for s in sheets if s.lower() not in ("contents", "explanatory notes")]
+    return write_parsed(conn, registry, None, extract_section_17(filepath))
 
-    total_rows = 0
 
-    for sheet_name in target_sheets:
-        df = read_excel_safe(filepath, sheet_name=sheet_name)
-        if df is None or df.empty:
-            continue
-
-        # Find header row with 'State', 'Institution', 'Duration', 'Timeframe'
-        header_row = None
-        col_map: Dict[str, int] = {}
-
-        for i in range(min(8, len(df))):
-            row_strs = [str(v).strip().lower() if pd.notna(v) else "" for v in df.iloc[i].tolist()]
-            found = {}
-            for j, s in enumerate(row_strs):
-                if "state" in s or "group" in s:
-                    found["state"] = j
-                elif "institution" in s:
-                    found["institution"] = j
-                elif "duration" in s:
-                    found["duration"] = j
-                elif "timeframe" in s:
-                    found["timeframe"] = j
-                elif "completed" in s:
-                    found["completed"] = j
-                elif "still enrolled" in s:
-                    found["still_enrolled"] = j
-                elif "re-enrolled" in s or "dropped out" in s:
-                    found["dropped_out"] = j
-                elif "never came back" in s:
-                    found["never_returned"] = j
-            if len(found) >= 4:
-                header_row = i
-                col_map = found
-                break
-
-        if header_row is None:
-            continue
+def extract_section_17(filepath: str) -> ParsedFile:
+    """Extract completion rates from a Section 17 file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_COMPLETION_RATES)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # Look for sheet 17.3 (per-institution) or the last data sheet
+        target_sheets = [s for s in sheets if s in ("17.3", "3") or "institution" in s.lower()]
+        if not target_sheets:
+            # Fall back to all data sheets
+            target_sheets = [s for s in sheets if s.lower() not in ("contents", "explanatory notes")]
+
+        for sheet_name in target_sheets:
+            df = wb.read(sheet_name=sheet_name)
+            if df is None or df.empty:
+                continue
 
-        current_state = ""
-        for i in range(header_row + 1, len(df)):
-            # State
-            if "state" in col_map:
-                sv = df.iloc[i, col_map["state"]]
-                if pd.notna(sv) and str(sv).strip():
-                    current_state = str(sv).strip()
+            # Find header row with 'State', 'Institution', 'Duration', 'Timeframe'
+            header_row = None
+            col_map: Dict[str, int] = {}
+
+            for i in range(min(8, len(df))):
+                row_strs = [str(v).strip().lower() if pd.notna(v) else "" for v in df.iloc[i].tolist()]
+                found = {}
+                for j, s in enumerate(row_strs):
+                    if "state" in s or "group" in s:
+                        found["state"] = j
+                    elif "institution" in s:
+                        found["institution"] = j
+                    elif "duration" in s:
+                        found["duration"] = j
+                    elif "timeframe" in s:
+                        found["timeframe"] = j
+                    elif "completed" in s:
+                        found["completed"] = j
+                    elif "still enrolled" in s:
+                        found["still_enrolled"] = j
+                    elif "re-enrolled" in s or "dropped out" in s:
+                        found["dropped_out"] = j
+                    elif "never came back" in s:
+                        found["never_returned"] = j
+                if len(found) >= 4:
+                    header_row = i
+                    col_map = found
+                    break
 
-            # Institution
-            inst_col = col_map.get("institution", col_map.get("state", 0))
-            inst_raw = df.iloc[i, inst_col] if inst_col < df.shape[1] else None
-            if pd.isna(inst_raw) or not str(inst_raw).strip():
-                continue
-            inst_name = str(inst_raw).strip()
-            if inst_name.startswith("("):
+            parsed.timer.lap("header_scan")
+            if header_row is None:
                 continue
 
-            inst_id = registry.resolve(inst_name, state=current_state)
-            if inst_id is None:
-                continue
+            current_state = ""
+            for i in range(header_row + 1, len(df)):
+                # State
+                if "state" in col_map:
+                    sv = df.iloc[i, col_map["state"]]
+                    if pd.notna(sv) and str(sv).strip():
+                        current_state = str(sv).strip()
+
+                # Institution
+                inst_col = col_map.get("institution", col_map.get("state", 0))
+                inst_raw = df.iloc[i, inst_col] if inst_col < df.shape[1] else None
+                if pd.isna(inst_raw) or not str(inst_raw).strip():
+                    continue
+                inst_name = str(inst_raw).strip()
+                if inst_name.startswith("("):
+                    continue
 
-            # Duration
-            duration_raw = df.iloc[i, col_map.get("duration", 2)] if "duration" in col_map else None
-            if pd.isna(duration_raw):
-                continue
-            dur_str = str(duration_raw).strip().lower()
-            if "four" in dur_str or "4" in dur_str:
-                duration = 4
-            elif "six" in dur_str or "6" in dur_str:
-                duration = 6
-            elif "nine" in dur_str or "9" in dur_str:
-                duration = 9
-            else:
-                continue
+                # The institution is resolved even if the row turns out to
+                # have no usable rate, so record it before the checks below.
+                values = []
+                parsed.add(inst_name, current_state, values)
 
-            # Timeframe
-            tf_raw = df.iloc[i, col_map.get("timeframe", 3)] if "timeframe" in col_map else None
-            if pd.isna(tf_raw):
-                continue
-            tf_str = str(tf_raw).strip()
-            m = re.match(r"(\d{4})-(\d{4})", tf_str)
-            if not m:
-                continue
-            cohort_start = int(m.group(1))
-            cohort_end = int(m.group(2))
+                # Duration
+                duration_raw = df.iloc[i, col_map.get("duration", 2)] if "duration" in col_map else None
+                if pd.isna(duration_raw):
+                    continue
+                dur_str = str(duration_raw).strip().lower()
+                if "four" in dur_str or "4" in dur_str:
+                    duration = 4
+                elif "six" in dur_str or "6" in dur_str:
+                    duration = 6
+                elif "nine" in dur_str or "9" in dur_str:
+                    duration = 9
+                else:
+                    continue
 
-            # Outcome percentages
-            completed = safe_float(df.iloc[i, col_map["completed"]]) if "completed" in col_map else None
-            still_enrolled = safe_float(df.iloc[i, col_map["still_enrolled"]]) if "still_enrolled" in col_map else None
-            dropped_out = safe_float(df.iloc[i, col_map["dropped_out"]]) if "dropped_out" in col_map else None
-            never_returned = safe_float(df.iloc[i, col_map["never_returned"]]) if "never_returned" in col_map else None
+                # Timeframe
+                tf_raw = df.iloc[i, col_map.get("timeframe", 3)] if "timeframe" in col_map else None
+                if pd.isna(tf_raw):
+                    continue
+                tf_str = str(tf_raw).strip()
+                m = re.match(r"(\d{4})-(\d{4})", tf_str)
+                if not m:
+                    continue
+                cohort_start = int(m.group(1))
+                cohort_end = int(m.group(2))
 
-            if completed is None and still_enrolled is None:
-                continue
+                # Outcome percentages
+                completed = safe_float(df.iloc[i, col_map["completed"]]) if "completed" in col_map else None
+                still_enrolled = safe_float(df.iloc[i, col_map["still_enrolled"]]) if "still_enrolled" in col_map else None
+                dropped_out = safe_float(df.iloc[i, col_map["dropped_out"]]) if "dropped_out" in col_map else None
+                never_returned = safe_float(df.iloc[i, col_map["never_returned"]]) if "never_returned" in col_map else None
 
-            try:
-                conn.execute(
-                    "INSERT OR REPLACE INTO completion_rates "
-                    "(institution_id, cohort_start, cohort_end, duration_years, "
-                    "completed_pct, still_enrolled_pct, dropped_out_pct, never_returned_pct, source_file) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (inst_id, cohort_start, cohort_end, duration, completed,
-                     still_enrolled, dropped_out, never_returned, fname),
-                )
-                total_rows += 1
-            except sqlite3.IntegrityError:
-                pass
+                if completed is None and still_enrolled is None:
+                    continue
 
-    return total_rows
+                values.append((cohort_start, cohort_end, duration, completed,
+                               still_enrolled, dropped_out, never_returned, fname))
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -697,80 +1243,75 @@ def parse_section_17(filepath: str, conn: sqlite3.Connection,
 def parse_cohort_analysis(filepath: str, conn: sqlite3.Connection,
                           registry: InstitutionRegistry) -> int:
     """Parse standalone Cohort Analysis files (T4/T5/T6 = per-institution %)."""
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
+    return write_parsed(conn, registry, None, extract_cohort_analysis(filepath))
 
-    # T4 = 9yr, T5 = 6yr, T6 = 4yr completion rates by institution
-    duration_map = {"T4": 9, "T5": 6, "T6": 4}
-    target_sheets = {s: d for s, d in duration_map.items() if s in sheets}
-
-    if not target_sheets:
-        return 0
-
-    total_rows = 0
-
-    for sheet_name, duration in target_sheets.items():
-        df = read_excel_safe(filepath, sheet_name=sheet_name)
-        if df is None or df.empty:
-            continue
-
-        # Find header row with timeframe columns (e.g. '2005-2013', '2006-2014')
-        header_row = None
-        timeframe_cols: Dict[int, Tuple[int, int]] = {}  # col_idx -> (start, end)
-
-        for i in range(min(8, len(df))):
-            tfs = {}
-            for j in range(df.shape[1]):
-                v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
-                m = re.match(r"(\d{4})-(\d{4})", v)
-                if m:
-                    tfs[j] = (int(m.group(1)), int(m.group(2)))
-            if len(tfs) >= 3:
-                header_row = i
-                timeframe_cols = tfs
-                break
 
-        if header_row is None:
-            continue
+def extract_cohort_analysis(filepath: str) -> ParsedFile:
+    """Extract per-institution completion rates from a Cohort Analysis file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_COMPLETION_RATES)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # T4 = 9yr, T5 = 6yr, T6 = 4yr completion rates by institution
+        duration_map = {"T4": 9, "T5": 6, "T6": 4}
+        target_sheets = {s: d for s, d in duration_map.items() if s in sheets}
+
+        if not target_sheets:
+            return parsed
+
+        for sheet_name, duration in target_sheets.items():
+            df = wb.read(sheet_name=sheet_name)
+            if df is None or df.empty:
+                continue
 
-        # Parse institution rows
-        current_state = ""
-        for i in range(header_row + 1, len(df)):
-            # Col 0 is often state, col 1 is institution
-            sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
-            if sv and isinstance(sv, str) and sv.strip() and not sv.strip().startswith("("):
-                current_state = sv.strip()
+            # Find header row with timeframe columns (e.g. '2005-2013', '2006-2014')
+            header_row = None
+            timeframe_cols: Dict[int, Tuple[int, int]] = {}  # col_idx -> (start, end)
+
+            for i in range(min(8, len(df))):
+                tfs = {}
+                for j in range(df.shape[1]):
+                    v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
+                    m = re.match(r"(\d{4})-(\d{4})", v)
+                    if m:
+                        tfs[j] = (int(m.group(1)), int(m.group(2)))
+                if len(tfs) >= 3:
+                    header_row = i
+                    timeframe_cols = tfs
+                    break
 
-            inst_raw = df.iloc[i, 1] if df.shape[1] > 1 and pd.notna(df.iloc[i, 1]) else ""
-            if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
-                continue
-            inst_name = inst_raw.strip()
-            if inst_name.startswith("(") or inst_name.startswith("Note"):
+            parsed.timer.lap("header_scan")
+            if header_row is None:
                 continue
 
-            inst_id = registry.resolve(inst_name, state=current_state)
-            if inst_id is None:
-                continue
+            # Parse institution rows
+            current_state = ""
+            for i in range(header_row + 1, len(df)):
+                # Col 0 is often state, col 1 is institution
+                sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
+                if sv and isinstance(sv, str) and sv.strip() and not sv.strip().startswith("("):
+                    current_state = sv.strip()
 
-            for col_idx, (cs, ce) in timeframe_cols.items():
-                val = safe_float(df.iloc[i, col_idx])
-                if val is None:
+                inst_raw = df.iloc[i, 1] if df.shape[1] > 1 and pd.notna(df.iloc[i, 1]) else ""
+                if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
+                    continue
+                inst_name = inst_raw.strip()
+                if inst_name.startswith("(") or inst_name.startswith("Note"):
                     continue
-                try:
-                    conn.execute(
-                        "INSERT OR REPLACE INTO completion_rates "
-                        "(institution_id, cohort_start, cohort_end, duration_years, "
-                        "completed_pct, still_enrolled_pct, dropped_out_pct, never_returned_pct, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, NULL, NULL, NULL, ?)",
-                        (inst_id, cs, ce, duration, val, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
 
-    return total_rows
+                values = []
+                for col_idx, (cs, ce) in timeframe_cols.items():
+                    val = safe_float(df.iloc[i, col_idx])
+                    if val is None:
+                        continue
+                    values.append((cs, ce, duration, val, None, None, None, fname))
+                parsed.add(inst_name, current_state, values)
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -784,133 +1325,127 @@ def parse_enrolments(filepath: str, conn: sqlite3.Connection,
     Parse Section 2 (all students) or Section 1 (commencing students).
     Reads the field-of-education breakdown sheet (2.10/2.11 or 1.9/1.10).
     """
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
+    return write_parsed(conn, registry, fields,
+                        extract_enrolments(filepath, data_year, commencing))
 
-    # Find sheets with field-of-education breakdown
-    # 2024: sheets '2.10', '2.11' (all, domestic)
-    # Older: may be named differently
-    target_sheets = []
-    for s in sheets:
-        sl = s.lower().strip()
-        # Sheets with field of education data are typically the later numbered ones
-        # containing "field" in the title, or sheets 2.10, 2.11, 1.9, 1.10
-        if sl in ("2.10", "1.9", "1.10", "2.11"):
-            target_sheets.append(s)
-
-    # If no standard sheets found, try to find by inspecting content
-    if not target_sheets:
-        for s in sheets:
-            if s.lower() in ("contents", "explanatory notes"):
-                continue
-            df_probe = read_excel_safe(filepath, sheet_name=s, nrows=5)
-            if df_probe is None:
-                continue
-            # Check if any cell contains "Field of Education"
-            for i in range(min(3, len(df_probe))):
-                row_text = " ".join(str(v) for v in df_probe.iloc[i].tolist() if pd.notna(v))
-                if "field of education" in row_text.lower():
-                    target_sheets.append(s)
-                    break
-
-    total_rows = 0
 
-    for sheet_name in target_sheets:
-        df = read_excel_safe(filepath, sheet_name=sheet_name)
-        if df is None or df.empty:
-            continue
-
-        # Determine student_type from sheet title or name
-        student_type = "all"
-        for i in range(min(3, len(df))):
-            title = str(df.iloc[i, 0]) if pd.notna(df.iloc[i, 0]) else ""
-            if "domestic" in title.lower():
-                student_type = "domestic"
-                break
+def extract_enrolments(filepath: str, data_year: int, commencing: int) -> ParsedFile:
+    """Extract field-of-education headcounts from a Section 2 / Section 1 file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_ENROLMENTS, field_pos=1)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # Find sheets with field-of-education breakdown
+        # 2024: sheets '2.10', '2.11' (all, domestic)
+        # Older: may be named differently
+        target_sheets = []
+        for s in sheets:
+            sl = s.lower().strip()
+            # Sheets with field of education data are typically the later numbered ones
+            # containing "field" in the title, or sheets 2.10, 2.11, 1.9, 1.10
+            if sl in ("2.10", "1.9", "1.10", "2.11"):
+                target_sheets.append(s)
 
-        # Find header row with field names as column headers
-        header_row = None
-        field_cols: Dict[int, str] = {}  # col_idx -> field_name
-
-        for i in range(min(8, len(df))):
-            fields_found = {}
-            for j in range(2, df.shape[1]):
-                v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
-                # Check if this looks like a field of education name
-                for bf in BROAD_FIELDS:
-                    if v and (bf.lower().startswith(v.lower()[:15]) or v.lower().startswith(bf.lower()[:15])):
-                        fields_found[j] = bf
+        # If no standard sheets found, try to find by inspecting content
+        if not target_sheets:
+            titles = wb.title_index()
+            for s in sheets:
+                if s.lower() in ("contents", "explanatory notes"):
+                    continue
+                # Check if any cell contains "Field of Education"
+                for row in titles.get(s, [])[:3]:
+                    row_text = " ".join(str(v) for v in row if v is not None)
+                    if "field of education" in row_text.lower():
+                        target_sheets.append(s)
                         break
-                # Also match partial names
-                if v.lower().startswith("natural") or "physical science" in v.lower():
-                    fields_found[j] = "Natural and Physical Sciences"
-                elif v.lower().startswith("information tech"):
-                    fields_found[j] = "Information Technology"
-                elif "engineering" in v.lower():
-                    fields_found[j] = "Engineering and Related Technologies"
-                elif "architecture" in v.lower():
-                    fields_found[j] = "Architecture and Building"
-                elif "agriculture" in v.lower() or "environmental" in v.lower():
-                    fields_found[j] = "Agriculture, Environmental and Related Studies"
-                elif v.lower() == "health":
-                    fields_found[j] = "Health"
-                elif v.lower() == "education":
-                    fields_found[j] = "Education"
-                elif "management" in v.lower() or "commerce" in v.lower():
-                    fields_found[j] = "Management and Commerce"
-                elif "society" in v.lower() or "culture" in v.lower():
-                    fields_found[j] = "Society and Culture"
-                elif "creative" in v.lower():
-                    fields_found[j] = "Creative Arts"
-                elif "food" in v.lower() or "hospitality" in v.lower():
-                    fields_found[j] = "Food, Hospitality and Personal Services"
-
-            if len(fields_found) >= 5:
-                header_row = i
-                field_cols = fields_found
-                break
 
-        if header_row is None:
-            continue
+        for sheet_name in target_sheets:
+            df = wb.read(sheet_name=sheet_name)
+            if df is None or df.empty:
+                continue
 
-        # Parse data rows
-        current_state = ""
-        for i in range(header_row + 1, len(df)):
-            sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
-            if sv and isinstance(sv, str) and sv.strip():
-                current_state = str(sv).strip()
+            # Determine student_type from sheet title or name
+            student_type = "all"
+            for i in range(min(3, len(df))):
+                title = str(df.iloc[i, 0]) if pd.notna(df.iloc[i, 0]) else ""
+                if "domestic" in title.lower():
+                    student_type = "domestic"
+                    break
 
-            inst_col = 1 if df.shape[1] > 1 else 0
-            inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
-            if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
-                continue
-            inst_name = str(inst_raw).strip()
-            if inst_name.startswith("(") or inst_name.startswith("Note") or inst_name.startswith("Source"):
-                continue
+            # Find header row with field names as column headers
+            header_row = None
+            field_cols: Dict[int, str] = {}  # col_idx -> field_name
+
+            for i in range(min(8, len(df))):
+                fields_found = {}
+                for j in range(2, df.shape[1]):
+                    v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
+                    # Check if this looks like a field of education name
+                    for bf in BROAD_FIELDS:
+                        if v and (bf.lower().startswith(v.lower()[:15]) or v.lower().startswith(bf.lower()[:15])):
+                            fields_found[j] = bf
+                            break
+                    # Also match partial names
+                    if v.lower().startswith("natural") or "physical science" in v.lower():
+                        fields_found[j] = "Natural and Physical Sciences"
+                    elif v.lower().startswith("information tech"):
+                        fields_found[j] = "Information Technology"
+                    elif "engineering" in v.lower():
+                        fields_found[j] = "Engineering and Related Technologies"
+                    elif "architecture" in v.lower():
+                        fields_found[j] = "Architecture and Building"
+                    elif "agriculture" in v.lower() or "environmental" in v.lower():
+                        fields_found[j] = "Agriculture, Environmental and Related Studies"
+                    elif v.lower() == "health":
+                        fields_found[j] = "Health"
+                    elif v.lower() == "education":
+                        fields_found[j] = "Education"
+                    elif "management" in v.lower() or "commerce" in v.lower():
+                        fields_found[j] = "Management and Commerce"
+                    elif "society" in v.lower() or "culture" in v.lower():
+                        fields_found[j] = "Society and Culture"
+                    elif "creative" in v.lower():
+                        fields_found[j] = "Creative Arts"
+                    elif "food" in v.lower() or "hospitality" in v.lower():
+                        fields_found[j] = "Food, Hospitality and Personal Services"
+
+                if len(fields_found) >= 5:
+                    header_row = i
+                    field_cols = fields_found
+                    break
 
-            inst_id = registry.resolve(inst_name, state=current_state)
-            if inst_id is None:
+            parsed.timer.lap("header_scan")
+            if header_row is None:
                 continue
 
-            for col_idx, field_name in field_cols.items():
-                headcount = safe_int(df.iloc[i, col_idx])
-                if headcount is None:
+            # Parse data rows
+            current_state = ""
+            for i in range(header_row + 1, len(df)):
+                sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
+                if sv and isinstance(sv, str) and sv.strip():
+                    current_state = str(sv).strip()
+
+                inst_col = 1 if df.shape[1] > 1 else 0
+                inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
+                if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
+                    continue
+                inst_name = str(inst_raw).strip()
+                if inst_name.startswith("(") or inst_name.startswith("Note") or inst_name.startswith("Source"):
                     continue
-                field_id = fields.resolve(field_name)
-                try:
-                    conn.execute(
-                        "INSERT INTO enrolments "
-                        "(institution_id, year, field_id, course_level, student_type, commencing, headcount, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                        (inst_id, data_year, field_id, "All", student_type, commencing, headcount, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
 
-    return total_rows
+                values = []
+                for col_idx, field_name in field_cols.items():
+                    headcount = safe_int(df.iloc[i, col_idx])
+                    if headcount is None:
+                        continue
+                    values.append((data_year, field_name, "All", student_type, commencing, headcount, fname))
+                parsed.add(inst_name, current_state, values)
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -921,106 +1456,99 @@ def parse_section_14(filepath: str, conn: sqlite3.Connection,
                      registry: InstitutionRegistry, fields: FieldRegistry,
                      data_year: int) -> int:
     """Parse Section 14 award course completions. Structure similar to Section 2."""
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
-
-    # Find the field-of-education breakdown sheet
-    target_sheets = []
-    for s in sheets:
-        if s.lower() in ("contents", "explanatory notes"):
-            continue
-        df_probe = read_excel_safe(filepath, sheet_name=s, nrows=5)
-        if df_probe is None:
-            continue
-        for i in range(min(4, len(df_probe))):
-            row_text = " ".join(str(v) for v in df_probe.iloc[i].tolist() if pd.notna(v))
-            if "field of education" in row_text.lower():
-                target_sheets.append(s)
-                break
+    return write_parsed(conn, registry, fields, extract_section_14(filepath, data_year))
 
-    total_rows = 0
 
-    for sheet_name in target_sheets[:2]:  # Limit to first 2 matching sheets
-        df = read_excel_safe(filepath, sheet_name=sheet_name)
-        if df is None or df.empty:
-            continue
-
-        # Find header row with field names
-        header_row = None
-        field_cols: Dict[int, str] = {}
-
-        for i in range(min(8, len(df))):
-            fields_found = {}
-            for j in range(2, df.shape[1]):
-                v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
-                if v.lower().startswith("natural") or "physical science" in v.lower():
-                    fields_found[j] = "Natural and Physical Sciences"
-                elif v.lower().startswith("information tech"):
-                    fields_found[j] = "Information Technology"
-                elif "engineering" in v.lower():
-                    fields_found[j] = "Engineering and Related Technologies"
-                elif "architecture" in v.lower():
-                    fields_found[j] = "Architecture and Building"
-                elif "agriculture" in v.lower() or "environmental" in v.lower():
-                    fields_found[j] = "Agriculture, Environmental and Related Studies"
-                elif v.lower() == "health":
-                    fields_found[j] = "Health"
-                elif v.lower() == "education":
-                    fields_found[j] = "Education"
-                elif "management" in v.lower() or "commerce" in v.lower():
-                    fields_found[j] = "Management and Commerce"
-                elif "society" in v.lower() or "culture" in v.lower():
-                    fields_found[j] = "Society and Culture"
-                elif "creative" in v.lower():
-                    fields_found[j] = "Creative Arts"
-                elif "food" in v.lower() or "hospitality" in v.lower():
-                    fields_found[j] = "Food, Hospitality and Personal Services"
-
-            if len(fields_found) >= 5:
-                header_row = i
-                field_cols = fields_found
-                break
+def extract_section_14(filepath: str, data_year: int) -> ParsedFile:
+    """Extract field-of-education award completions from a Section 14 file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_COMPLETIONS, field_pos=1)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # Find the field-of-education breakdown sheet
+        target_sheets = []
+        titles = wb.title_index()
+        for s in sheets:
+            if s.lower() in ("contents", "explanatory notes"):
+                continue
+            for row in titles.get(s, [])[:4]:
+                row_text = " ".join(str(v) for v in row if v is not None)
+                if "field of education" in row_text.lower():
+                    target_sheets.append(s)
+                    break
 
-        if header_row is None:
-            continue
+        for sheet_name in target_sheets[:2]:  # Limit to first 2 matching sheets
+            df = wb.read(sheet_name=sheet_name)
+            if df is None or df.empty:
+                continue
 
-        current_state = ""
-        for i in range(header_row + 1, len(df)):
-            sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
-            if sv and isinstance(sv, str) and sv.strip():
-                current_state = str(sv).strip()
+            # Find header row with field names
+            header_row = None
+            field_cols: Dict[int, str] = {}
+
+            for i in range(min(8, len(df))):
+                fields_found = {}
+                for j in range(2, df.shape[1]):
+                    v = str(df.iloc[i, j]).strip() if pd.notna(df.iloc[i, j]) else ""
+                    if v.lower().startswith("natural") or "physical science" in v.lower():
+                        fields_found[j] = "Natural and Physical Sciences"
+                    elif v.lower().startswith("information tech"):
+                        fields_found[j] = "Information Technology"
+                    elif "engineering" in v.lower():
+                        fields_found[j] = "Engineering and Related Technologies"
+                    elif "architecture" in v.lower():
+                        fields_found[j] = "Architecture and Building"
+                    elif "agriculture" in v.lower() or "environmental" in v.lower():
+                        fields_found[j] = "Agriculture, Environmental and Related Studies"
+                    elif v.lower() == "health":
+                        fields_found[j] = "Health"
+                    elif v.lower() == "education":
+                        fields_found[j] = "Education"
+                    elif "management" in v.lower() or "commerce" in v.lower():
+                        fields_found[j] = "Management and Commerce"
+                    elif "society" in v.lower() or "culture" in v.lower():
+                        fields_found[j] = "Society and Culture"
+                    elif "creative" in v.lower():
+                        fields_found[j] = "Creative Arts"
+                    elif "food" in v.lower() or "hospitality" in v.lower():
+                        fields_found[j] = "Food, Hospitality and Personal Services"
+
+                if len(fields_found) >= 5:
+                    header_row = i
+                    field_cols = fields_found
+                    break
 
-            inst_col = 1 if df.shape[1] > 1 else 0
-            inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
-            if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
-                continue
-            inst_name = str(inst_raw).strip()
-            if inst_name.startswith("(") or inst_name.startswith("Note"):
+            parsed.timer.lap("header_scan")
+            if header_row is None:
                 continue
 
-            inst_id = registry.resolve(inst_name, state=current_state)
-            if inst_id is None:
-                continue
+            current_state = ""
+            for i in range(header_row + 1, len(df)):
+                sv = df.iloc[i, 0] if pd.notna(df.iloc[i, 0]) else ""
+                if sv and isinstance(sv, str) and sv.strip():
+                    current_state = str(sv).strip()
 
-            for col_idx, field_name in field_cols.items():
-                headcount = safe_int(df.iloc[i, col_idx])
-                if headcount is None:
+                inst_col = 1 if df.shape[1] > 1 else 0
+                inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
+                if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
+                    continue
+                inst_name = str(inst_raw).strip()
+                if inst_name.startswith("(") or inst_name.startswith("Note"):
                     continue
-                field_id = fields.resolve(field_name)
-                try:
-                    conn.execute(
-                        "INSERT INTO completions "
-                        "(institution_id, year, field_id, course_level, headcount, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (inst_id, data_year, field_id, "All", headcount, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
 
-    return total_rows
+                values = []
+                for col_idx, field_name in field_cols.items():
+                    headcount = safe_int(df.iloc[i, col_idx])
+                    if headcount is None:
+                        continue
+                    values.append((data_year, field_name, "All", headcount, fname))
+                parsed.add(inst_name, current_state, values)
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -1031,144 +1559,134 @@ def parse_pivot_table(filepath: str, conn: sqlite3.Connection,
                       registry: InstitutionRegistry, fields: FieldRegistry,
                       is_completions: bool = False) -> int:
     """Parse perturbed pivot table files (BFOE sheet)."""
-    fname = os.path.basename(filepath)
-    sheets = get_sheet_names(filepath)
-    if not sheets:
-        return 0
+    return write_parsed(conn, registry, fields,
+                        extract_pivot_table(filepath, is_completions=is_completions))
 
-    # Look for the Pivot_BFOE sheet
-    target = None
-    for s in sheets:
-        if "bfoe" in s.lower():
-            target = s
-            break
 
-    if target is None:
-        return 0
+def extract_pivot_table(filepath: str, is_completions: bool = False) -> ParsedFile:
+    """Extract field-of-education headcounts from a pivot table's BFOE sheet."""
+    fname = os.path.basename(filepath)
+    if is_completions:
+        parsed = ParsedFile(INSERT_COMPLETIONS, field_pos=1)
+    else:
+        parsed = ParsedFile(INSERT_ENROLMENTS, field_pos=1)
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        sheets = wb.sheet_names
+        if not sheets:
+            return parsed
+
+        # Look for the Pivot_BFOE sheet
+        target = None
+        for s in sheets:
+            if "bfoe" in s.lower():
+                target = s
+                break
 
-    df = read_excel_safe(filepath, sheet_name=target)
-    if df is None or df.empty:
-        return 0
+        if target is None:
+            return parsed
 
-    # Find the header row with 'State', 'Institution', and field names
-    header_row = None
-    state_col = None
-    inst_col = None
-    field_cols: Dict[int, str] = {}
-    year_data: Dict[int, int] = {}  # for the Pivot sheet with year columns
-
-    for i in range(min(30, len(df))):
-        row_strs = [str(v).strip() if pd.notna(v) else "" for v in df.iloc[i].tolist()]
-        # Check if this looks like a header row
-        if any("state" in s.lower() for s in row_strs) and any("institution" in s.lower() for s in row_strs):
-            header_row = i
-            for j, s in enumerate(row_strs):
-                sl = s.lower()
-                if "state" == sl or sl == "state":
-                    state_col = j
-                elif "institution" in sl:
-                    inst_col = j
-                else:
-                    # Check field names
-                    if "natural" in sl or "physical science" in sl:
-                        field_cols[j] = "Natural and Physical Sciences"
-                    elif "information tech" in sl:
-                        field_cols[j] = "Information Technology"
-                    elif "engineering" in sl:
-                        field_cols[j] = "Engineering and Related Technologies"
-                    elif "architecture" in sl:
-                        field_cols[j] = "Architecture and Building"
-                    elif "agriculture" in sl or "environmental" in sl:
-                        field_cols[j] = "Agriculture, Environmental and Related Studies"
-                    elif sl == "health":
-                        field_cols[j] = "Health"
-                    elif sl == "education":
-                        field_cols[j] = "Education"
-                    elif "management" in sl or "commerce" in sl:
-                        field_cols[j] = "Management and Commerce"
-                    elif "society" in sl or "culture" in sl:
-                        field_cols[j] = "Society and Culture"
-                    elif "creative" in sl:
-                        field_cols[j] = "Creative Arts"
-                    elif "food" in sl or "hospitality" in sl:
-                        field_cols[j] = "Food, Hospitality and Personal Services"
-                    elif "total" in sl and "enrolment" in sl.lower():
-                        pass  # Skip total columns
-            break
+        df = wb.read(sheet_name=target)
+        if df is None or df.empty:
+            return parsed
 
-    if header_row is None or not field_cols:
-        return 0
+        # Find the header row with 'State', 'Institution', and field names
+        header_row = None
+        state_col = None
+        inst_col = None
+        field_cols: Dict[int, str] = {}
+        year_data: Dict[int, int] = {}  # for the Pivot sheet with year columns
 
-    if state_col is None:
-        state_col = 0
-    if inst_col is None:
-        inst_col = 1
-
-    # Determine the year from the filter settings above the data
-    data_year = None
-    for i in range(header_row):
-        cell0 = str(df.iloc[i, 0]).strip().lower() if pd.notna(df.iloc[i, 0]) else ""
-        cell1 = str(df.iloc[i, 1]).strip() if pd.notna(df.iloc[i, 1]) else ""
-        if cell0 == "year":
-            yr = safe_int(cell1)
-            if yr and 2000 < yr < 2030:
-                data_year = yr
+        for i in range(min(30, len(df))):
+            row_strs = [str(v).strip() if pd.notna(v) else "" for v in df.iloc[i].tolist()]
+            # Check if this looks like a header row
+            if any("state" in s.lower() for s in row_strs) and any("institution" in s.lower() for s in row_strs):
+                header_row = i
+                for j, s in enumerate(row_strs):
+                    sl = s.lower()
+                    if "state" == sl or sl == "state":
+                        state_col = j
+                    elif "institution" in sl:
+                        inst_col = j
+                    else:
+                        # Check field names
+                        if "natural" in sl or "physical science" in sl:
+                            field_cols[j] = "Natural and Physical Sciences"
+                        elif "information tech" in sl:
+                            field_cols[j] = "Information Technology"
+                        elif "engineering" in sl:
+                            field_cols[j] = "Engineering and Related Technologies"
+                        elif "architecture" in sl:
+                            field_cols[j] = "Architecture and Building"
+                        elif "agriculture" in sl or "environmental" in sl:
+                            field_cols[j] = "Agriculture, Environmental and Related Studies"
+                        elif sl == "health":
+                            field_cols[j] = "Health"
+                        elif sl == "education":
+                            field_cols[j] = "Education"
+                        elif "management" in sl or "commerce" in sl:
+                            field_cols[j] = "Management and Commerce"
+                        elif "society" in sl or "culture" in sl:
+                            field_cols[j] = "Society and Culture"
+                        elif "creative" in sl:
+                            field_cols[j] = "Creative Arts"
+                        elif "food" in sl or "hospitality" in sl:
+                            field_cols[j] = "Food, Hospitality and Personal Services"
+                        elif "total" in sl and "enrolment" in sl.lower():
+                            pass  # Skip total columns
                 break
 
-    if data_year is None:
-        # Try to extract from filename
-        m = re.search(r"(20\d{2})", fname)
-        data_year = int(m.group(1)) if m else 2024
+        parsed.timer.lap("header_scan")
+        if header_row is None or not field_cols:
+            return parsed
 
-    total_rows = 0
-    current_state = ""
+        if state_col is None:
+            state_col = 0
+        if inst_col is None:
+            inst_col = 1
+
+        # Determine the year from the filter settings above the data
+        data_year = None
+        for i in range(header_row):
+            cell0 = str(df.iloc[i, 0]).strip().lower() if pd.notna(df.iloc[i, 0]) else ""
+            cell1 = str(df.iloc[i, 1]).strip() if pd.notna(df.iloc[i, 1]) else ""
+            if cell0 == "year":
+                yr = safe_int(cell1)
+                if yr and 2000 < yr < 2030:
+                    data_year = yr
+                    break
 
-    for i in range(header_row + 1, len(df)):
-        sv = df.iloc[i, state_col] if pd.notna(df.iloc[i, state_col]) else ""
-        if sv and isinstance(sv, str) and sv.strip():
-            current_state = str(sv).strip()
+        if data_year is None:
+            # Try to extract from filename
+            m = re.search(r"(20\d{2})", fname)
+            data_year = int(m.group(1)) if m else 2024
 
-        inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
-        if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
-            continue
-        inst_name = str(inst_raw).strip()
-        if inst_name.startswith("(") or inst_name.startswith("Grand Total"):
-            continue
+        current_state = ""
 
-        inst_id = registry.resolve(inst_name, state=current_state)
-        if inst_id is None:
-            continue
+        for i in range(header_row + 1, len(df)):
+            sv = df.iloc[i, state_col] if pd.notna(df.iloc[i, state_col]) else ""
+            if sv and isinstance(sv, str) and sv.strip():
+                current_state = str(sv).strip()
 
-        for col_idx, field_name in field_cols.items():
-            headcount = safe_int(df.iloc[i, col_idx])
-            if headcount is None:
+            inst_raw = df.iloc[i, inst_col] if pd.notna(df.iloc[i, inst_col]) else ""
+            if not inst_raw or not isinstance(inst_raw, str) or not inst_raw.strip():
+                continue
+            inst_name = str(inst_raw).strip()
+            if inst_name.startswith("(") or inst_name.startswith("Grand Total"):
                 continue
-            field_id = fields.resolve(field_name)
 
-            if is_completions:
-                try:
-                    conn.execute(
-                        "INSERT INTO completions "
-                        "(institution_id, year, field_id, course_level, headcount, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (inst_id, data_year, field_id, "All", headcount, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
-            else:
-                try:
-                    conn.execute(
-                        "INSERT INTO enrolments "
-                        "(institution_id, year, field_id, course_level, student_type, commencing, headcount, source_file) "
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                        (inst_id, data_year, field_id, "All", "all", 0, headcount, fname),
-                    )
-                    total_rows += 1
-                except sqlite3.IntegrityError:
-                    pass
+            values = []
+            for col_idx, field_name in field_cols.items():
+                headcount = safe_int(df.iloc[i, col_idx])
+                if headcount is None:
+                    continue
+                if is_completions:
+                    values.append((data_year, field_name, "All", headcount, fname))
+                else:
+                    values.append((data_year, field_name, "All", "all", 0, headcount, fname))
+            parsed.add(inst_name, current_state, values)
+        parsed.timer.lap("row_loop")
 
-    return total_rows
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -1268,161 +1786,160 @@ def parse_section_16(
 
     Returns total rows inserted.
     """
-    import openpyxl
-
-    wb = openpyxl.load_workbook(filepath, read_only=True, data_only=True)
-    total_rows = 0
-    fname = os.path.basename(filepath)
-
-    for sheet_name in wb.sheetnames:
-        # Accept numbered sheets: "16.8", "16.10", or just "8", "10", etc.
-        stripped = sheet_name.strip()
-        if not (re.match(r"^16\.\d+$", stripped) or re.match(r"^\d{1,2}$", stripped)):
-            continue
-
-        ws = wb[sheet_name]
-        rows = list(ws.iter_rows(values_only=True))
-        if len(rows) < 5:
-            continue
-
-        # Determine measure from title — scan first few rows for a title string.
-        # We only want RATE sheets, not RATIO sheets.
-        measure = None
-        title_row_idx = None
-        for i in range(min(5, len(rows))):
-            cell = str(rows[i][0] or "").lower()
-            # Skip ratio sheets explicitly
-            if "ratio" in cell:
-                break
-            if "retention" in cell and "rate" in cell:
-                measure = "retention"
-                title_row_idx = i
-                break
-            elif "success" in cell and "rate" in cell:
-                measure = "success"
-                title_row_idx = i
-                break
-            elif "attainment" in cell and ("rate" in cell or "attainment" in cell):
-                measure = "attainment"
-                title_row_idx = i
-                break
-        if measure is None:
-            continue
-
-        # Find the year row — look for a row that has integer years (2009-2024) in cols 2+
-        year_row_idx = None
-        for i in range(title_row_idx + 1, min(title_row_idx + 5, len(rows))):
-            # Check if col 2+ has year-like values
-            year_count = 0
-            for c in range(2, min(20, len(rows[i]))):
-                y = _parse_year_value(rows[i][c])
-                if y and 2000 <= y <= 2030:
-                    year_count += 1
-            if year_count >= 3:  # at least 3 year columns found
-                year_row_idx = i
-                break
-        if year_row_idx is None:
-            continue
-
-        # Equity group headers are one row above the year row
-        equity_header_idx = year_row_idx - 1
-        data_start_idx = year_row_idx + 1
-
-        # Build equity group -> column range map from equity header row
-        equity_header = rows[equity_header_idx]
-        group_start_cols: List[Tuple[int, str]] = []
-        for col_idx, val in enumerate(equity_header):
-            if val is not None and str(val).strip() and col_idx >= 2:
-                group_start_cols.append((col_idx, str(val).strip()))
-
-        if not group_start_cols:
-            continue
+    return write_parsed(conn, registry, None, extract_section_16(filepath))
 
-        # Build col -> (equity_group_key, year) map from year row
-        year_row = rows[year_row_idx]
-        col_map: Dict[int, Tuple[str, int]] = {}
 
-        for col_idx, val in enumerate(year_row):
-            if col_idx < 2:
+def extract_section_16(filepath: str) -> ParsedFile:
+    """Extract equity group rates from a Section 16 file."""
+    fname = os.path.basename(filepath)
+    parsed = ParsedFile(INSERT_EQUITY_PERFORMANCE)
+
+    with ExcelWorkbook(filepath, parsed.timer) as wb:
+        titles = wb.title_index()
+        for sheet_name in wb.sheet_names:
+            # Accept numbered sheets: "16.8", "16.10", or just "8", "10", etc.
+            stripped = sheet_name.strip()
+            if not (re.match(r"^16\.\d+$", stripped) or re.match(r"^\d{1,2}$", stripped)):
                 continue
-            year = _parse_year_value(val)
-            if year is None:
+
+            # Determine measure from title — scan first few rows for a title string.
+            # We only want RATE sheets, not RATIO sheets, so ratio sheets are
+            # never parsed in full.
+            head = titles.get(sheet_name, [])
+            measure = None
+            title_row_idx = None
+            for i in range(min(5, len(head))):
+                cell = str((head[i][0] if head[i] else None) or "").lower()
+                # Skip ratio sheets explicitly
+                if "ratio" in cell:
+                    break
+                if "retention" in cell and "rate" in cell:
+                    measure = "retention"
+                    title_row_idx = i
+                    break
+                elif "success" in cell and "rate" in cell:
+                    measure = "success"
+                    title_row_idx = i
+                    break
+                elif "attainment" in cell and ("rate" in cell or "attainment" in cell):
+                    measure = "attainment"
+                    title_row_idx = i
+                    break
+            if measure is None:
                 continue
 
-            # Skip non-latest version columns (dual SEIFA/ASGS)
-            if not _is_latest_version_column(val):
+            rows = wb.rows(sheet_name)
+            if len(rows) < 5:
                 continue
 
-            # Find which equity group this column belongs to
-            group_col = None
-            group_raw = None
-            for gc, gn in reversed(group_start_cols):
-                if col_idx >= gc:
-                    group_col = gc
-                    group_raw = gn
+            # Find the year row — look for a row that has integer years (2009-2024) in cols 2+
+            year_row_idx = None
+            for i in range(title_row_idx + 1, min(title_row_idx + 5, len(rows))):
+                # Check if col 2+ has year-like values
+                year_count = 0
+                for c in range(2, min(20, len(rows[i]))):
+                    y = _parse_year_value(rows[i][c])
+                    if y and 2000 <= y <= 2030:
+                        year_count += 1
+                if year_count >= 3:  # at least 3 year columns found
+                    year_row_idx = i
                     break
-            if group_raw is None:
+            if year_row_idx is None:
                 continue
 
-            eq_key = _normalise_equity_group(group_raw)
-            if eq_key is None:
-                continue  # skip unwanted groups
+            # Equity group headers are one row above the year row
+            equity_header_idx = year_row_idx - 1
+            data_start_idx = year_row_idx + 1
 
-            col_map[col_idx] = (eq_key, year)
+            # Build equity group -> column range map from equity header row
+            equity_header = rows[equity_header_idx]
+            group_start_cols: List[Tuple[int, str]] = []
+            for col_idx, val in enumerate(equity_header):
+                if val is not None and str(val).strip() and col_idx >= 2:
+                    group_start_cols.append((col_idx, str(val).strip()))
 
-        if not col_map:
-            continue
+            if not group_start_cols:
+                continue
 
-        # Parse data rows
-        current_group = None
-        for row in rows[data_start_idx:]:
-            col0 = row[0]
-            col1 = row[1]
+            # Build col -> (equity_group_key, year) map from year row
+            year_row = rows[year_row_idx]
+            col_map: Dict[int, Tuple[str, int]] = {}
 
-            # Stop at footnotes
-            if col0 and str(col0).strip().startswith("("):
-                break
+            for col_idx, val in enumerate(year_row):
+                if col_idx < 2:
+                    continue
+                year = _parse_year_value(val)
+                if year is None:
+                    continue
 
-            # Track group category (carry-forward for older files)
-            if col0 and str(col0).strip():
-                current_group = str(col0).strip()
+                # Skip non-latest version columns (dual SEIFA/ASGS)
+                if not _is_latest_version_column(val):
+                    continue
 
-            # Only process institution rows
-            if current_group != "Higher Education Institution":
-                continue
+                # Find which equity group this column belongs to
+                group_col = None
+                group_raw = None
+                for gc, gn in reversed(group_start_cols):
+                    if col_idx >= gc:
+                        group_col = gc
+                        group_raw = gn
+                        break
+                if group_raw is None:
+                    continue
 
-            if not col1 or not str(col1).strip():
-                continue
+                eq_key = _normalise_equity_group(group_raw)
+                if eq_key is None:
+                    continue  # skip unwanted groups
 
-            inst_name = str(col1).strip()
-            inst_id = registry.resolve(inst_name)
-            if inst_id is None:
+                col_map[col_idx] = (eq_key, year)
+
+            parsed.timer.lap("header_scan")
+            if not col_map:
                 continue
 
-            # Extract values
-            for col_idx, (eq_key, year) in col_map.items():
-                if col_idx >= len(row):
-                    continue
-                val = row[col_idx]
-                if val is None:
-                    continue
-                # 0 means not reported
-                if isinstance(val, (int, float)) and val == 0:
+            # Parse data rows
+            current_group = None
+            for row in rows[data_start_idx:]:
+                col0 = row[0]
+                col1 = row[1]
+
+                # Stop at footnotes
+                if col0 and str(col0).strip().startswith("("):
+                    break
+
+                # Track group category (carry-forward for older files)
+                if col0 and str(col0).strip():
+                    current_group = str(col0).strip()
+
+                # Only process institution rows
+                if current_group != "Higher Education Institution":
                     continue
-                rate = safe_float(val)
-                if rate is None:
+
+                if not col1 or not str(col1).strip():
                     continue
 
-                conn.execute(
-                    """INSERT OR REPLACE INTO equity_performance
-                       (institution_id, year, measure, equity_group, rate, source_file)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (inst_id, year, measure, eq_key, rate, fname),
-                )
-                total_rows += 1
+                inst_name = str(col1).strip()
 
-    wb.close()
-    return total_rows
+                # Extract values
+                values = []
+                for col_idx, (eq_key, year) in col_map.items():
+                    if col_idx >= len(row):
+                        continue
+                    val = row[col_idx]
+                    if val is None:
+                        continue
+                    # 0 means not reported
+                    if isinstance(val, (int, float)) and val == 0:
+                        continue
+                    rate = safe_float(val)
+                    if rate is None:
+                        continue
+
+                    values.append((year, measure, eq_key, rate, fname))
+                parsed.add(inst_name, "", values)
+            parsed.timer.lap("row_loop")
+
+        return parsed
 
 
 # ---------------------------------------------------------------------------
@@ -1515,16 +2032,272 @@ def classify_file(fname: str) -> Optional[Tuple[str, int]]:
     return None
 
 
-def ingest_all(db_path: str, data_dir: str, verbose: bool = False) -> None:
-    """Main ingestion entry point."""
+# (section, log label, skip files without a year) in processing order
+INGEST_ORDER = [
+    ("section-15", "S15", False),
+    ("section-17", "S17", False),
+    ("cohort-analysis", "COH", False),
+    ("section-2", "S02", True),
+    ("section-1", "S01", True),
+    ("section-14", "S14", True),
+    ("pivot-enrolments", "PIV-E", False),
+    ("pivot-completions", "PIV-C", False),
+    ("section-16", "S16", False),
+]
+
+
+INGEST_RANK = {name: k for k, (name, _label, _needs_year) in enumerate(INGEST_ORDER)}
+INGEST_LABELS = {name: label for name, label, _needs_year in INGEST_ORDER}
+
+# (section, label, fname, fpath, year, sha256, size, replace)
+Job = Tuple[str, str, str, str, int, str, int, bool]
+
+
+def ingest_key(section: str, year: int, fname: str) -> Tuple[int, int, str]:
+    """Sort key of a file in the canonical order ingest_all writes in."""
+    return (INGEST_RANK[section], year, fname)
+
+
+def classify_for_ingest(fname: str) -> Optional[Tuple[str, int]]:
+    """classify_file, limited to files ingest_all actually loads."""
+    result = classify_file(fname)
+    if not result:
+        return None
+    section, year = result
+    for name, _label, needs_year in INGEST_ORDER:
+        if name == section:
+            return None if needs_year and not year else result
+    return None  # e.g. pivot-load
+
+
+def extract_file(section: str, filepath: str, year: int, digest: Optional[str] = None) -> ParsedFile:
+    """
+    Run the extractor for a classified file. Safe to call in a worker process.
+    A known sha256 saves the sheet cache hashing the file again.
+    """
+    if digest and SHEET_CACHE is not None:
+        SHEET_CACHE.digests.setdefault(filepath, digest)
+    parsed = _run_extractor(section, filepath, year)
+    parsed.timer.lap("other")
+    parsed.peak_rss_mb = peak_rss_mb()
+    return parsed
+
+
+def _run_extractor(section: str, filepath: str, year: int) -> ParsedFile:
+    if section == "section-15":
+        return extract_section_15(filepath)
+    if section == "section-17":
+        return extract_section_17(filepath)
+    if section == "cohort-analysis":
+        return extract_cohort_analysis(filepath)
+    if section == "section-2":
+        return extract_enrolments(filepath, year, commencing=0)
+    if section == "section-1":
+        return extract_enrolments(filepath, year, commencing=1)
+    if section == "section-14":
+        return extract_section_14(filepath, year)
+    if section == "pivot-enrolments":
+        return extract_pivot_table(filepath, is_completions=False)
+    if section == "pivot-completions":
+        return extract_pivot_table(filepath, is_completions=True)
+    if section == "section-16":
+        return extract_section_16(filepath)
+    raise ValueError(f"No extractor for section {section!r}")
+
+
+def open_ingest_db(db_path: str) -> sqlite3.Connection:
+    """Open db_path for writing, creating or migrating the schema."""
     conn = sqlite3.Connection(db_path)
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA foreign_keys=ON")
-
-    # Create schema
     conn.executescript(SCHEMA_DDL)
+    migrate_ingested_files(conn)
     conn.commit()
+    return conn
+
+
+def write_job(conn: sqlite3.Connection, registry: InstitutionRegistry, fields: FieldRegistry,
+              job: Job, parsed: ParsedFile) -> int:
+    """Write one extracted file in its own transaction. Returns rows written."""
+    section, _label, fname, fpath, year, digest, size, replace = job
+    timer = parsed.timer
+    if replace:
+        with timer.phase("delete"):
+            deleted = delete_file_rows(conn, fname)
+        print(f"         -> removed {deleted} rows from previous version")
+    rows = write_parsed(conn, registry, fields, parsed)
+    with timer.phase("commit"):
+        record_ingestion(conn, fname, fpath, rows, section, str(year), sha256=digest, size=size)
+        conn.commit()
+    print(f"         -> {rows} rows")
+    return rows
+
+
+class ExtractPipeline:
+    """
+    Ingest files as they arrive from the downloader, ahead of ingest_all.
+
+    The downloader calls submit() for each file it saves.  A writer thread
+    extracts the arrivals in worker processes, at most 2 x jobs_n files
+    ahead, and writes each one as soon as it is parsed, so parsing and
+    writing overlap the remaining transfers and only that window of
+    ParsedFiles is ever held in memory.
+
+    Arrivals are written in download order rather than the canonical one.
+    For the upsert tables that is only the same when a file sorts after
+    every file already in its table, so any other upsert file (and a
+    changed one) is held back for the ingest_all(pipeline=...) pass that
+    follows, which rebuilds the table in order as usual.  Files ingest_all
+    would skip are not submitted either.
+    """
+
+    def __init__(self, db_path: str, jobs_n: int = 1, sheet_cache_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.jobs_n = max(1, jobs_n)
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.jobs_n, initializer=set_sheet_cache,
+            initargs=(SheetCache(sheet_cache_dir) if sheet_cache_dir else None,),
+        )
+        # filename -> sha256 of everything ingested or submitted
+        self._ingested: Dict[str, Optional[str]] = {}
+        if os.path.exists(db_path):
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                self._ingested = dict(conn.execute("SELECT filename, sha256 FROM ingested_files"))
+            except sqlite3.Error:
+                pass  # no ingested_files table yet
+            finally:
+                conn.close()
+        self._known_hashes = {digest: fname for fname, digest in self._ingested.items() if digest}
+        # Upsert table -> key of the last file in it, and tables with a file held back
+        self._table_last: Dict[str, Tuple[int, int, str]] = {}
+        for fname in self._ingested:
+            result = classify_for_ingest(fname)
+            table = UPSERT_SECTION_TABLES.get(result[0]) if result else None
+            if table is not None:
+                key = ingest_key(result[0], result[1], fname)
+                self._table_last[table] = max(key, self._table_last.get(table, key))
+        self._held_back: set = set()
+        self.submitted = 0
+        self.written = 0
+        self.deferred = 0
+        self._arrivals: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._stop = False
+        self._error: Optional[BaseException] = None
+        self._writer = threading.Thread(target=self._write_arrivals, name="ingest-writer", daemon=True)
+        self._writer.start()
+
+    def submit(self, filepath: str, digest: str) -> bool:
+        """Queue filepath for writing if ingest_all would ingest it. Returns True if queued."""
+        fname = os.path.basename(filepath)
+        result = classify_for_ingest(fname)
+        if not result:
+            return False
+        section, year = result
+        if fname in self._ingested:
+            prior = self._ingested[fname]
+            if prior is None or prior == digest:
+                return False  # unchanged (ingest_all trusts files ingested before hashes)
+            replace = True
+        elif digest in self._known_hashes:
+            return False  # renamed copy
+        else:
+            replace = False
+        table = UPSERT_SECTION_TABLES.get(section)
+        if table is not None:
+            key = ingest_key(section, year, fname)
+            if replace or table in self._held_back or key < self._table_last.get(table, key):
+                self._held_back.add(table)
+                self.deferred += 1
+                return False
+            self._table_last[table] = key
+        self._ingested[fname] = digest
+        self._known_hashes[digest] = fname
+        filepath = os.path.abspath(filepath)
+        self._arrivals.put((section, INGEST_LABELS[section], fname, filepath, year, digest,
+                            os.path.getsize(filepath), replace))
+        self.submitted += 1
+        return True
+
+    def _write_arrivals(self) -> None:
+        conn = None
+        try:
+            conn = open_ingest_db(self.db_path)
+            registry = InstitutionRegistry(conn)
+            fields = FieldRegistry(conn)
+            fields.seed()
+            conn.commit()
+
+            window: Deque[Tuple[Job, Future]] = deque()
+            closed = False
+            while not self._stop:
+                # Wait for an arrival only when nothing is being extracted
+                while not closed and len(window) < 2 * self.jobs_n:
+                    try:
+                        job = self._arrivals.get(block=not window)
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        closed = True
+                    else:
+                        window.append((job, self.executor.submit(
+                            extract_file, job[0], job[3], job[4], job[5])))
+                if not window:
+                    break
+                job, started = window.popleft()
+                print(f"  [{job[1]}] Parsing: {job[2]}")
+                try:
+                    write_job(conn, registry, fields, job, started.result())
+                    self.written += 1
+                except Exception as e:
+                    print(f"  [ERROR] {job[2]}: {e}", file=sys.stderr)
+                    conn.rollback()
+                    registry.discard_pending()
+            for _job, started in window:
+                started.cancel()
+        except BaseException as e:
+            self._error = e
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def finish(self) -> None:
+        """Wait until everything submitted is written (or has failed)."""
+        self._arrivals.put(None)
+        self._writer.join()
+        if self._error is not None:
+            raise self._error
+
+    def shutdown(self) -> None:
+        if self._writer.is_alive():
+            self._stop = True
+            self._arrivals.put(None)
+            self._writer.join()
+        self.executor.shutdown(cancel_futures=True)
+
+
+def ingest_all(db_path: str, data_dir: str, verbose: bool = False, jobs_n: int = 1,
+               profile_path: Optional[str] = None,
+               sheet_cache_dir: Optional[str] = None,
+               pipeline: Optional[ExtractPipeline] = None) -> None:
+    """
+    Main ingestion entry point.
+
+    With jobs_n > 1, files are extracted in that many worker processes while
+    this process resolves names and writes each file in its own transaction,
+    in the same order as a serial run.
+
+    With profile_path, a per-file, per-phase timing report is written there
+    (see write_profile) and the slowest files are summarised.
+
+    With sheet_cache_dir, parsed sheets are read from and saved to a
+    SheetCache there.
+
+    With pipeline, files are extracted in its worker pool, after the files
+    it already wrote; the caller finishes and shuts the pipeline down.
+    """
+    conn = open_ingest_db(db_path)
 
     registry = InstitutionRegistry(conn)
     fields = FieldRegistry(conn)
@@ -1546,147 +2319,132 @@ def ingest_all(db_path: str, data_dir: str, verbose: bool = False) -> None:
         print(f"  {section}: {len(files)} files")
     print()
 
-    total_rows = 0
-
-    # Process Section 15 (attrition/retention/success)
-    for fname, year in sorted(classified.get("section-15", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            if verbose:
-                print(f"  [SKIP] Already ingested: {fname}")
-            continue
-        print(f"  [S15] Parsing: {fname}")
-        try:
-            rows = parse_section_15(fpath, conn, registry)
-            record_ingestion(conn, fname, fpath, rows, "section-15", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
-
-    # Process Section 17 (completion rates)
-    for fname, year in sorted(classified.get("section-17", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            continue
-        print(f"  [S17] Parsing: {fname}")
-        try:
-            rows = parse_section_17(fpath, conn, registry)
-            record_ingestion(conn, fname, fpath, rows, "section-17", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
-
-    # Process Cohort Analysis
-    for fname, year in sorted(classified.get("cohort-analysis", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            continue
-        print(f"  [COH] Parsing: {fname}")
-        try:
-            rows = parse_cohort_analysis(fpath, conn, registry)
-            record_ingestion(conn, fname, fpath, rows, "cohort-analysis", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
-
-    # Process Section 2 (all students enrolments)
-    for fname, year in sorted(classified.get("section-2", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            continue
-        if not year:
-            continue
-        print(f"  [S02] Parsing: {fname}")
-        try:
-            rows = parse_enrolments(fpath, conn, registry, fields, year, commencing=0)
-            record_ingestion(conn, fname, fpath, rows, "section-2", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
-
-    # Process Section 1 (commencing students)
-    for fname, year in sorted(classified.get("section-1", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            continue
-        if not year:
-            continue
-        print(f"  [S01] Parsing: {fname}")
-        try:
-            rows = parse_enrolments(fpath, conn, registry, fields, year, commencing=1)
-            record_ingestion(conn, fname, fpath, rows, "section-1", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
+    # Build the work list in the canonical order; the writer always applies
+    # files in this order, however many workers extract them.
+    # Files are matched on content: unchanged files are skipped, changed
+    # ones re-ingested, and a renamed copy of an ingested file is skipped.
+    hasher = FileHasher(data_dir)
+    ingested = {
+        row[0]: row[1]
+        for row in conn.execute("SELECT filename, sha256 FROM ingested_files")
+    }
+    known_hashes = {digest: fname for fname, digest in ingested.items() if digest}
+    backfilled = 0
+
+    # First pass: status of every candidate file, in canonical order
+    candidates = []  # (section, label, fname, fpath, year, sha256, size, status)
+    for section, label, needs_year in INGEST_ORDER:
+        for fname, year in sorted(classified.get(section, []), key=lambda x: x[1]):
+            if needs_year and not year:
+                continue
+            fpath = os.path.join(data_dir, fname)
+            digest = hasher.digest(fpath)
+            size = os.path.getsize(fpath)
 
-    # Process Section 14 (award completions)
-    for fname, year in sorted(classified.get("section-14", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            continue
-        if not year:
+            if fname in ingested:
+                prior = ingested[fname]
+                if prior is None:
+                    # Ingested before hashes were recorded: trust it, note the hash
+                    conn.execute(
+                        "UPDATE ingested_files SET sha256 = ?, size = ? WHERE filename = ?",
+                        (digest, size, fname),
+                    )
+                    known_hashes.setdefault(digest, fname)
+                    backfilled += 1
+                    prior = digest
+                status = "unchanged" if prior == digest else "changed"
+            elif digest in known_hashes:
+                if verbose:
+                    print(f"  [SKIP] Same content as {known_hashes[digest]}: {fname}")
+                continue
+            else:
+                status = "new"
+            known_hashes[digest] = fname
+            candidates.append((section, label, fname, fpath, year, digest, size, status))
+
+    # Upsert tables let a later file overwrite an earlier file's keys.  If a
+    # changed file, or a new one that sorts before an ingested file, touches
+    # such a table, all of that table's files are re-ingested in order so it
+    # ends up exactly as a fresh build.  Appending a newer release does not.
+    dirty_tables = set()
+    seen_ingested = set()
+    for section, _label, _fname, _fpath, _year, _digest, _size, status in reversed(candidates):
+        table = UPSERT_SECTION_TABLES.get(section)
+        if table is None:
             continue
-        print(f"  [S14] Parsing: {fname}")
-        try:
-            rows = parse_section_14(fpath, conn, registry, fields, year)
-            record_ingestion(conn, fname, fpath, rows, "section-14", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
-
-    # Process Pivot Tables
-    for section_key, is_comp in [("pivot-enrolments", False), ("pivot-completions", True)]:
-        for fname, year in sorted(classified.get(section_key, []), key=lambda x: x[1]):
-            fpath = os.path.join(data_dir, fname)
-            if already_ingested(conn, fname):
+        if status == "changed" or (status == "new" and table in seen_ingested):
+            dirty_tables.add(table)
+        if status != "new":
+            seen_ingested.add(table)
+
+    jobs: List[Job] = []
+    for section, label, fname, fpath, year, digest, size, status in candidates:
+        if status == "unchanged":
+            table = UPSERT_SECTION_TABLES.get(section)
+            if table not in dirty_tables:
+                if verbose:
+                    print(f"  [SKIP] Already ingested: {fname}")
                 continue
-            label = "PIV-C" if is_comp else "PIV-E"
+            print(f"  [INFO] Re-ingesting to rebuild {table}: {fname}")
+        elif status == "changed":
+            print(f"  [INFO] Content changed, will re-ingest: {fname}")
+        jobs.append((section, label, fname, fpath, year, digest, size, status != "new"))
+
+    if backfilled:
+        conn.commit()
+        print(f"[INFO] Recorded content hashes for {backfilled} previously ingested files")
+
+    # Digests are already known for every job; workers get the same cache.
+    # Reset it otherwise, so an earlier call's cache is not picked up.
+    set_sheet_cache(SheetCache(sheet_cache_dir, {job[3]: job[5] for job in jobs})
+                    if sheet_cache_dir else None)
+
+    executor = None
+    # Extractions run at most `window` files ahead of the writer.  Finished
+    # ParsedFiles wait in memory (rows and all) until their turn in the
+    # canonical order, so an unbounded lead could hold most of the corpus.
+    window = 0
+    if pipeline is not None:
+        executor = pipeline.executor
+        window = 2 * pipeline.jobs_n
+    elif jobs_n > 1 and len(jobs) > 1:
+        print(f"[INFO] Extracting with {jobs_n} worker processes")
+        executor = ProcessPoolExecutor(max_workers=jobs_n, initializer=set_sheet_cache,
+                                       initargs=(SHEET_CACHE,))
+        window = 2 * jobs_n
+
+    pending: Dict[int, Future] = {}
+    next_job = 0
+
+    def top_up(k: int) -> None:
+        nonlocal next_job
+        while next_job < len(jobs) and next_job < k + window:
+            job = jobs[next_job]
+            pending[next_job] = executor.submit(extract_file, job[0], job[3], job[4], job[5])
+            next_job += 1
+
+    total_rows = 0
+    profile: List[Dict[str, Any]] = []  # one entry per written file
+    try:
+        for k, job in enumerate(jobs):
+            section, label, fname, fpath, year = job[:5]
             print(f"  [{label}] Parsing: {fname}")
             try:
-                rows = parse_pivot_table(fpath, conn, registry, fields, is_completions=is_comp)
-                record_ingestion(conn, fname, fpath, rows, section_key, str(year))
-                conn.commit()
+                if executor is not None:
+                    top_up(k)
+                    parsed = pending.pop(k).result()
+                else:
+                    parsed = extract_file(section, fpath, year)
+                rows = write_job(conn, registry, fields, job, parsed)
                 total_rows += rows
-                print(f"         -> {rows} rows")
+                profile.append(profile_entry(fname, section, rows, parsed))
             except Exception as e:
                 print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
                 conn.rollback()
-
-    # Process Section 16 (equity performance data)
-    for fname, year in sorted(classified.get("section-16", []), key=lambda x: x[1]):
-        fpath = os.path.join(data_dir, fname)
-        if already_ingested(conn, fname):
-            if verbose:
-                print(f"  [SKIP] Already ingested: {fname}")
-            continue
-        print(f"  [S16] Parsing: {fname}")
-        try:
-            rows = parse_section_16(fpath, conn, registry)
-            record_ingestion(conn, fname, fpath, rows, "section-16", str(year))
-            conn.commit()
-            total_rows += rows
-            print(f"         -> {rows} rows")
-        except Exception as e:
-            print(f"  [ERROR] {fname}: {e}", file=sys.stderr)
-            conn.rollback()
+                registry.discard_pending()
+    finally:
+        if executor is not None and pipeline is None:
+            executor.shutdown(cancel_futures=True)
 
     # Final summary
     print(f"\n{'='*60}")
@@ -1699,9 +2457,94 @@ def ingest_all(db_path: str, data_dir: str, verbose: bool = False) -> None:
         count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
         print(f"  {table}: {count:,} rows")
 
+    if profile:
+        print_profile_summary(profile, top_files=10 if profile_path else 0)
+    if profile_path:
+        write_profile(profile, profile_path)
+        print(f"[INFO] Profile written to {profile_path}")
+
     conn.close()
 
 
+# ---------------------------------------------------------------------------
+# Profiling report
+# ---------------------------------------------------------------------------
+
+def profile_entry(fname: str, section: str, rows: int, parsed: ParsedFile) -> Dict[str, Any]:
+    """One report row: wall time, rows, rows/sec, peak RSS and seconds per phase."""
+    secs = parsed.timer.total
+    # Extraction may have run in a worker; the writer's own peak counts too
+    rss = [v for v in (parsed.peak_rss_mb, peak_rss_mb()) if v is not None]
+    entry: Dict[str, Any] = {
+        "file": fname,
+        "section": section,
+        "rows": rows,
+        "wall_s": round(secs, 4),
+        "rows_per_s": round(rows / secs, 1) if secs > 0 else 0.0,
+        "peak_rss_mb": round(max(rss), 1) if rss else None,
+    }
+    for phase in PhaseTimer.PHASES:
+        entry[f"{phase}_s"] = round(parsed.timer.seconds.get(phase, 0.0), 4)
+    for name in PhaseTimer.COUNTERS:
+        entry[name] = parsed.timer.counts.get(name, 0)
+    return entry
+
+
+def print_profile_summary(profile: List[Dict[str, Any]], top_files: int = 0) -> None:
+    """Print sections (and optionally the top_files files) slowest first."""
+    sections: Dict[str, Dict[str, float]] = {}
+    for entry in profile:
+        agg = sections.setdefault(entry["section"], {"files": 0, "rows": 0, "wall_s": 0.0})
+        agg["files"] += 1
+        for key in ["rows", "wall_s"] + [f"{p}_s" for p in PhaseTimer.PHASES]:
+            agg[key] = agg.get(key, 0.0) + entry[key]
+
+    print("[INFO] Throughput by section (parse + write, slowest first):")
+    for section, agg in sorted(sections.items(), key=lambda kv: -kv[1]["wall_s"]):
+        secs = agg["wall_s"]
+        rate = agg["rows"] / secs if secs > 0 else 0.0
+        print(f"  {section}: {int(agg['rows']):,} rows from {int(agg['files'])} files "
+              f"in {secs:.2f}s ({rate:,.0f} rows/s); {_top_phases(agg)}")
+
+    hits = sum(e["sheet_cache_hits"] for e in profile)
+    misses = sum(e["sheet_cache_misses"] for e in profile)
+    if hits or misses:
+        print(f"[INFO] Sheet cache: {hits:,} hits, {misses:,} misses")
+
+    calls = sum(e["resolve_calls"] for e in profile)
+    if calls:
+        memo = sum(e["resolve_memo_hits"] for e in profile)
+        created = sum(e["institutions_created"] for e in profile)
+        resolve_s = sum(e["resolve_s"] for e in profile)
+        print(f"[INFO] Institution names: {calls:,} lookups, {memo / calls:.1%} memoised, "
+              f"{created:,} institutions created, resolve {resolve_s:.2f}s")
+
+    if top_files:
+        print("[INFO] Slowest files:")
+        for entry in sorted(profile, key=lambda e: -e["wall_s"])[:top_files]:
+            print(f"  {entry['wall_s']:7.2f}s  {entry['rows']:>8,} rows  "
+                  f"{entry['file']}; {_top_phases(entry)}")
+
+
+def _top_phases(times: Dict[str, Any], n: int = 2) -> str:
+    """The n phases taking the most time, as 'phase 1.23s, phase 0.45s'."""
+    ranked = sorted(PhaseTimer.PHASES, key=lambda p: -times.get(f"{p}_s", 0.0))
+    return ", ".join(f"{p} {times.get(f'{p}_s', 0.0):.2f}s" for p in ranked[:n])
+
+
+def write_profile(profile: List[Dict[str, Any]], path: str) -> None:
+    """Write the per-file report as TSV if path ends in .tsv, else as JSON."""
+    columns = ["file", "section", "rows", "wall_s", "rows_per_s", "peak_rss_mb"] + \
+        [f"{p}_s" for p in PhaseTimer.PHASES] + list(PhaseTimer.COUNTERS)
+    with open(path, "w", encoding="utf-8") as f:
+        if path.lower().endswith(".tsv"):
+            f.write("\t".join(columns) + "\n")
+            for entry in profile:
+                f.write("\t".join("" if entry[c] is None else str(entry[c]) for c in columns) + "\n")
+        else:
+            json.dump(profile, f, indent=2)
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -1716,13 +2559,23 @@ def main():
     ap.add_argument("--db", type=str, default="he_stats.db", help="SQLite database path")
     ap.add_argument("--data-dir", type=str, default="_downloads/files", help="Directory with downloaded files")
     ap.add_argument("--verbose", action="store_true", help="Show skip messages")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="Worker processes for parsing files (0 = one per CPU)")
+    ap.add_argument("--profile", type=str, default=None, metavar="PATH",
+                    help="Write per-file, per-phase timings to PATH (.tsv for TSV, else JSON)")
+    ap.add_argument("--sheet-cache", type=str, default="_sheet_cache",
+                    help="Directory caching parsed sheets by file hash")
+    ap.add_argument("--no-sheet-cache", action="store_true", help="Always parse the XLSX files")
     args = ap.parse_args()
 
     if not os.path.isdir(args.data_dir):
         print(f"[ERROR] Data directory not found: {args.data_dir}", file=sys.stderr)
         sys.exit(1)
 
-    ingest_all(args.db, args.data_dir, verbose=args.verbose)
+    jobs_n = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    ingest_all(args.db, args.data_dir, verbose=args.verbose, jobs_n=jobs_n,
+               profile_path=args.profile,
+               sheet_cache_dir=None if args.no_sheet_cache else args.sheet_cache)
 
 
 if __name__ == "__main__":
@@ -83,7 +83,9 @@ CREATE TABLE IF NOT EXISTS ingested_files (
     ingested_at TEXT DEFAULT (datetime('now')),
     row_count   INTEGER,
     section     TEXT,
-    data_year   TEXT
+    data_year   TEXT,
+    sha256      TEXT,                     -- content hash at ingest time
+    size        INTEGER                   -- bytes
 );
 
 -- Indexes for the probability engine queries